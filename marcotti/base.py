@@ -18,9 +18,9 @@ class Marcotti(object):
     def __init__(self, config):
         logger.info("Marcotti v{0}: Python {1} on {2}".format(
             __version__, sys.version, sys.platform))
-        logger.info("Opened connection to {0}".format(self._public_db_uri(config.database_uri)))
-        self.engine = create_engine(config.database_uri)
-        self.connection = self.engine.connect()
+        self.engine = create_engine(config.database_uri, **config.engine_options)
+        logger.info("Created connection pool to {0}: {1}".format(
+            self._public_db_uri(config.database_uri), self.engine.pool.status()))
 
     @staticmethod
     def _public_db_uri(uri):
@@ -39,19 +39,22 @@ class Marcotti(object):
         :param base: Base schema object that contains data model objects.
         """
         logger.info("Creating data models")
-        base.metadata.create_all(self.connection)
+        base.metadata.create_all(self.engine)
 
     @contextmanager
     def create_session(self):
         """
         Open transaction session with an active database object.
+
+        Each session checks out its own connection from the engine's connection pool, so that
+        sessions can be used concurrently.
         
         If an error occurs during the session, roll back uncommitted changes
         and report error to log file and user.
         
         If session is no longer needed, commit remaining transactions before closing it.
         """
-        session = Session(self.connection)
+        session = Session(bind=self.engine)
         logger.info("Create session {0} with {1}".format(
             id(session), self._public_db_uri(str(self.engine.url))))
         try:
@@ -73,7 +76,14 @@ class MarcottiConfig(object):
     Base configuration class for Marcotti.  Contains one method that defines the database URI.
 
     This class is to be subclassed and its attributes defined therein.
+
+    Connection pool settings are optional, and the pool defaults of the database dialect are used
+    for any that are not defined.
     """
+    POOL_SIZE = None
+    MAX_OVERFLOW = None
+    POOL_RECYCLE = None
+    POOL_PRE_PING = False
 
     @property
     def database_uri(self):
@@ -82,3 +92,22 @@ class MarcottiConfig(object):
         else:
             uri = r'{p.DIALECT}://{p.DBUSER}:{p.DBPASSWD}@{p.HOSTNAME}:{p.PORT}/{p.DBNAME}'.format(p=self)
         return uri
+
+    @property
+    def engine_options(self):
+        """
+        Define keyword arguments of the database engine from the connection pool settings.
+
+        Pool size and overflow settings are not used with SQLite databases, which do not use a queued pool.
+        """
+        options = {}
+        if getattr(self, 'DIALECT') != 'sqlite':
+            if self.POOL_SIZE is not None:
+                options['pool_size'] = self.POOL_SIZE
+            if self.MAX_OVERFLOW is not None:
+                options['max_overflow'] = self.MAX_OVERFLOW
+        if self.POOL_RECYCLE is not None:
+            options['pool_recycle'] = self.POOL_RECYCLE
+        if self.POOL_PRE_PING:
+            options['pool_pre_ping'] = True
+        return options
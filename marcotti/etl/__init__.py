@@ -1 +1,2 @@
-from base import ETL, MarcottiLoad, MarcottiTransform
+from base import ETL, ELT, MarcottiLoad, MarcottiTransform, MarcottiEventTransform
+from manifest import Batch, Manifest
@@ -1,3 +1,6 @@
 from workflows import ETL
-from transform import MarcottiTransform
+from elt import ELT
+from transform import MarcottiTransform, MarcottiEventTransform
 from load import MarcottiLoad
+from pgload import MarcottiCopyLoad
+from scheduler import ETLScheduler
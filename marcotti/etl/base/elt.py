@@ -0,0 +1,536 @@
+import logging
+from types import GeneratorType
+
+import numpy as np
+from sqlalchemy import (MetaData, Table, Column, Index, Integer, Float, Boolean, Date, String, Unicode, and_, or_,
+                        case, cast, exists, func, inspect, literal, select)
+from sqlalchemy.types import NullType
+
+import marcotti.models.club as mc
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.personnel as mcp
+import marcotti.models.common.suppliers as mcs
+import marcotti.models.common.match as mcm
+from .workflows import WorkflowBase
+from .load import MarcottiStatLoad
+from .metrics import ETLReport
+
+
+logger = logging.getLogger(__name__)
+
+
+class StagingArea(object):
+    """
+    Staging tables of raw extracted data, one per data entity.
+
+    The columns of a staging table are the fields that the workflow declares for the extracted records of the
+    data entity.  Date fields are converted to dates when they are staged.  Every table also has a row ID, the
+    ID of the supplier of the row, and integer columns for IDs that are resolved inside the database.
+    """
+
+    prefix = 'stage_'
+    chunk_size = 10000
+
+    def __init__(self, session):
+        self.session = session
+        self.metadata = MetaData()
+
+    def table(self, entity, fields, resolved=()):
+        """
+        Retrieve staging table of a data entity, creating it from the declared fields of the extracted records
+        if it does not exist in the database.
+
+        :param entity: Data entity name.
+        :param fields: List of tuples of field name and column type of extracted records.
+        :param resolved: Names of columns of resolved IDs.
+        :return: Table object.
+        """
+        name = self.prefix + entity
+        if name in self.metadata.tables:
+            return self.metadata.tables[name]
+        connection = self.session.connection()
+        if connection.dialect.has_table(connection, name):
+            return Table(name, self.metadata, autoload=True, autoload_with=connection)
+        names = set(field for field, _ in fields)
+        table = Table(name, self.metadata,
+                      Column('stage_id', Integer, primary_key=True),
+                      Column('supplier_id', Integer),
+                      Column('record_id', Integer),
+                      *([Column(field, column_type) for field, column_type in fields] +
+                        [Column(field, Integer) for field in resolved if field not in names]))
+        if 'remote_id' in table.c:
+            Index('ix_{}_remote_id'.format(name), table.c.supplier_id, table.c.remote_id)
+        table.create(connection)
+        return table
+
+    @staticmethod
+    def native(value):
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and np.isnan(value):
+            return None
+        return value
+
+    def load(self, entity, records, supplier_id, fields, resolved=()):
+        """
+        Write extracted records into the staging table of a data entity.
+
+        Fields that are not declared for the data entity are dropped.
+
+        :param entity: Data entity name.
+        :param records: List of dictionaries of extracted records.
+        :param supplier_id: ID of data supplier.
+        :param fields: List of tuples of field name and column type of extracted records.
+        :param resolved: Names of columns of resolved IDs.
+        :return: Table object.
+        """
+        table = self.table(entity, fields, resolved)
+        staged = [column for column in table.c if column.name not in ('stage_id', 'supplier_id', 'record_id')
+                  and column.name not in resolved]
+        dropped = set(field for record in records for field in record) - set(column.name for column in staged)
+        if dropped:
+            logger.warning("{}: fields not in staging table: {}".format(entity, ", ".join(sorted(dropped))))
+        dates = [column.name for column in staged if isinstance(column.type, Date)]
+        rows = []
+        for record in records:
+            row = {column.name: self.native(record.get(column.name)) for column in staged}
+            for field in dates:
+                if isinstance(row[field], basestring):
+                    row[field] = WorkflowBase.make_date_object(row[field])
+            row['supplier_id'] = supplier_id
+            rows.append(row)
+        for start in range(0, len(rows), self.chunk_size):
+            self.session.execute(table.insert(), rows[start:start + self.chunk_size])
+        return table
+
+
+class ELT(WorkflowBase):
+    """
+    Alternative workflow that loads raw extracted data into staging tables and resolves references to other
+    records inside the database.
+
+    Each data entity is loaded with a few set-based statements per staging table:
+
+    1. Resolve IDs of referenced records into columns of the staging table, with one UPDATE per reference.
+    2. Resolve IDs of staged records that are already in the database, through the supplier mapping table or
+       the natural key of the records.
+    3. Allocate IDs of new records, one per distinct supplier ID, and write the records with one
+       INSERT ... SELECT per mapped table.
+    4. Write supplier mapping records of the staged records.
+    5. Delete staged rows that have been resolved.
+
+    The staging table of each data entity has the fields of the extracted records that are declared in
+    :attr:`staged_fields`, and statistics categories are loaded into the data models and fields that
+    :attr:`MarcottiStatLoad.stat_models` declares for them.
+
+    Rows that cannot be resolved are left in the staging table for inspection, with the IDs of the references
+    that were resolved, and are resolved again whenever the data entity is loaded.  Records that are already in
+    the database are not updated.
+
+    IDs of new records are drawn from the sequences of the tables where the database supports sequences, and
+    follow the highest ID of the table otherwise.  The latter is safe on SQLite, which admits one writer at a
+    time, and the workflow is therefore restricted to PostgreSQL and SQLite databases.
+    """
+
+    dialects = ('postgresql', 'sqlite')
+    COMMIT_POLICIES = ('entity', 'workflow')
+
+    resolved_columns = {
+        'clubs': ('country_id',),
+        'players': ('person_id', 'country_id', 'position_id'),
+        'managers': ('person_id', 'country_id'),
+        'referees': ('person_id', 'country_id'),
+        'league_matches': ('competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
+                           'home_manager_id', 'away_manager_id', 'referee_id'),
+        'match_lineups': ('match_id', 'team_id', 'player_id'),
+        'player_stats': ('player_id', 'player_team_id', 'opposing_team_id', 'match_id', 'lineup_id')
+    }
+
+    person_fields = [
+        ('remote_id', String), ('first_name', Unicode), ('known_first_name', Unicode), ('middle_name', Unicode),
+        ('last_name', Unicode), ('second_last_name', Unicode), ('nick_name', Unicode), ('name_order', String),
+        ('dob', Date), ('country', Unicode)
+    ]
+
+    staged_fields = {
+        'clubs': [('remote_id', String), ('name', Unicode), ('short_name', Unicode), ('country', Unicode)],
+        'players': person_fields + [('position_name', Unicode), ('eff_date', Date), ('height', Float),
+                                    ('weight', Integer)],
+        'managers': person_fields,
+        'referees': person_fields,
+        'league_matches': [
+            ('remote_id', String), ('competition', Unicode), ('season', String), ('date', Date),
+            ('match_time', String), ('matchday', Integer), ('venue', Unicode), ('home_team', Unicode),
+            ('away_team', Unicode), ('home_manager', Unicode), ('away_manager', Unicode), ('referee', Unicode),
+            ('attendance', Integer), ('kickoff_temp', Float), ('kickoff_humid', Float), ('half_1', Integer),
+            ('half_2', Integer), ('kickoff_wx', String), ('halftime_wx', String), ('fulltime_wx', String)
+        ],
+        'match_lineups': [('remote_match_id', String), ('player_team', Unicode), ('player_name', Unicode),
+                          ('starter', Boolean), ('captain', Boolean)],
+        'player_stats': [
+            ('remote_player_id', String), ('remote_player_team_id', String), ('remote_opposing_team_id', String),
+            ('match_date', Date), ('locale', String)
+        ] + list(('{}.{}'.format(category, field), model.__table__.c[field].type)
+                 for category, (model, fields) in MarcottiStatLoad.stat_models.items() for field in fields)
+    }
+
+    def __init__(self, session, supplier, cache=None, commit='entity'):
+        super(ELT, self).__init__(session, supplier, cache)
+        if self.dialect.name not in self.dialects:
+            raise ValueError("ELT workflow does not support {} databases".format(self.dialect.name))
+        if commit not in self.COMMIT_POLICIES:
+            raise ValueError("Invalid commit policy: {!r}".format(commit))
+        self.commit_policy = commit
+        self.staging = StagingArea(session)
+        self.report = ETLReport(session.get_bind())
+
+    @property
+    def dialect(self):
+        return self.session.get_bind().dialect
+
+    def workflow(self, entity, data):
+        """
+        Implement ELT workflow for a specific data entity:
+
+        1. Stage extracted data in the staging table of the data entity.
+        2. Resolve and load staged data inside the database.
+
+        :param entity: Data entity name.
+        :param data: Data payload from CSV sources, in a list of dictionaries or a generator of lists.
+        """
+        if entity not in self.resolved_columns:
+            raise ValueError("ELT workflow does not support data entity: {}".format(entity))
+        fields, resolved = self.staged_fields[entity], self.resolved_columns[entity]
+        for records in (data if isinstance(data, GeneratorType) else [data]):
+            if records:
+                with self.report.stage(entity, 'stage', len(records)):
+                    self.staging.load(entity, records, self.supplier_id, fields, resolved)
+        table = self.staging.table(entity, fields, resolved)
+        pending = self.count(table)
+        with self.report.stage(entity, 'resolve', pending) as stage:
+            getattr(self, entity)(table)
+            remaining = self.count(table)
+            stage.rows_out = pending - remaining
+        if remaining:
+            logger.warning("{}: {} rows unresolved, left in staging table {}".format(entity, remaining, table.name))
+        if self.commit_policy == 'entity':
+            with self.report.stage(entity, 'commit', 0):
+                self.session.commit()
+        self.report.log(entity)
+
+    def count(self, table):
+        return self.session.execute(select([func.count()]).select_from(table).where(self.supplied(table))).scalar()
+
+    def supplied(self, table):
+        return table.c.supplier_id == self.supplier_id
+
+    @staticmethod
+    def coerce(value, column):
+        """
+        Cast staged value to the type of a database column if their types differ.
+        """
+        if isinstance(column.type, NullType) or value.type._type_affinity is column.type._type_affinity:
+            return value
+        return cast(value, column.type)
+
+    def lookup(self, id_column, keys, *criteria):
+        """
+        Define lookup of record IDs by key fields, restricted to keys that identify one record.
+
+        :param id_column: ID attribute of data model.
+        :param keys: List of key attributes or expressions of data model.
+        :param criteria: Filter criteria of records.
+        :return: Subquery with ``id`` column and ``key<n>`` columns.
+        """
+        query = self.session.query(func.min(id_column).label('id'),
+                                   *[key.label('key{}'.format(n)) for n, key in enumerate(keys)])
+        return query.filter(*criteria).group_by(*keys).having(func.count(id_column) == 1).subquery()
+
+    def resolve(self, table, field, lookup, values, where=None, null_safe=False):
+        """
+        Resolve IDs of staged rows that are not resolved yet into a column of the staging table, with one
+        UPDATE statement.
+
+        Unless matching is null-safe, only rows that have all lookup values are resolved.
+
+        :param table: Staging table.
+        :param field: Name of column of resolved IDs.
+        :param lookup: Lookup subquery, see :meth:`lookup`.
+        :param values: List of staged columns or expressions, matched to the keys of the lookup in order.
+        :param where: Additional condition on staged rows.
+        :param null_safe: True if NULL values match NULL keys.
+        """
+        keys = [lookup.c['key{}'.format(n)] for n in range(len(values))]
+        if null_safe:
+            matches = [key.isnot_distinct_from(self.coerce(value, key)) for key, value in zip(keys, values)]
+            required = []
+        else:
+            matches = [key == self.coerce(value, key) for key, value in zip(keys, values)]
+            required = [value != None for value in values]
+        condition = and_(self.supplied(table), table.c[field] == None, *required)
+        if where is not None:
+            condition = and_(condition, where)
+        if self.dialect.name == 'postgresql':
+            statement = table.update().values({table.c[field]: lookup.c.id}).where(and_(condition, *matches))
+        else:
+            statement = table.update().values(
+                {table.c[field]: select([lookup.c.id]).where(and_(*matches)).as_scalar()}).where(condition)
+        self.session.execute(statement)
+
+    def mapped(self, table, map_model, remote_id=None):
+        """
+        Resolve IDs of staged records from the supplier mapping table.
+        """
+        self.resolve(table, 'record_id', self.lookup(map_model.id, [map_model.remote_id],
+                                                     map_model.supplier_id == self.supplier_id),
+                     [table.c.remote_id if remote_id is None else remote_id])
+
+    @staticmethod
+    def optional(table, field, *values):
+        """
+        Condition that an optional reference of staged rows is either absent or resolved.
+        """
+        return or_(table.c[field] != None, *[value == None for value in values])
+
+    @staticmethod
+    def valid(value, enum):
+        """
+        Condition that a staged value is either absent or a value of an enumerated type.
+        """
+        return or_(value == None, value.in_(enum.values()))
+
+    def allocate(self, table, field, target, ready, keys):
+        """
+        Allocate IDs of new records to staged rows that are ready to be loaded and have no ID yet.
+
+        Staged rows with the same key values are given the same ID.
+
+        :param table: Staging table.
+        :param field: Name of column of record IDs.
+        :param target: Table of new records, whose primary key is defined with a Sequence.
+        :param ready: Condition on staged rows that are ready to be loaded.
+        :param keys: List of staged columns that identify a record.
+        """
+        key = list(target.primary_key)[0]
+        new = and_(self.supplied(table), ready, table.c[field] == None)
+        sequence = key.default
+        if self.dialect.supports_sequences:
+            value = sequence.next_value()
+        else:
+            first = self.session.execute(select([func.min(table.c.stage_id)]).where(new)).scalar()
+            if first is None:
+                return
+            last = self.session.execute(select([func.max(key)])).scalar()
+            value = table.c.stage_id + (max(last or 0, (sequence.start or 1) - 1) + 1 - first)
+        self.session.execute(table.update().values({table.c[field]: value}).where(new))
+        other = table.alias()
+        first_id = select([func.min(other.c[field])]).where(and_(
+            other.c.supplier_id == table.c.supplier_id, *[other.c[column.name] == column for column in keys]))
+        self.session.execute(table.update().values({table.c[field]: first_id.as_scalar()}).where(
+            and_(self.supplied(table), table.c[field] != None, *[column != None for column in keys])))
+
+    def insert_new(self, table, target, values, field='record_id'):
+        """
+        Write new records into a table with one INSERT ... SELECT statement, from the first staged row of each
+        record ID that is not in the table.
+
+        Columns that are not written are set to their defaults.
+
+        :param table: Staging table.
+        :param target: Table of new records.
+        :param values: List of tuples of target column name and staged column or expression.
+        :param field: Name of column of record IDs.
+        :return: Number of records written.
+        """
+        key = list(target.primary_key)[0]
+        first = select([func.min(table.c.stage_id)]).where(
+            and_(self.supplied(table), table.c[field] != None)).group_by(table.c[field])
+        source = select([value for _, value in values]).where(
+            and_(table.c.stage_id.in_(first), ~exists().where(key == table.c[field])))
+        return self.session.execute(target.insert().from_select([name for name, _ in values], source)).rowcount
+
+    def insert_maps(self, table, map_model):
+        """
+        Write supplier mapping records of staged rows with record IDs, with one INSERT ... SELECT statement.
+        """
+        map_table = map_model.__table__
+        remote_id = self.coerce(table.c.remote_id, map_table.c.remote_id)
+        source = select([table.c.record_id, remote_id, table.c.supplier_id]).distinct().where(and_(
+            self.supplied(table), table.c.record_id != None, table.c.remote_id != None,
+            ~exists().where(and_(map_table.c.remote_id == remote_id, map_table.c.supplier_id == table.c.supplier_id))))
+        self.session.execute(map_table.insert().from_select(['id', 'remote_id', 'supplier_id'], source))
+
+    def discard(self, table, field='record_id'):
+        """
+        Delete staged rows that have been resolved.
+        """
+        self.session.execute(table.delete().where(and_(self.supplied(table), table.c[field] != None)))
+
+    def clubs(self, table):
+        self.resolve(table, 'country_id', self.lookup(mco.Countries.id, [mco.Countries.name]), [table.c.country])
+        ready = and_(table.c.name != None, self.optional(table, 'country_id', table.c.country))
+        self.mapped(table, mc.ClubMap)
+        self.resolve(table, 'record_id', self.lookup(mc.Clubs.id, [mc.Clubs.name, mc.Clubs.country_id]),
+                     [table.c.name, table.c.country_id], where=ready, null_safe=True)
+        self.allocate(table, 'record_id', mc.Clubs.__table__, ready, [table.c.remote_id])
+        count = self.insert_new(table, mc.Clubs.__table__, [
+            ('id', table.c.record_id), ('name', table.c.name), ('country_id', table.c.country_id)])
+        self.insert_maps(table, mc.ClubMap)
+        self.discard(table)
+        logger.info("{} club records ingested".format(count))
+
+    def persons(self, table, model, map_model, ready=None, values=()):
+        """
+        Load staged person records of a person data model.
+
+        :param table: Staging table.
+        :param model: Person data model class.
+        :param map_model: Supplier mapping data model class of person model.
+        :param ready: Additional condition on staged rows that are ready to be loaded.
+        :param values: List of tuples of column name and staged column or expression of the model's own table.
+        """
+        self.resolve(table, 'country_id', self.lookup(mco.Countries.id, [mco.Countries.name]), [table.c.country])
+        ready = and_(table.c.first_name != None, table.c.last_name != None, table.c.dob != None,
+                     self.optional(table, 'country_id', table.c.country),
+                     self.valid(table.c.name_order, enums.NameOrderType), *([] if ready is None else [ready]))
+        order = func.coalesce(table.c.name_order, enums.NameOrderType.western.value)
+        fields = ['first_name', 'middle_name', 'last_name', 'second_last_name', 'nick_name']
+        self.mapped(table, map_model)
+        self.resolve(table, 'record_id',
+                     self.lookup(model.id, [getattr(model, field) for field in fields] +
+                                 [model.birth_date, model.order, model.country_id]),
+                     [table.c[field] for field in fields] + [table.c.dob, order, table.c.country_id],
+                     where=ready, null_safe=True)
+        self.resolve(table, 'person_id', self.lookup(model.person_id, [model.id]), [table.c.record_id])
+        self.allocate(table, 'record_id', model.__table__, ready, [table.c.remote_id])
+        self.allocate(table, 'person_id', mcp.Persons.__table__, and_(ready, table.c.record_id != None),
+                      [table.c.remote_id])
+        count = self.insert_new(table, mcp.Persons.__table__, [('person_id', table.c.person_id)] +
+                                [(field, table.c[field]) for field in fields] +
+                                [('birth_date', table.c.dob), ('order', order),
+                                 ('type', literal(inspect(model).polymorphic_identity)),
+                                 ('country_id', table.c.country_id)], field='person_id')
+        self.insert_new(table, model.__table__, [('id', table.c.record_id), ('person_id', table.c.person_id)] +
+                        list(values))
+        self.insert_maps(table, map_model)
+        self.discard(table)
+        logger.info("{} {} records ingested".format(count, model.__name__))
+
+    def players(self, table):
+        self.resolve(table, 'position_id', self.lookup(mcp.Positions.id, [mcp.Positions.name]),
+                     [table.c.position_name])
+        self.persons(table, mcp.Players, mcs.PlayerMap,
+                     ready=self.optional(table, 'position_id', table.c.position_name),
+                     values=[('position_id', table.c.position_id)])
+
+    def managers(self, table):
+        self.persons(table, mcp.Managers, mcs.ManagerMap)
+
+    def referees(self, table):
+        self.persons(table, mcp.Referees, mcs.RefereeMap)
+
+    def league_matches(self, table):
+        references = [
+            ('competition_id', mco.Competitions.id, mco.Competitions.name, table.c.competition),
+            ('season_id', mco.Seasons.id, mco.Seasons.name, table.c.season),
+            ('venue_id', mco.Venues.id, mco.Venues.name, table.c.venue),
+            ('home_team_id', mc.Clubs.id, mc.Clubs.name, table.c.home_team),
+            ('away_team_id', mc.Clubs.id, mc.Clubs.name, table.c.away_team),
+            ('home_manager_id', mcp.Managers.id, mcp.Managers.full_name, table.c.home_manager),
+            ('away_manager_id', mcp.Managers.id, mcp.Managers.full_name, table.c.away_manager),
+            ('referee_id', mcp.Referees.id, mcp.Referees.full_name, table.c.referee)
+        ]
+        for field, id_column, key, value in references:
+            self.resolve(table, field, self.lookup(id_column, [key]), [value])
+        ready = and_(table.c.competition_id != None, table.c.season_id != None,
+                     table.c.home_team_id != None, table.c.away_team_id != None,
+                     *([self.optional(table, field, value) for field, _, _, value in references] +
+                       [self.valid(table.c[field], enums.WeatherConditionType)
+                        for field in ['kickoff_wx', 'halftime_wx', 'fulltime_wx']]))
+        match_fields = ['competition_id', 'season_id', 'matchday', 'home_team_id', 'away_team_id']
+        self.mapped(table, mcs.MatchMap)
+        self.resolve(table, 'record_id',
+                     self.lookup(mc.ClubLeagueMatches.id, [getattr(mc.ClubLeagueMatches, field)
+                                                           for field in match_fields]),
+                     [table.c[field] for field in match_fields], where=ready, null_safe=True)
+        self.allocate(table, 'record_id', mcm.Matches.__table__, ready, [table.c.remote_id])
+        count = self.insert_new(table, mcm.Matches.__table__, [
+            ('id', table.c.record_id), ('date', table.c.date), ('attendance', func.coalesce(table.c.attendance, 0)),
+            ('phase', literal(inspect(mc.ClubLeagueMatches).polymorphic_identity))] +
+            [(field, table.c[field]) for field in ['competition_id', 'season_id', 'venue_id', 'referee_id',
+                                                   'home_manager_id', 'away_manager_id']])
+        self.insert_new(table, mc.ClubLeagueMatches.__table__, [
+            ('id', table.c.record_id), ('matchday', table.c.matchday),
+            ('home_team_id', table.c.home_team_id), ('away_team_id', table.c.away_team_id)])
+        self.insert_new(table, mcm.MatchConditions.__table__, [
+            ('id', table.c.record_id), ('kickoff_temp', table.c.kickoff_temp),
+            ('kickoff_humidity', table.c.kickoff_humid), ('kickoff_weather', table.c.kickoff_wx),
+            ('halftime_weather', table.c.halftime_wx), ('fulltime_weather', table.c.fulltime_wx)])
+        self.insert_maps(table, mcs.MatchMap)
+        self.discard(table)
+        logger.info("{} league match records ingested".format(count))
+
+    def match_lineups(self, table):
+        self.resolve(table, 'match_id', self.lookup(mcs.MatchMap.id, [mcs.MatchMap.remote_id],
+                                                    mcs.MatchMap.supplier_id == self.supplier_id),
+                     [table.c.remote_match_id])
+        self.resolve(table, 'team_id', self.lookup(mc.Clubs.id, [mc.Clubs.name]), [table.c.player_team])
+        self.resolve(table, 'player_id', self.lookup(mcp.Players.id, [mcp.Players.full_name]),
+                     [table.c.player_name])
+        ready = and_(table.c.match_id != None, table.c.player_id != None,
+                     self.optional(table, 'team_id', table.c.player_team))
+        keys = [table.c.match_id, table.c.player_id]
+        self.resolve(table, 'record_id', self.lookup(mc.ClubMatchLineups.id, [mc.ClubMatchLineups.match_id,
+                                                                              mc.ClubMatchLineups.player_id]),
+                     keys, where=ready)
+        self.allocate(table, 'record_id', mcm.MatchLineups.__table__, ready, keys)
+        count = self.insert_new(table, mcm.MatchLineups.__table__, [
+            ('id', table.c.record_id), ('is_starting', func.coalesce(table.c.starter, False)),
+            ('is_captain', func.coalesce(table.c.captain, False)),
+            ('type', literal(inspect(mc.ClubMatchLineups).polymorphic_identity)),
+            ('match_id', table.c.match_id), ('player_id', table.c.player_id)])
+        self.insert_new(table, mc.ClubMatchLineups.__table__, [('id', table.c.record_id),
+                                                               ('team_id', table.c.team_id)])
+        self.discard(table)
+        logger.info("{} match lineup records ingested".format(count))
+
+    def player_stats(self, table):
+        """
+        Load staged statistics records of all categories, with one INSERT ... SELECT per category.
+
+        Category fields are staged as ``<category>.<field>`` columns, and records whose quantities are all
+        zero are not written.
+        """
+        self.resolve(table, 'player_id', self.lookup(mcs.PlayerMap.id, [mcs.PlayerMap.remote_id],
+                                                     mcs.PlayerMap.supplier_id == self.supplier_id),
+                     [table.c.remote_player_id])
+        club_lookup = self.lookup(mc.ClubMap.id, [mc.ClubMap.remote_id], mc.ClubMap.supplier_id == self.supplier_id)
+        self.resolve(table, 'player_team_id', club_lookup, [table.c.remote_player_team_id])
+        self.resolve(table, 'opposing_team_id', club_lookup, [table.c.remote_opposing_team_id])
+        is_home = table.c.locale == u'Home'
+        home_id = case([(is_home, table.c.player_team_id)], else_=table.c.opposing_team_id)
+        away_id = case([(is_home, table.c.opposing_team_id)], else_=table.c.player_team_id)
+        self.resolve(table, 'match_id', self.lookup(mc.ClubLeagueMatches.id, [
+            mc.ClubLeagueMatches.home_team_id, mc.ClubLeagueMatches.away_team_id, mc.ClubLeagueMatches.date]),
+            [home_id, away_id, table.c.match_date])
+        self.resolve(table, 'lineup_id', self.lookup(mc.ClubMatchLineups.id, [mc.ClubMatchLineups.match_id,
+                                                                              mc.ClubMatchLineups.player_id]),
+                     [table.c.match_id, table.c.player_id])
+        for category, (model, fields) in MarcottiStatLoad.stat_models.items():
+            stat_table = model.__table__
+            columns = [(field, table.c['{}.{}'.format(category, field)]) for field in fields
+                       if '{}.{}'.format(category, field) in table.c]
+            if not columns:
+                continue
+            values = [(field, func.coalesce(column, stat_table.c[field].default.arg
+                                            if getattr(stat_table.c[field].default, 'is_scalar', False) else 0))
+                      for field, column in columns]
+            source = select([table.c.lineup_id] + [value for _, value in values]).where(and_(
+                self.supplied(table), table.c.lineup_id != None,
+                or_(*[func.coalesce(column, 0) != 0 for _, column in columns]),
+                ~exists().where(stat_table.c.lineup_id == table.c.lineup_id)))
+            count = self.session.execute(stat_table.insert().from_select(
+                ['lineup_id'] + [field for field, _ in values], source)).rowcount
+            logger.info("{} {} records".format(count, model.__name__))
+        self.discard(table, 'lineup_id')
@@ -1,4 +1,9 @@
 import logging
+from collections import defaultdict, OrderedDict
+
+import pandas as pd
+from sqlalchemy import Sequence, bindparam, inspect, text
+from sqlalchemy.dialects import postgresql
 
 import marcotti.models.common.suppliers as mcs
 import marcotti.models.common.overview as mco
@@ -8,6 +13,7 @@ import marcotti.models.common.events as mce
 import marcotti.models.common.statistics as stats
 import marcotti.models.club as mc
 from .workflows import WorkflowBase
+from .lookup import LookupCache
 
 
 logger = logging.getLogger(__name__)
@@ -16,21 +22,446 @@ logger = logging.getLogger(__name__)
 class MarcottiLoad(WorkflowBase):
     """
     Load transformed data into database.
+
+    Loader methods flush their records to the database, and transactions are committed according to the commit
+    policy of the loader:
+
+    * ``'entity'``: commit once after all data of a data entity have been loaded.
+    * ``'workflow'``: never commit, and leave the commit to the owner of the session.
+    * Number of rows N: commit after every N rows loaded, and after all data of a data entity have been loaded.
+      Batches of more than N rows are loaded in slices of at most N rows, each committed once it is loaded.
+
+    Each batch of data is loaded within a savepoint where the database connection supports them, so that a
+    batch that fails is rolled back without discarding the batches loaded before it.
     """
+
+    COMMIT_POLICIES = ('entity', 'workflow')
+
+    id_block_statements = {
+        'postgresql': "SELECT nextval('{sequence}') FROM generate_series(1, :count)",
+        'oracle': "SELECT {sequence}.nextval FROM dual CONNECT BY level <= :count"
+    }
+    insert_chunk_size = 10000
+
+    def __init__(self, session, supplier, cache=None, commit='entity'):
+        super(MarcottiLoad, self).__init__(session, supplier, cache)
+        row_count = isinstance(commit, (int, long)) and not isinstance(commit, bool) and commit > 0
+        if commit not in self.COMMIT_POLICIES and not row_count:
+            raise ValueError("Invalid commit policy: {!r}".format(commit))
+        self.commit_policy = commit
+        self.uncommitted = 0
+
+    @property
+    def savepoints(self):
+        """
+        Check whether the connection of the session supports savepoints.
+
+        The pysqlite driver supports savepoints only if its connections leave transaction control to SQLAlchemy,
+        which requires an isolation level of None on the connections and a BEGIN statement at the start of each
+        transaction.
+        """
+        connection = self.session.connection()
+        if connection.dialect.name == 'sqlite':
+            return connection.connection.isolation_level is None
+        return True
+
+    @property
+    def can_allocate_ids(self):
+        return self.session.get_bind().dialect.name in self.id_block_statements
+
+    def allocate_ids(self, table, count):
+        """
+        Retrieve block of values from the ID sequence of a table in one query.
+
+        :param table: Table object whose primary key column is defined with a Sequence.
+        :param count: Number of ID values.
+        :return: List of ID values.
+        """
+        dialect = self.session.get_bind().dialect
+        sequence = list(table.primary_key)[0].default
+        statement = text(self.id_block_statements[dialect.name].format(
+            sequence=dialect.identifier_preparer.format_sequence(sequence)))
+        return [row[0] for row in self.session.execute(statement, dict(count=count))]
+
+    @staticmethod
+    def model_tables(model):
+        """
+        Retrieve mapped tables of a data model, from the base table of its inheritance hierarchy down.
+
+        :param model: Data model class.
+        :return: List of Table objects.
+        """
+        tables = []
+        for table in [base.local_table for base in reversed(list(inspect(model).iterate_to_root()))]:
+            if table not in tables:
+                tables.append(table)
+        return tables
+
+    def model_ids(self, model, count):
+        """
+        Allocate IDs for new records of a data model.
+
+        Primary key columns that are defined with a Sequence receive a block of values from the sequence, and
+        columns that refer to them, such as the primary keys of the subclass tables of a joined inheritance
+        hierarchy, receive the same values.
+
+        :param model: Data model class.
+        :param count: Number of records.
+        :return: Dictionary of lists of ID values, keyed by Column object.
+        """
+        values = {}
+        for table in self.model_tables(model):
+            for column in table.c:
+                if column.primary_key and isinstance(column.default, Sequence):
+                    values[column] = self.allocate_ids(table, count)
+                else:
+                    for foreign_key in column.foreign_keys:
+                        if foreign_key.column in values:
+                            values[column] = values[foreign_key.column]
+        return values
+
+    def table_rows(self, model, records, ids):
+        """
+        Split records of a data model into rows of each of its mapped tables.
+
+        Missing fields are set to the column defaults, ID columns are set to the allocated IDs, and the
+        polymorphic discriminator of the model is set where one is defined.
+
+        :param model: Data model class.
+        :param records: List of dictionaries of record fields.
+        :param ids: Dictionary of lists of allocated ID values, keyed by Column object.
+        :return: List of tuples of Table object, list of column names, and list of tuples of column values.
+        """
+        mapper = inspect(model)
+        fields = set(field for record in records for field in record)
+        fixed = {}
+        if mapper.polymorphic_on is not None:
+            fixed[mapper.polymorphic_on.name] = mapper.polymorphic_identity
+        table_rows = []
+        for table in self.model_tables(model):
+            columns = [column for column in table.c
+                       if column in ids or column.name in fields or column.name in fixed or
+                       getattr(column.default, 'is_scalar', False)]
+            defaults = [column.default.arg if getattr(column.default, 'is_scalar', False) else None
+                        for column in columns]
+            rows = []
+            for n, record in enumerate(records):
+                rows.append(tuple(
+                    ids[column][n] if column in ids else
+                    fixed[column.name] if column.name in fixed else
+                    default if record.get(column.name) is None else record[column.name]
+                    for column, default in zip(columns, defaults)))
+            table_rows.append((table, [column.name for column in columns], rows))
+        return table_rows
+
+    def insert_records(self, model, records):
+        """
+        Write new records of a data model and retrieve their IDs.
+
+        Where the database can allocate blocks of sequence values, the IDs are reserved with one query per
+        sequence, and the rows of each mapped table are written with executemany INSERT statements.  Dependent
+        records can then be built from the returned IDs without reading back any rows.  Otherwise the records
+        are added to the session and their IDs are read back after a flush.
+
+        :param model: Data model class.
+        :param records: List of dictionaries of record fields.
+        :return: List of IDs of the records.
+        """
+        if not records:
+            return []
+        if not self.can_allocate_ids:
+            objects = [model(**record) for record in records]
+            self.session.add_all(objects)
+            self.session.flush()
+            return [obj.id for obj in objects]
+        self.session.flush()
+        id_column = inspect(model).columns['id']
+        record_ids = []
+        for start in range(0, len(records), self.insert_chunk_size):
+            chunk = records[start:start + self.insert_chunk_size]
+            ids = self.model_ids(model, len(chunk))
+            for table, columns, rows in self.table_rows(model, chunk, ids):
+                self.session.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+            record_ids.extend(ids[id_column] if id_column in ids else [record.get('id') for record in chunk])
+        self.cache.invalidate(model)
+        return record_ids
+
+    def load(self, entity, data_frame):
+        """
+        Load a batch of transformed data of a data entity, and commit if the commit policy calls for it.
+
+        Under a commit policy of N rows, the batch is loaded in slices that fill up the rows left before the next
+        commit.
+
+        :param entity: Data model name.
+        :param data_frame: DataFrame of transformed data.
+        """
+        if self.commit_policy in self.COMMIT_POLICIES:
+            self.load_slice(entity, data_frame)
+            return
+        start = 0
+        while start < len(data_frame):
+            size = self.commit_policy - self.uncommitted
+            self.load_slice(entity, data_frame.iloc[start:start + size])
+            start += size
+            if self.uncommitted >= self.commit_policy:
+                self.commit()
+
+    def load_slice(self, entity, data_frame):
+        """
+        Load transformed data of a data entity within a savepoint, if the connection supports them.
+
+        :param entity: Data model name.
+        :param data_frame: DataFrame of transformed data.
+        """
+        savepoint = self.session.begin_nested() if self.savepoints else None
+        try:
+            getattr(self, entity)(data_frame)
+        except Exception:
+            if savepoint is not None:
+                savepoint.rollback()
+            raise
+        if savepoint is not None:
+            savepoint.commit()
+        self.uncommitted += len(data_frame)
+
+    def finish(self):
+        """
+        End loading of a data entity, and commit unless the commit policy leaves commits to the session owner.
+        """
+        if self.commit_policy != 'workflow':
+            self.commit()
+        else:
+            self.session.flush()
+
+    def commit(self):
+        self.session.commit()
+        self.uncommitted = 0
+
     def record_exists(self, model, **conditions):
         return self.session.query(model).filter_by(**conditions).count() != 0
 
+    @staticmethod
+    def condition_chunks(conditions):
+        """
+        Group a batch of record conditions by the fields that they condition on, in chunks that fit an IN clause.
+
+        :param conditions: List of dictionaries of record conditions.
+        :return: Generator of tuples of sorted field names and list of positions of conditions in the batch.
+        """
+        groups = defaultdict(list)
+        for n, condition in enumerate(conditions):
+            groups[tuple(sorted(condition))].append(n)
+        for fields, positions in groups.items():
+            for start in range(0, len(positions), LookupCache.IN_CHUNK):
+                yield fields, positions[start:start + LookupCache.IN_CHUNK]
+
+    def records_exist(self, model, conditions):
+        """
+        Check existence of a batch of records in the database.
+
+        Records that are conditioned on the same fields are checked together, with one query per chunk of
+        records that retrieves the existing values of those fields.
+
+        :param model: Data model class.
+        :param conditions: List of dictionaries of record conditions.
+        :return: List of booleans, True if a record exists for the corresponding conditions.
+        """
+        flags = [False] * len(conditions)
+        for fields, chunk in self.condition_chunks(conditions):
+            if not fields:
+                for n in chunk:
+                    flags[n] = self.record_exists(model)
+                continue
+            columns = [getattr(model, field) for field in fields]
+            query = self.session.query(*columns).select_from(model).filter(
+                *[column.in_(set(conditions[n][field] for n in chunk)) for field, column in zip(fields, columns)])
+            existing = set(tuple(LookupCache.normalize(value) for value in row) for row in query)
+            for n in chunk:
+                flags[n] = tuple(LookupCache.normalize(conditions[n][field]) for field in fields) in existing
+        return flags
+
+    def record_ids(self, model, conditions):
+        """
+        Retrieve IDs of a batch of records in the database, with one query per chunk of records that are
+        conditioned on the same fields.
+
+        If several records match the conditions of a record, the lowest ID is returned.
+
+        :param model: Data model class.
+        :param conditions: List of dictionaries of record conditions.
+        :return: List of IDs, None for conditions that no record matches.
+        """
+        ids = [None] * len(conditions)
+        for fields, chunk in self.condition_chunks(conditions):
+            columns = [getattr(model, field) for field in fields]
+            query = self.session.query(model.id, *columns).filter(
+                *[column.in_(set(conditions[n][field] for n in chunk)) for field, column in zip(fields, columns)])
+            found = {}
+            for row in query:
+                key = tuple(LookupCache.normalize(value) for value in row[1:])
+                found[key] = min(found.get(key, row[0]), row[0])
+            for n in chunk:
+                ids[n] = found.get(tuple(LookupCache.normalize(conditions[n][field]) for field in fields))
+        return ids
+
+    def mapped_ids(self, map_model, remote_ids):
+        """
+        Retrieve IDs of records that are mapped to remote IDs of the supplier, with one query per chunk of remote IDs.
+
+        :param map_model: Supplier mapping data model class.
+        :param remote_ids: List of remote IDs.
+        :return: Dictionary of IDs keyed by normalized remote ID.
+        """
+        mapped = {}
+        distinct = list(set(remote_id for remote_id in remote_ids if remote_id is not None))
+        for start in range(0, len(distinct), LookupCache.IN_CHUNK):
+            query = self.session.query(map_model.remote_id, map_model.id).filter(
+                map_model.remote_id.in_(distinct[start:start + LookupCache.IN_CHUNK]),
+                map_model.supplier_id == self.supplier_id)
+            for remote_id, record_id in query:
+                mapped.setdefault(LookupCache.normalize(remote_id), record_id)
+        return mapped
+
+    def upsert_maps(self, map_model, pairs):
+        """
+        Write supplier mapping records of pairs of IDs and remote IDs, skipping records that are already in the
+        mapping table.
+
+        Existing records are skipped by the database with native upserts where the dialect supports them: INSERT
+        ... ON CONFLICT DO NOTHING on PostgreSQL, INSERT OR IGNORE on SQLite, and INSERT IGNORE on MySQL.  On
+        other dialects existing records are filtered out with a batch query first.
+
+        :param map_model: Supplier mapping data model class.
+        :param pairs: List of tuples of ID and remote ID.
+        """
+        records = [dict(id=record_id, remote_id=remote_id, supplier_id=self.supplier_id)
+                   for record_id, remote_id in set(pairs) if record_id is not None and remote_id]
+        if not records:
+            return
+        table = map_model.__table__
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            statement = postgresql.insert(table).on_conflict_do_nothing()
+        elif dialect == 'sqlite':
+            statement = table.insert().prefix_with('OR IGNORE')
+        elif dialect == 'mysql':
+            statement = table.insert().prefix_with('IGNORE')
+        else:
+            statement, records = table.insert(), self.new_records(map_model, records)
+        for start in range(0, len(records), LookupCache.IN_CHUNK):
+            self.session.execute(statement, records[start:start + LookupCache.IN_CHUNK])
+        self.cache.invalidate(map_model)
+
+    def load_persons(self, model, map_model, person_dicts, remote_ids):
+        """
+        Reconcile person records with the database and the supplier mappings, in a few statements per batch:
+
+        1. Retrieve IDs of persons mapped to the remote IDs.
+        2. Retrieve IDs of unmapped persons that are in the database.
+        3. Insert unmapped persons that are not in the database.
+        4. Map unmapped persons to their remote IDs.
+        5. Update mapped persons whose fields differ from the database records.
+
+        :param model: Person data model class.
+        :param map_model: Supplier mapping data model class of person model.
+        :param person_dicts: List of dictionaries of person fields.
+        :param remote_ids: List of remote IDs of persons.
+        :return: List of IDs of persons.
+        """
+        mapped = self.mapped_ids(map_model, remote_ids)
+        person_ids = [mapped.get(LookupCache.normalize(remote_id)) for remote_id in remote_ids]
+        unmapped = [n for n, person_id in enumerate(person_ids) if person_id is None]
+        existing = self.record_ids(model, [person_dicts[n] for n in unmapped])
+        new_persons = []
+        for n, person_id in zip(unmapped, existing):
+            if person_id is None:
+                new_persons.append(n)
+            else:
+                person_ids[n] = person_id
+        for n, person_id in zip(new_persons, self.insert_records(model, [person_dicts[n] for n in new_persons])):
+            person_ids[n] = person_id
+        logger.info("{} {} records ingested".format(len(new_persons), model.__name__))
+        self.upsert_maps(map_model, [(person_ids[n], remote_ids[n]) for n in unmapped])
+        unmapped = set(unmapped)
+        changed = self.update_persons(model, {person_ids[n]: person_dicts[n]
+                                              for n in range(len(person_dicts)) if n not in unmapped})
+        logger.info("{} {} records updated".format(changed, model.__name__))
+        return person_ids
+
+    def update_persons(self, model, updates):
+        """
+        Update the changed fields of person records in bulk.
+
+        The current fields of the records are retrieved with one query per chunk of records and compared with
+        the incoming fields.  Only the fields that differ are written, with one executemany UPDATE per table of
+        the person model and set of changed fields.
+
+        :param model: Person data model class.
+        :param updates: Dictionary of dictionaries of incoming person fields, keyed by person ID.
+        :return: Number of person records that changed.
+        """
+        fields = sorted(set(field for person_dict in updates.values() for field in person_dict))
+        columns = {field: model.__mapper__.columns[field] for field in fields}
+        tables = model.__mapper__.tables
+        keys = [list(table.primary_key)[0] for table in tables]
+        ids = list(updates)
+        changes = defaultdict(list)
+        changed = 0
+        for start in range(0, len(ids), LookupCache.IN_CHUNK):
+            query = self.session.query(model.id, *(keys + [getattr(model, field) for field in fields])).\
+                select_from(model).filter(model.id.in_(ids[start:start + LookupCache.IN_CHUNK]))
+            for row in query:
+                current = dict(zip(fields, row[1 + len(keys):]))
+                diff = {field: value for field, value in updates[row[0]].items()
+                        if LookupCache.normalize(value) != LookupCache.normalize(current[field])}
+                if not diff:
+                    continue
+                changed += 1
+                for table, key_value in zip(tables, row[1:1 + len(keys)]):
+                    params = {columns[field].key: value for field, value in diff.items()
+                              if columns[field].table is table}
+                    if params:
+                        changes[(table, tuple(sorted(params)))].append(dict(params, _key=key_value))
+        for (table, _), params in changes.items():
+            key = list(table.primary_key)[0]
+            self.session.execute(table.update().where(key == bindparam('_key')), params)
+        if changed:
+            self.cache.invalidate(model)
+        return changed
+
+    def new_records(self, model, records):
+        """
+        Filter out records that already exist in the database.
+
+        :param model: Data model class.
+        :param records: List of dictionaries of record fields.
+        :return: List of dictionaries of records not in the database.
+        """
+        return [record for record, existing in zip(records, self.records_exist(model, records)) if not existing]
+
+    def save_records(self, model, records):
+        """
+        Write new records of a data model.
+
+        :param model: Data model class.
+        :param records: List of dictionaries of record fields.
+        """
+        self.insert_records(model, records)
+
     def suppliers(self, data_frame):
-        supplier_records = [mcs.Suppliers(**data_row) for idx, data_row in data_frame.iterrows()
-                            if not self.record_exists(mcs.Suppliers, name=data_row['name'])]
+        rows = [data_row for idx, data_row in data_frame.iterrows()]
+        exists = self.records_exist(mcs.Suppliers, [dict(name=data_row['name']) for data_row in rows])
+        supplier_records = [mcs.Suppliers(**data_row) for data_row, existing in zip(rows, exists) if not existing]
         self.session.add_all(supplier_records)
-        self.session.commit()
+        self.session.flush()
 
     def years(self, data_frame):
-        year_records = [mco.Years(**data_row) for idx, data_row in data_frame.iterrows()
-                        if not self.record_exists(mco.Years, yr=data_row['yr'])]
+        rows = [data_row for idx, data_row in data_frame.iterrows()]
+        exists = self.records_exist(mco.Years, [dict(yr=data_row['yr']) for data_row in rows])
+        year_records = [mco.Years(**data_row) for data_row, existing in zip(rows, exists) if not existing]
         self.session.add_all(year_records)
-        self.session.commit()
+        self.session.flush()
 
     def seasons(self, data_frame):
         season_records = []
@@ -53,101 +484,89 @@ class MarcottiLoad(WorkflowBase):
                                                      remote_id=row['remote_id'],
                                                      supplier_id=self.supplier_id))
                 self.session.add_all(map_records)
-        self.session.commit()
+        self.session.flush()
 
     def countries(self, data_frame):
         remote_ids = []
-        country_records = []
+        country_dicts = []
         fields = ['name', 'code', 'confederation']
-        for idx, row in data_frame.iterrows():
-            country_dict = {field: row[field] for field in fields if row[field]}
-            if not self.record_exists(mco.Countries, name=row['name']):
-                country_records.append(mco.Countries(**country_dict))
+        rows = [row for idx, row in data_frame.iterrows()]
+        exists = self.records_exist(mco.Countries, [dict(name=row['name']) for row in rows])
+        for row, existing in zip(rows, exists):
+            if not existing:
+                country_dicts.append({field: row[field] for field in fields if row[field]})
                 remote_ids.append(row['remote_id'])
-        self.session.add_all(country_records)
-        self.session.commit()
-        map_records = [mcs.CountryMap(id=country_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, country_record in zip(remote_ids, country_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
+        country_ids = self.insert_records(mco.Countries, country_dicts)
+        self.upsert_maps(mcs.CountryMap, zip(country_ids, remote_ids))
 
     def competitions(self, data_frame):
         remote_ids = []
-        comp_records = []
-        for idx, row in data_frame.iterrows():
-            if 'country_id' in data_frame.columns:
-                fields = ['name', 'level', 'country_id']
-                comp_dict = {field: row[field] for field in fields if row[field]}
-                if not self.record_exists(mco.DomesticCompetitions, **comp_dict):
-                    comp_records.append(mco.DomesticCompetitions(**comp_dict))
-                    remote_ids.append(row['remote_id'])
-            elif 'confederation' in data_frame.columns:
-                fields = ['name', 'level', 'confederation']
-                comp_dict = {field: row[field] for field in fields if row[field]}
-                if not self.record_exists(mco.InternationalCompetitions, **comp_dict):
-                    comp_records.append(mco.InternationalCompetitions(**comp_dict))
-                    remote_ids.append(row['remote_id'])
-        self.session.add_all(comp_records)
-        self.session.commit()
-        map_records = [mcs.CompetitionMap(id=comp_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, comp_record in zip(remote_ids, comp_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
+        new_dicts = []
+        if 'country_id' in data_frame.columns:
+            model = mco.DomesticCompetitions
+            fields = ['name', 'level', 'country_id']
+        elif 'confederation' in data_frame.columns:
+            model = mco.InternationalCompetitions
+            fields = ['name', 'level', 'confederation']
+        else:
+            model, fields = None, []
+        rows = [row for idx, row in data_frame.iterrows()] if model else []
+        comp_dicts = [{field: row[field] for field in fields if row[field]} for row in rows]
+        exists = self.records_exist(model, comp_dicts) if model else []
+        for row, comp_dict, existing in zip(rows, comp_dicts, exists):
+            if not existing:
+                new_dicts.append(comp_dict)
+                remote_ids.append(row['remote_id'])
+        comp_ids = self.insert_records(model, new_dicts) if model else []
+        self.upsert_maps(mcs.CompetitionMap, zip(comp_ids, remote_ids))
 
     def clubs(self, data_frame):
         remote_ids = []
-        club_records = []
-        fields = ['short_name', 'name', 'country_id']
-        for idx, row in data_frame.iterrows():
-            club_dict = {field: row[field] for field in fields if row[field]}
-            if not self.record_exists(mc.Clubs, **club_dict):
-                club_records.append(mc.Clubs(**club_dict))
+        new_dicts = []
+        fields = ['name', 'country_id']
+        rows = [row for idx, row in data_frame.iterrows()]
+        club_dicts = [{field: row[field] for field in fields if row[field]} for row in rows]
+        for row, club_dict, existing in zip(rows, club_dicts, self.records_exist(mc.Clubs, club_dicts)):
+            if not existing:
+                new_dicts.append(club_dict)
                 remote_ids.append(row['remote_id'])
-        self.session.add_all(club_records)
-        self.session.commit()
-        map_records = [mc.ClubMap(id=club_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, club_record in zip(remote_ids, club_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
+        club_ids = self.insert_records(mc.Clubs, new_dicts)
+        self.upsert_maps(mc.ClubMap, zip(club_ids, remote_ids))
 
     def venues(self, data_frame):
         remote_ids = []
-        venue_records = []
-        history_records = []
+        new_dicts = []
+        history_dicts = []
         fields = ['name', 'city', 'region', 'latitude', 'longitude', 'altitude', 'country_id', 'timezone_id']
-        history_fields = ['eff_date', 'length', 'width', 'capacity', 'seats', 'surface_id']
-        for idx, row in data_frame.iterrows():
-            venue_dict = {field: row[field] for field in fields if row[field]}
-            if not self.record_exists(mco.Venues, **venue_dict):
-                venue_records.append(mco.Venues(**venue_dict))
-                history_dict = {field: row[field] for field in history_fields if row[field]}
-                history_records.append(mco.VenueHistory(venue_id=venue_dict['id'], **history_dict))
+        history_fields = ['date', 'length', 'width', 'capacity', 'seats', 'surface_id']
+        rows = [row for idx, row in data_frame.iterrows()]
+        venue_dicts = [{field: row[field] for field in fields if row[field]} for row in rows]
+        for row, venue_dict, existing in zip(rows, venue_dicts, self.records_exist(mco.Venues, venue_dicts)):
+            if not existing:
+                new_dicts.append(venue_dict)
+                history_dicts.append({field: row[field] for field in history_fields if row[field]})
                 remote_ids.append(row['remote_id'])
-        self.session.add_all(venue_records)
-        self.session.add_all(history_records)
-        self.session.commit()
-        map_records = [mcs.VenueMap(id=venue_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, venue_record in zip(remote_ids, venue_records) if remote_id]
-        self.session.bulk_save_objects(map_records)
-        self.session.commit()
+        venue_ids = self.insert_records(mco.Venues, new_dicts)
+        self.insert_records(mco.VenueHistory, [dict(history_dict, venue_id=venue_id)
+                                               for venue_id, history_dict in zip(venue_ids, history_dicts)])
+        self.upsert_maps(mcs.VenueMap, zip(venue_ids, remote_ids))
 
     def surfaces(self, data_frame):
-        surface_records = [mco.Surfaces(**row) for indx, row in data_frame.iterrows()
-                           if not self.record_exists(mco.Surfaces, description=row['description'])]
+        rows = [row for indx, row in data_frame.iterrows()]
+        exists = self.records_exist(mco.Surfaces, [dict(description=row['description']) for row in rows])
+        surface_records = [mco.Surfaces(**row) for row, existing in zip(rows, exists) if not existing]
         self.session.add_all(surface_records)
-        self.session.commit()
+        self.session.flush()
 
     def timezones(self, data_frame):
-        tz_records = [mco.Timezones(**row) for indx, row in data_frame.iterrows()
-                      if not self.record_exists(mco.Timezones, name=row['name'])]
+        rows = [row for indx, row in data_frame.iterrows()]
+        exists = self.records_exist(mco.Timezones, [dict(name=row['name']) for row in rows])
+        tz_records = [mco.Timezones(**row) for row, existing in zip(rows, exists) if not existing]
         self.session.add_all(tz_records)
-        self.session.commit()
+        self.session.flush()
 
     def players(self, data_frame):
         player_set = set()
-        player_records = []
-        remote_countryids = []
-        remote_ids = []
         fields = ['known_first_name', 'first_name', 'middle_name', 'last_name', 'second_last_name',
                   'nick_name', 'birth_date', 'order', 'country_id', 'position_id', 'remote_id',
                   'remote_country_id']
@@ -156,247 +575,192 @@ class MarcottiLoad(WorkflowBase):
             player_set.add(tuple([(field, row[field]) for field in fields
                                   if field in row and row[field] is not None]))
         logger.info("{} players in data feed".format(len(player_set)))
-        for elements in player_set:
-            player_dict = dict(elements)
-            remote_id = player_dict.pop('remote_id')
-            remote_country_id = player_dict.pop('remote_country_id', None)
-            if not self.record_exists(mcs.PlayerMap, remote_id=remote_id):
-                if not self.record_exists(mcp.Players, **player_dict):
-                    player_records.append(mcp.Players(**player_dict))
-                    remote_ids.append(remote_id)
-                    remote_countryids.append(remote_country_id)
-                else:
-                    player_id = self.session.query(mcp.Players).filter_by(**player_dict).one().id
-                    map_record = mcs.PlayerMap(id=player_id, remote_id=remote_id, supplier_id=self.supplier_id)
-                    self.session.add(map_record)
-            else:
-                player_id = self.session.query(mcs.PlayerMap).filter_by(remote_id=remote_id).one().id
-                if not self.record_exists(mcp.Players, **player_dict):
-                    updated_records = self.session.query(mcp.Players).\
-                        filter(mcp.Players.person_id == mcp.Persons.person_id).\
-                        filter(mcp.Players.id == player_id)
-                    for rec in updated_records:
-                        for field, value in player_dict.items():
-                            setattr(rec, field, value)
-        if self.session.dirty:
-            self.session.commit()
-
-        logger.info("{} player records ingested".format(len(player_records)))
-        self.session.add_all(player_records)
-        self.session.commit()
-        map_records = [mcs.PlayerMap(id=player_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, player_record in zip(remote_ids, player_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
-
-        for remote_id, player_record in zip(remote_countryids, player_records):
-            if remote_id and not self.record_exists(mcs.CountryMap, remote_id=remote_id,
-                                                    supplier_id=self.supplier_id):
-                self.session.add(mcs.CountryMap(id=player_record.country_id, remote_id=remote_id,
-                                                supplier_id=self.supplier_id))
-                self.session.commit()
+        player_dicts = [dict(elements) for elements in player_set]
+        remote_fields = [(player_dict.pop('remote_id'), player_dict.pop('remote_country_id', None))
+                         for player_dict in player_dicts]
+        self.load_persons(mcp.Players, mcs.PlayerMap, player_dicts, [remote_id for remote_id, _ in remote_fields])
+
+        country_pairs = {}
+        for player_dict, (_, remote_country_id) in zip(player_dicts, remote_fields):
+            if remote_country_id and player_dict.get('country_id') is not None:
+                country_pairs.setdefault(LookupCache.normalize(remote_country_id),
+                                         (player_dict['country_id'], remote_country_id))
+        mapped = self.mapped_ids(mcs.CountryMap, [remote_id for _, remote_id in country_pairs.values()])
+        self.upsert_maps(mcs.CountryMap, [pair for key, pair in country_pairs.items() if key not in mapped])
 
     def managers(self, data_frame):
-        manager_records = []
-        remote_ids = []
         fields = ['known_first_name', 'first_name', 'middle_name', 'last_name', 'second_last_name',
                   'nick_name', 'birth_date', 'order', 'country_id']
-        for indx, row in data_frame.iterrows():
-            manager_dict = {field: row[field] for field in fields if field in row and row[field]}
-            if not self.record_exists(mcs.ManagerMap, remote_id=row['remote_id']):
-                if not self.record_exists(mcp.Managers, **manager_dict):
-                    manager_records.append(mcp.Managers(**manager_dict))
-                    remote_ids.append(row['remote_id'])
-                else:
-                    manager_id = self.session.query(mcp.Managers).filter_by(**manager_dict).one().id
-                    map_record = mcs.ManagerMap(id=manager_id, remote_id=row['remote_id'],
-                                                supplier_id=self.supplier_id)
-                    self.session.add(map_record)
-            else:
-                manager_id = self.session.query(mcs.ManagerMap).filter_by(remote_id=row['remote_id']).one().id
-                if not self.record_exists(mcp.Managers, **manager_dict):
-                    updated_records = self.session.query(mcp.Managers).\
-                        filter(mcp.Managers.person_id == mcp.Persons.person_id).\
-                        filter(mcp.Managers.id == manager_id)
-                    for rec in updated_records:
-                        for field, value in manager_dict.items():
-                            setattr(rec, field, value)
-        if self.session.dirty:
-            self.session.commit()
-
-        self.session.add_all(manager_records)
-        self.session.commit()
-        map_records = [mcs.ManagerMap(id=manager_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, manager_record in zip(remote_ids, manager_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
+        rows = [row for indx, row in data_frame.iterrows()]
+        manager_dicts = [{field: row[field] for field in fields if field in row and row[field]} for row in rows]
+        self.load_persons(mcp.Managers, mcs.ManagerMap, manager_dicts, [row['remote_id'] for row in rows])
 
     def referees(self, data_frame):
-        referee_records = []
-        remote_ids = []
         fields = ['known_first_name', 'first_name', 'middle_name', 'last_name', 'second_last_name',
                   'nick_name', 'birth_date', 'order', 'country_id']
-        for indx, row in data_frame.iterrows():
-            referee_dict = {field: row[field] for field in fields if field in row and row[field]}
-            if not self.record_exists(mcs.RefereeMap, remote_id=row['remote_id']):
-                if not self.record_exists(mcp.Referees, **referee_dict):
-                    referee_records.append(mcp.Referees(**referee_dict))
-                    remote_ids.append(row['remote_id'])
-                else:
-                    referee_id = self.session.query(mcp.Referees).filter_by(**referee_dict).one().id
-                    map_record = mcs.RefereeMap(id=referee_id, remote_id=row['remote_id'],
-                                                supplier_id=self.supplier_id)
-                    self.session.add(map_record)
-            else:
-                referee_id = self.session.query(mcs.RefereeMap).filter_by(remote_id=row['remote_id']).one().id
-                if not self.record_exists(mcp.Referees, **referee_dict):
-                    updated_records = self.session.query(mcp.Referees). \
-                        filter(mcp.Referees.person_id == mcp.Persons.person_id). \
-                        filter(mcp.Referees.id == referee_id)
-                    for rec in updated_records:
-                        for field, value in referee_dict.items():
-                            setattr(rec, field, value)
-        if self.session.dirty:
-            self.session.commit()
-
-        self.session.add_all(referee_records)
-        self.session.commit()
-        map_records = [mcs.RefereeMap(id=referee_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, referee_record in zip(remote_ids, referee_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
+        rows = [row for indx, row in data_frame.iterrows()]
+        referee_dicts = [{field: row[field] for field in fields if field in row and row[field]} for row in rows]
+        self.load_persons(mcp.Referees, mcs.RefereeMap, referee_dicts, [row['remote_id'] for row in rows])
 
     def positions(self, data_frame):
-        position_record = []
-        for indx, row in data_frame.iterrows():
-            if row['remote_id'] and self.supplier_id:
-                if not self.record_exists(mcs.PositionMap, remote_id=row['remote_id'], supplier_id=self.supplier_id):
-                    position_record.append(mcs.PositionMap(
-                        id=self.get_id(mcp.Positions, name=row['name']),
-                        remote_id=row['remote_id'], supplier_id=self.supplier_id))
-            else:
-                if not self.record_exists(mcp.Positions, name=row['name']):
-                    position_record.append(mcp.Positions(name=row['name'], type=row['type']))
-        self.session.add_all(position_record)
-        self.session.commit()
+        rows = [row for indx, row in data_frame.iterrows()]
+        is_mapping = [bool(row['remote_id'] and self.supplier_id) for row in rows]
+        position_rows = [row for row, mapping in zip(rows, is_mapping) if not mapping]
+        exists = self.records_exist(mcp.Positions, [dict(name=row['name']) for row in position_rows])
+        self.session.add_all([mcp.Positions(name=row['name'], type=row['type'])
+                              for row, existing in zip(position_rows, exists) if not existing])
+        self.session.flush()
+        self.upsert_maps(mcs.PositionMap, [(self.get_id(mcp.Positions, name=row['name']), row['remote_id'])
+                                           for row, mapping in zip(rows, is_mapping) if mapping])
 
     def league_matches(self, data_frame):
-        condition_records = []
-        match_records = []
-        remote_ids = []
-        fields = ['match_date', 'competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
+        fields = ['date', 'competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
                   'home_manager_id', 'away_manager_id', 'referee_id', 'attendance', 'matchday']
-        condition_fields = ['kickoff_time', 'kickoff_temp', 'kickoff_humidity',
-                            'kickoff_weather', 'halftime_weather', 'fulltime_weather']
-        for idx, row in data_frame.iterrows():
-            match_dict = {field: row[field] for field in fields if field in row and row[field] is not None}
-            condition_dict = {field: row[field] for field in condition_fields
-                              if field in row and row[field] is not None}
-            if not self.record_exists(mc.ClubLeagueMatches, **match_dict):
-                match_records.append(mc.ClubLeagueMatches(**match_dict))
-                condition_records.append(mcm.MatchConditions(id=match_dict['id'], **condition_dict))
-                remote_ids.append(row['remote_id'])
-
-        self.session.add_all(match_records)
-        self.session.add_all(condition_records)
-        self.session.commit()
-
-        map_records = [mcs.MatchMap(id=match_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, match_record in zip(remote_ids, match_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
+        self.load_matches(mc.ClubLeagueMatches, fields, data_frame)
 
     def knockout_matches(self, data_frame):
-        condition_records = []
-        match_records = []
-        remote_ids = []
-        fields = ['match_date', 'competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
+        fields = ['date', 'competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
                   'home_manager_id', 'away_manager_id', 'referee_id', 'attendance', 'matchday', 'ko_round',
                   'extra_time']
+        self.load_matches(mc.ClubKnockoutMatches, fields, data_frame)
+
+    def load_matches(self, model, fields, data_frame):
+        """
+        Write new match records together with their match conditions and supplier mappings.
+
+        :param model: Match data model class.
+        :param fields: List of match fields.
+        :param data_frame: DataFrame of transformed match data.
+        """
+        remote_ids = []
+        new_dicts = []
+        condition_dicts = []
         condition_fields = ['kickoff_time', 'kickoff_temp', 'kickoff_humidity',
                             'kickoff_weather', 'halftime_weather', 'fulltime_weather']
-        for idx, row in data_frame.iterrows():
-            match_dict = {field: row[field] for field in fields if field in row and row[field] is not None}
-            condition_dict = {field: row[field] for field in condition_fields
-                              if field in row and row[field] is not None}
-            if not self.record_exists(mc.ClubKnockoutMatches, **match_dict):
-                match_records.append(mc.ClubKnockoutMatches(**match_dict))
-                condition_records.append(mcm.MatchConditions(id=match_dict['id'], **condition_dict))
+        rows = [row for idx, row in data_frame.iterrows()]
+        match_dicts = [{field: row[field] for field in fields if field in row and row[field] is not None}
+                       for row in rows]
+        exists = self.records_exist(model, match_dicts)
+        for row, match_dict, existing in zip(rows, match_dicts, exists):
+            if not existing:
+                new_dicts.append(match_dict)
+                condition_dicts.append({field: row[field] for field in condition_fields
+                                        if field in row and row[field] is not None})
                 remote_ids.append(row['remote_id'])
-
-        self.session.add_all(match_records)
-        self.session.add_all(condition_records)
-        self.session.commit()
-
-        map_records = [mcs.MatchMap(id=match_record.id, remote_id=remote_id, supplier_id=self.supplier_id)
-                       for remote_id, match_record in zip(remote_ids, match_records) if remote_id]
-        self.session.add_all(map_records)
-        self.session.commit()
+        match_ids = self.insert_records(model, new_dicts)
+        self.insert_records(mcm.MatchConditions, [dict(condition_dict, id=match_id)
+                                                  for match_id, condition_dict in zip(match_ids, condition_dicts)])
+        self.upsert_maps(mcs.MatchMap, zip(match_ids, remote_ids))
 
     def match_lineups(self, data_frame):
-        lineup_records = []
         fields = ['match_id', 'player_id', 'team_id', 'position_id', 'is_starting', 'is_captain', 'number']
-        for idx, row in data_frame.iterrows():
-            if not row['player_id']:
-                continue
-            lineup_dict = {field: row[field] for field in fields if row[field] is not None}
-            if not self.record_exists(mc.ClubMatchLineups, **lineup_dict):
-                lineup_records.append(mc.ClubMatchLineups(**lineup_dict))
-        self.session.add_all(lineup_records)
-        self.session.commit()
+        lineup_dicts = [{field: row[field] for field in fields if field in row and row[field] is not None}
+                        for idx, row in data_frame.iterrows() if row['player_id']]
+        self.save_records(mc.ClubMatchLineups, self.new_records(mc.ClubMatchLineups, lineup_dicts))
+        self.session.flush()
 
     def goals(self, data_frame):
-        goal_records = []
         fields = ['lineup_id', 'team_id', 'event', 'bodypart', 'time', 'stoppage']
-        for idx, row in data_frame.iterrows():
-            goal_dict = {field: row[field] for field in fields if row[field] is not None}
-            if not self.record_exists(mc.ClubGoals, **goal_dict):
-                goal_records.append(mc.ClubGoals(**goal_dict))
-        self.session.add_all(goal_records)
-        self.session.commit()
+        goal_dicts = [{field: row[field] for field in fields if row[field] is not None}
+                     for idx, row in data_frame.iterrows()]
+        self.save_records(mc.ClubGoals, self.new_records(mc.ClubGoals, goal_dicts))
+        self.session.flush()
 
     def penalties(self, data_frame):
-        penalty_records = []
         fields = ['lineup_id', 'foul', 'outcome', 'time', 'stoppage']
-        for idx, row in data_frame.iterrows():
-            penalty_dict = {field: row[field] for field in fields if row[field] is not None}
-            if not self.record_exists(mce.Penalties, **penalty_dict):
-                penalty_records.append(mce.Penalties(**penalty_dict))
-        self.session.add_all(penalty_records)
-        self.session.commit()
+        penalty_dicts = [{field: row[field] for field in fields if row[field] is not None}
+                        for idx, row in data_frame.iterrows()]
+        self.save_records(mce.Penalties, self.new_records(mce.Penalties, penalty_dicts))
+        self.session.flush()
 
     def bookables(self, data_frame):
-        discipline_records = []
         fields = ['lineup_id', 'foul', 'card', 'time', 'stoppage']
-        for idx, row in data_frame.iterrows():
-            discipline_dict = {field: row[field] for field in fields if row[field] is not None}
-            if not self.record_exists(mce.Bookables, **discipline_dict):
-                discipline_records.append(mce.Bookables(**discipline_dict))
-        self.session.add_all(discipline_records)
-        self.session.commit()
+        discipline_dicts = [{field: row[field] for field in fields if row[field] is not None}
+                           for idx, row in data_frame.iterrows()]
+        self.save_records(mce.Bookables, self.new_records(mce.Bookables, discipline_dicts))
+        self.session.flush()
 
     def substitutions(self, data_frame):
-        sub_records = []
         fields = ['lineup_in_id', 'lineup_out_id', 'time', 'stoppage']
-        for idx, row in data_frame.iterrows():
-            sub_dict = {field: row[field] for field in fields if row[field] is not None}
-            if not self.record_exists(mce.Substitutions, **sub_dict):
-                sub_records.append(mce.Substitutions(**sub_dict))
-        self.session.add_all(sub_records)
-        self.session.commit()
+        sub_dicts = [{field: row[field] for field in fields if row[field] is not None}
+                    for idx, row in data_frame.iterrows()]
+        self.save_records(mce.Substitutions, self.new_records(mce.Substitutions, sub_dicts))
+        self.session.flush()
 
     def penalty_shootouts(self, data_frame):
-        shootout_records = []
         fields = ['lineup_id', 'round', 'num', 'outcome']
-        for idx, row in data_frame.iterrows():
-            shootout_dict = {field: row[field] for field in fields if row[field] is not None}
-            if not self.record_exists(mce.PenaltyShootouts, **shootout_dict):
-                shootout_records.append(mce.PenaltyShootouts(**shootout_dict))
-        self.session.add_all(shootout_records)
-        self.session.commit()
+        shootout_dicts = [{field: row[field] for field in fields if row[field] is not None}
+                         for idx, row in data_frame.iterrows()]
+        self.save_records(mce.PenaltyShootouts, self.new_records(mce.PenaltyShootouts, shootout_dicts))
+        self.session.flush()
 
 
 class MarcottiStatLoad(MarcottiLoad):
+    """
+    Load transformed match statistics into database.
+
+    Every statistics category in :attr:`stat_models` has a loader method of the same name, which writes the
+    listed fields of the category into its data model.
+    """
+
+    bulk_insert = True
+    chunk_size = 5000
+
+    stat_models = OrderedDict([
+        ('assists', (stats.Assists, ['corners', 'freekicks', 'throwins', 'goalkicks', 'setpieces', 'total'])),
+        ('clearances', (stats.Clearances, ['headed', 'goalline', 'other', 'total'])),
+        ('corners', (stats.Corners, ['penbox_success', 'penbox_failure', 'left_success', 'left_failure',
+                                     'right_success', 'right_failure', 'short', 'total'])),
+        ('corner_crosses', (stats.CornerCrosses, ['total_success', 'total_failure', 'air_success', 'air_failure',
+                                                  'left_success', 'left_failure', 'right_success', 'right_failure'])),
+        ('crosses', (stats.Crosses, ['air_success', 'air_failure', 'openplay_success', 'openplay_failure',
+                                     'left_success', 'left_failure', 'right_success', 'right_failure'])),
+        ('defensives', (stats.Defensives, ['blocks', 'interceptions', 'recoveries', 'corners_conceded',
+                                           'fouls_conceded', 'challenges_lost', 'handballs_conceded',
+                                           'penalties_conceded', 'error_goals', 'error_shots'])),
+        ('discipline', (stats.Discipline, ['yellows', 'reds'])),
+        ('duels', (stats.Duels, ['total_won', 'total_lost', 'aerial_won', 'aerial_lost', 'ground_won', 'ground_lost'])),
+        ('foul_wins', (stats.FoulWins, ['total', 'total_danger', 'total_penalty', 'total_nodanger'])),
+        ('freekicks', (stats.Freekicks, ['ontarget', 'offtarget'])),
+        ('gk_actions', (stats.GoalkeeperActions, ['catches', 'punches', 'drops', 'crosses_unclaimed',
+                                                  'distribution_success', 'distribution_failure'])),
+        ('gk_allowed_goals', (stats.GoalkeeperAllowedGoals, ['insidebox', 'outsidebox', 'is_cleansheet'])),
+        ('gk_allowed_shots', (stats.GoalkeeperAllowedShots, ['insidebox', 'outsidebox', 'dangerous'])),
+        ('gk_saves', (stats.GoalkeeperSaves, ['insidebox', 'outsidebox', 'penalty'])),
+        ('goal_bodyparts', (stats.GoalBodyparts, ['headed', 'leftfoot', 'rightfoot'])),
+        ('goal_locations', (stats.GoalLocations, ['insidebox', 'outsidebox'])),
+        ('goal_totals', (stats.GoalTotals, ['is_firstgoal', 'is_winner', 'freekick', 'openplay', 'corners', 'throwins',
+                                            'penalties', 'substitute', 'other'])),
+        ('goalline_clearances', (stats.GoalLineClearances, ['insidebox', 'outsidebox', 'totalshots'])),
+        ('important_plays', (stats.ImportantPlays, ['corners', 'freekicks', 'throwins', 'goalkicks'])),
+        ('pass_directions', (stats.PassDirections, ['forward', 'backward', 'left_side', 'right_side'])),
+        ('pass_lengths', (stats.PassLengths, ['short_success', 'short_failure', 'long_success', 'long_failure',
+                                              'flickon_success', 'flickon_failure'])),
+        ('pass_locations', (stats.PassLocations, ['ownhalf_success', 'ownhalf_failure', 'opphalf_success',
+                                                  'opphalf_failure', 'defthird_success', 'defthird_failure',
+                                                  'midthird_success', 'midthird_failure', 'finthird_success',
+                                                  'finthird_failure'])),
+        ('pass_totals', (stats.Passes, ['total_success', 'total_failure', 'total_no_cc_success', 'total_no_cc_failure',
+                                        'longball_success', 'longball_failure', 'layoffs_success', 'layoffs_failure',
+                                        'throughballs', 'important_passes'])),
+        ('penalty_actions', (stats.PenaltyActions, ['ontarget', 'offtarget', 'taken', 'saved'])),
+        ('shot_blocks', (stats.ShotBlocks, ['insidebox', 'outsidebox', 'freekick', 'headed', 'leftfoot', 'rightfoot',
+                                            'other', 'total'])),
+        ('shot_bodyparts', (stats.ShotBodyparts, ['head_ontarget', 'head_offtarget', 'left_ontarget', 'left_offtarget',
+                                                  'right_ontarget', 'right_offtarget'])),
+        ('shot_locations', (stats.ShotLocations, ['insidebox_ontarget', 'insidebox_offtarget', 'outsidebox_ontarget',
+                                                  'outsidebox_offtarget'])),
+        ('shot_plays', (stats.ShotPlays, ['openplay_ontarget', 'openplay_offtarget', 'setplay_ontarget',
+                                          'setplay_offtarget', 'freekick_ontarget', 'freekick_offtarget',
+                                          'corners_ontarget', 'corners_offtarget', 'throwins_ontarget',
+                                          'throwins_offtarget', 'other_ontarget', 'other_offtarget'])),
+        ('shot_totals', (stats.ShotTotals, ['ontarget', 'offtarget', 'dangerous'])),
+        ('tackles', (stats.Tackles, ['won', 'lost', 'lastman'])),
+        ('throwins', (stats.Throwins, ['to_teamplayer', 'to_oppplayer'])),
+        ('touch_locations', (stats.TouchLocations, ['oppbox', 'oppsix', 'final_third'])),
+        ('touches', (stats.Touches, ['dribble_overruns', 'dribble_success', 'dribble_failure', 'balltouch_success',
+                                     'balltouch_failure', 'possession_loss', 'total']))
+    ])
 
     @staticmethod
     def is_empty_record(*args):
@@ -408,200 +772,106 @@ class MarcottiStatLoad(MarcottiLoad):
         """
         return not any([arg for arg in args])
 
-    def load_stat_record(self, model, df, field_list):
+    @staticmethod
+    def nonempty_records(df, field_list):
         """
-        Bulk load non-zero records of match statistics data models.
-        
-        :param model: Data model object
+        Flag statistical records with at least one nonzero quantity.
+
+        Vectorized counterpart of :meth:`is_empty_record` over the rows of a DataFrame.  Missing quantities count
+        as zero.
+
         :param df: Pandas dataframe containing match data
         :param field_list: List of fields in data model
+        :return: Boolean Series, True for non-empty records.
         """
-        stat_records = []
-        for idx, row in df.iterrows():
-            if not self.is_empty_record(*tuple([row[field] for field in field_list])):
-                field_list.append('lineup_id')
-                stat_dict = {field: row[field] for field in field_list if row[field]}
-                stat_records.append(model(**stat_dict))
-        self.session.bulk_save_objects(stat_records)
-        print("{} {} records from {} lineup records".format(len(stat_records), model.__name__, len(df)))
-        self.session.commit()
-
-    def assists(self, data_frame):
-        model = stats.Assists
-        fields = ['corners', 'freekicks', 'throwins', 'goalkicks', 'setpieces', 'total']
-        self.load_stat_record(model, data_frame, fields)
-
-    def clearances(self, data_frame):
-        model = stats.Clearances
-        fields = ['headed', 'goalline', 'other', 'total']
-        self.load_stat_record(model, data_frame, fields)
-
-    def corners(self, data_frame):
-        model = stats.Corners
-        fields = ['penbox_success', 'penbox_failure', 'left_success', 'left_failure',
-                  'right_success', 'right_failure', 'short', 'total']
-        self.load_stat_record(model, data_frame, fields)
-
-    def corner_crosses(self, data_frame):
-        model = stats.CornerCrosses
-        fields = ['total_success', 'total_failure', 'air_success', 'air_failure',
-                  'left_success', 'left_failure', 'right_success', 'right_failure']
-        self.load_stat_record(model, data_frame, fields)
-
-    def crosses(self, data_frame):
-        model = stats.Crosses
-        fields = ['air_success', 'air_failure', 'openplay_success', 'openplay_failure',
-                  'left_success', 'left_failure', 'right_success', 'right_failure']
-        self.load_stat_record(model, data_frame, fields)
+        return df[field_list].fillna(0).astype(bool).any(axis=1)
 
-    def defensives(self, data_frame):
-        model = stats.Defensives
-        fields = ['blocks', 'interceptions', 'recoveries', 'corners_conceded', 'fouls_conceded',
-                  'challenges_lost', 'handballs_conceded', 'penalties_conceded', 'error_goals', 'error_shots']
-        self.load_stat_record(model, data_frame, fields)
-
-    def discipline(self, data_frame):
-        model = stats.Discipline
-        fields = ['yellows', 'reds']
-        self.load_stat_record(model, data_frame, fields)
-
-    def duels(self, data_frame):
-        model = stats.Duels
-        fields = ['total_won', 'total_lost', 'aerial_won', 'aerial_lost', 'ground_won', 'ground_lost']
-        self.load_stat_record(model, data_frame, fields)
-
-    def foul_wins(self, data_frame):
-        model = stats.FoulWins
-        fields = ['total', 'total_danger', 'total_penalty', 'total_nodanger']
-        self.load_stat_record(model, data_frame, fields)
-
-    def freekicks(self, data_frame):
-        model = stats.Freekicks
-        fields = ['ontarget', 'offtarget']
-        self.load_stat_record(model, data_frame, fields)
-
-    def gk_actions(self, data_frame):
-        model = stats.GoalkeeperActions
-        fields = ['catches', 'punches', 'drops', 'crosses_unclaimed',
-                  'distribution_success', 'distribution_failure']
-        self.load_stat_record(model, data_frame, fields)
-
-    def gk_allowed_goals(self, data_frame):
-        model = stats.GoalkeeperAllowedGoals
-        fields = ['insidebox', 'outsidebox', 'is_cleansheet']
-        self.load_stat_record(model, data_frame, fields)
-
-    def gk_allowed_shots(self, data_frame):
-        model = stats.GoalkeeperAllowedShots
-        fields = ['insidebox', 'outsidebox', 'dangerous']
-        self.load_stat_record(model, data_frame, fields)
-
-    def gk_saves(self, data_frame):
-        model = stats.GoalkeeperSaves
-        fields = ['insidebox', 'outsidebox', 'penalty']
-        self.load_stat_record(model, data_frame, fields)
-
-    def goal_bodyparts(self, data_frame):
-        model = stats.GoalBodyparts
-        fields = ['headed', 'leftfoot', 'rightfoot']
-        self.load_stat_record(model, data_frame, fields)
-
-    def goal_locations(self, data_frame):
-        model = stats.GoalLocations
-        fields = ['insidebox', 'outsidebox']
-        self.load_stat_record(model, data_frame, fields)
-
-    def goal_totals(self, data_frame):
-        model = stats.GoalTotals
-        fields = ['is_firstgoal', 'is_winner', 'freekick', 'openplay', 'corners',
-                  'throwins', 'penalties', 'substitute', 'other']
-        self.load_stat_record(model, data_frame, fields)
-
-    def goalline_clearances(self, data_frame):
-        model = stats.GoalLineClearances
-        fields = ['insidebox', 'outsidebox', 'totalshots']
-        self.load_stat_record(model, data_frame, fields)
-
-    def important_plays(self, data_frame):
-        model = stats.ImportantPlays
-        fields = ['corners', 'freekicks', 'throwins', 'goalkicks']
-        self.load_stat_record(model, data_frame, fields)
-
-    def pass_directions(self, data_frame):
-        model = stats.PassDirections
-        fields = ['forward', 'backward', 'left_side', 'right_side']
-        self.load_stat_record(model, data_frame, fields)
+    @staticmethod
+    def stat_parameters(model, df, field_list):
+        """
+        Convert statistical records into insert parameters with native Python values.
 
-    def pass_lengths(self, data_frame):
-        model = stats.PassLengths
-        fields = ['short_success', 'short_failure', 'long_success',
-                  'long_failure', 'flickon_success', 'flickon_failure']
-        self.load_stat_record(model, data_frame, fields)
+        Missing quantities are replaced by the defaults of the data model columns so that every parameter set
+        has the same keys.
 
-    def pass_locations(self, data_frame):
-        model = stats.PassLocations
-        fields = ['ownhalf_success', 'ownhalf_failure', 'opphalf_success', 'opphalf_failure',
-                  'defthird_success', 'defthird_failure', 'midthird_success', 'midthird_failure',
-                  'finthird_success', 'finthird_failure']
-        self.load_stat_record(model, data_frame, fields)
+        :param model: Data model object
+        :param df: Pandas dataframe containing non-empty match data
+        :param field_list: List of fields in data model
+        :return: List of dictionaries of insert parameters.
+        """
+        table = model.__table__
+        frame = df[field_list].copy()
+        for field in field_list:
+            column = table.c[field]
+            if column.default is not None and column.default.is_scalar:
+                frame[field] = frame[field].fillna(column.default.arg).astype(column.type.python_type)
+        lineups = [None if pd.isnull(value) else int(value) for value in df['lineup_id']]
+        frame['lineup_id'] = pd.Series(lineups, index=df.index, dtype=object)
+        return frame.astype(object).where(frame.notnull(), None).to_dict('records')
 
-    def pass_totals(self, data_frame):
-        model = stats.Passes
-        fields = ['total_success', 'total_failure', 'total_no_cc_success', 'total_no_cc_failure',
-                  'longball_success', 'longball_failure', 'layoffs_success', 'layoffs_failure',
-                  'throughballs', 'important_passes']
-        self.load_stat_record(model, data_frame, fields)
+    def load_stat_record(self, model, df, field_list):
+        """
+        Bulk load non-zero records of match statistics data models.
+        
+        :param model: Data model object
+        :param df: Pandas dataframe containing match data
+        :param field_list: List of fields in data model
+        """
+        stat_frame = df[self.nonempty_records(df, field_list)]
+        if self.bulk_insert:
+            stat_records = self.stat_parameters(model, stat_frame, field_list)
+        else:
+            fields = field_list + ['lineup_id']
+            stat_records = [{field: row[field] for field in fields if row[field]} for idx, row in stat_frame.iterrows()]
+        self.save_records(model, stat_records)
+        logger.info("{} {} records from {} lineup records".format(len(stat_records), model.__name__, len(df)))
+
+    def save_records(self, model, records):
+        """
+        Write new records of a statistics data model.
 
-    def penalty_actions(self, data_frame):
-        model = stats.PenaltyActions
-        fields = ['ontarget', 'offtarget', 'taken', 'saved']
-        self.load_stat_record(model, data_frame, fields)
+        If :attr:`bulk_insert` is set, records are written with executemany INSERT statements on the model's
+        table in chunks of :attr:`chunk_size` records.  Otherwise ORM objects are bulk-saved.
 
-    def shot_blocks(self, data_frame):
-        model = stats.ShotBlocks
-        fields = ['insidebox', 'outsidebox', 'freekick', 'headed', 'leftfoot', 'rightfoot', 'other', 'total']
-        self.load_stat_record(model, data_frame, fields)
+        :param model: Data model class.
+        :param records: List of dictionaries of record fields.
+        """
+        if self.bulk_insert:
+            statement = model.__table__.insert()
+            for start in range(0, len(records), self.chunk_size):
+                self.session.execute(statement, records[start:start + self.chunk_size])
+        else:
+            self.session.bulk_save_objects([model(**record) for record in records])
+
+    def player_stats(self, data_frame):
+        """
+        Load records of all statistics categories in one batch.
 
-    def shot_bodyparts(self, data_frame):
-        model = stats.ShotBodyparts
-        fields = ['head_ontarget', 'head_offtarget', 'left_ontarget',
-                  'left_offtarget', 'right_ontarget', 'right_offtarget']
-        self.load_stat_record(model, data_frame, fields)
+        Category fields are keyed as ``<category>.<field>`` in the DataFrame, and each category is loaded by
+        its own loader method.
 
-    def shot_locations(self, data_frame):
-        model = stats.ShotLocations
-        fields = ['insidebox_ontarget', 'insidebox_offtarget', 'outsidebox_ontarget', 'outsidebox_offtarget']
-        self.load_stat_record(model, data_frame, fields)
+        :param data_frame: DataFrame of statistics records with lineup IDs.
+        """
+        categories = defaultdict(list)
+        for column in data_frame.columns:
+            if '.' in column:
+                categories[column.split('.', 1)[0]].append(column)
+        for category, columns in sorted(categories.items()):
+            category_frame = data_frame[['lineup_id'] + columns]
+            category_frame.columns = ['lineup_id'] + [column.split('.', 1)[1] for column in columns]
+            getattr(self, category)(category_frame)
 
-    def shot_plays(self, data_frame):
-        model = stats.ShotPlays
-        fields = ['openplay_ontarget', 'openplay_offtarget', 'setplay_ontarget', 'setplay_offtarget',
-                  'freekick_ontarget', 'freekick_offtarget', 'corners_ontarget', 'corners_offtarget',
-                  'throwins_ontarget', 'throwins_offtarget', 'other_ontarget', 'other_offtarget']
-        self.load_stat_record(model, data_frame, fields)
 
-    def shot_totals(self, data_frame):
-        model = stats.ShotTotals
-        fields = ['ontarget', 'offtarget', 'dangerous']
+def add_stat_load_fn(category):
+    def fn(self, data_frame):
+        model, fields = self.stat_models[category]
         self.load_stat_record(model, data_frame, fields)
 
-    def tackles(self, data_frame):
-        model = stats.Tackles
-        fields = ['won', 'lost', 'lastman']
-        self.load_stat_record(model, data_frame, fields)
+    setattr(MarcottiStatLoad, category, fn)
 
-    def throwins(self, data_frame):
-        model = stats.Throwins
-        fields = ['to_teamplayer', 'top_oppplayer']
-        self.load_stat_record(model, data_frame, fields)
+    fn.__name__ = category
+    fn.__doc__ = "Load {} statistics records".format(category)
 
-    def touch_locations(self, data_frame):
-        model = stats.TouchLocations
-        fields = ['oppbox', 'oppsix', 'final_third']
-        self.load_stat_record(model, data_frame, fields)
 
-    def touches(self, data_frame):
-        model = stats.Touches
-        fields = ['dribble_overruns', 'dribble_success', 'dribble_failure',
-                  'balltouch_success', 'balltouch_failure', 'possession_loss', 'total']
-        self.load_stat_record(model, data_frame, fields)
+for stat_category in MarcottiStatLoad.stat_models:
+    add_stat_load_fn(stat_category)
@@ -0,0 +1,309 @@
+import logging
+import itertools
+from datetime import date
+from decimal import Decimal
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import event
+
+import marcotti.models.club as mc
+import marcotti.models.common.overview as mco
+import marcotti.models.common.suppliers as mcs
+from .metrics import UnresolvedKeys
+
+
+logger = logging.getLogger(__name__)
+
+
+NOT_FOUND = object()
+MULTIPLE_FOUND = object()
+
+
+class LookupCache(object):
+    """
+    In-memory resolver cache for ID lookups made during an ETL workflow.
+
+    Reference tables registered for preloading are read in a single query into dictionaries keyed by the
+    lookup columns.  All other lookups are memoized as they are made.  Cached entries for a model are
+    invalidated whenever new, modified, or deleted records of that model are flushed to the database, until the
+    cache is closed.  Lookup keys that the workflows sharing the cache do not resolve to one record are counted
+    in :attr:`unresolved`.
+    """
+
+    PRELOAD = {
+        mco.Countries: [('name',)],
+        mco.Timezones: [('name',)],
+        mco.Surfaces: [('description',)],
+        mc.Clubs: [('name',)],
+        mcs.PlayerMap: [('remote_id', 'supplier_id')],
+    }
+
+    IN_CHUNK = 500
+
+    def __init__(self, session, preload=None):
+        self.session = session
+        self.specs = defaultdict(set)
+        for model, key_sets in (self.PRELOAD if preload is None else preload).items():
+            for keys in key_sets:
+                self.specs[model].add(tuple(sorted(keys)))
+        self.tables = {}
+        self.memo = {}
+        self.hits = 0
+        self.misses = 0
+        self.unresolved = UnresolvedKeys()
+        event.listen(session, 'after_flush', self._after_flush)
+
+    @staticmethod
+    def normalize(value):
+        """
+        Normalize lookup value so that database values and extracted values compare equal.
+
+        :param value: Lookup value.
+        :return: Hashable normalized value.
+        """
+        if isinstance(value, bool) or value is None:
+            return value
+        if isinstance(value, (int, long, np.integer)):
+            return unicode(value)
+        if isinstance(value, Decimal):
+            value = float(value)
+        if isinstance(value, (float, np.floating)) and float(value).is_integer():
+            return unicode(int(value))
+        if isinstance(value, str):
+            return value.decode('utf-8')
+        if isinstance(value, date):
+            return unicode(value.isoformat())
+        return value
+
+    def _memo_key(self, model, conditions):
+        keys = tuple(sorted(conditions))
+        return model, keys, tuple(self.normalize(conditions[key]) for key in keys)
+
+    def preload(self, model, *keys):
+        """
+        Load lookup column(s) and IDs of all records of a data model into memory.
+
+        :param model: Data model class.
+        :param keys: Names of lookup columns.
+        :return: Dictionary of ID values keyed by tuples of lookup values.
+        """
+        keys = tuple(sorted(keys))
+        table = {}
+        columns = [getattr(model, key) for key in keys]
+        for row in self.session.query(model.id, *columns).select_from(model):
+            index = tuple(self.normalize(value) for value in row[1:])
+            table[index] = MULTIPLE_FOUND if index in table else row[0]
+        self.specs[model].add(keys)
+        self.tables[(model, keys)] = table
+        self.misses += 1
+        logger.info("Preloaded {} {} records keyed by {}".format(len(table), model.__name__, keys))
+        return table
+
+    def get(self, model, **conditions):
+        """
+        Retrieve ID of record that satisfies the conditions from memory, querying the database if necessary.
+
+        :param model: Data model class.
+        :param conditions: Lookup conditions as keyword arguments.
+        :return: ID of record, or NOT_FOUND or MULTIPLE_FOUND sentinels.
+        """
+        memo_key = model, keys, index = self._memo_key(model, conditions)
+        if keys in self.specs.get(model, ()):
+            return self._table(model, keys).get(index, NOT_FOUND)
+        try:
+            result = self.memo[memo_key]
+        except KeyError:
+            self.misses += 1
+            result = self.memo[memo_key] = self._query(model, **conditions)
+        else:
+            self.hits += 1
+        return result
+
+    def get_many(self, model, fields, values, **conditions):
+        """
+        Retrieve IDs of records for a collection of lookup values, with one query per chunk of uncached values.
+
+        Records are fetched with an IN clause on every lookup field and matched to the lookup values in memory.
+
+        :param model: Data model class.
+        :param fields: Tuple of lookup field names.
+        :param values: Iterable of tuples of lookup values, in the order of the lookup fields.
+        :param conditions: Lookup conditions shared by all values.
+        :return: Dictionary of ID of record, or NOT_FOUND or MULTIPLE_FOUND sentinels, keyed by lookup values.
+        """
+        results = {}
+        pending = {}
+        for value in set(values):
+            key_conditions = dict(zip(fields, value), **conditions)
+            if None in value:
+                results[value] = self.get(model, **key_conditions)
+                continue
+            memo_key = model, keys, index = self._memo_key(model, key_conditions)
+            if keys in self.specs.get(model, ()):
+                results[value] = self._table(model, keys).get(index, NOT_FOUND)
+            elif memo_key in self.memo:
+                self.hits += 1
+                results[value] = self.memo[memo_key]
+            else:
+                pending[value] = memo_key
+        pending_values = list(pending)
+        columns = [getattr(model, field) for field in fields]
+        for start in range(0, len(pending_values), self.IN_CHUNK):
+            chunk = pending_values[start:start + self.IN_CHUNK]
+            query = self.session.query(model.id, *columns).select_from(model).filter_by(**conditions).filter(
+                *[column.in_(set(value[n] for value in chunk)) for n, column in enumerate(columns)])
+            found = {}
+            for row in query:
+                index = tuple(self.normalize(item) for item in row[1:])
+                found[index] = MULTIPLE_FOUND if index in found else row[0]
+            self.misses += 1
+            for value in chunk:
+                memo_key = pending[value]
+                field_index = tuple(self.normalize(item) for item in value)
+                results[value] = self.memo[memo_key] = found.get(field_index, NOT_FOUND)
+        return results
+
+    def _table(self, model, keys):
+        table = self.tables.get((model, keys))
+        if table is None:
+            return self.preload(model, *keys)
+        self.hits += 1
+        return table
+
+    def _query(self, model, **conditions):
+        ids = [rec.id for rec in self.session.query(model.id).select_from(model).filter_by(**conditions).limit(2)]
+        return ids[0] if len(ids) == 1 else (NOT_FOUND if not ids else MULTIPLE_FOUND)
+
+    def invalidate(self, *models):
+        """
+        Discard cached lookups of data models, or of all data models if none are given.
+
+        Subclasses of the data models are invalidated along with them.
+
+        :param models: Data model classes.
+        """
+        def stale(cached):
+            return not models or any(issubclass(cached, model) or issubclass(model, cached) for model in models)
+
+        for key in [key for key in self.tables if stale(key[0])]:
+            del self.tables[key]
+        for key in [key for key in self.memo if stale(key[0])]:
+            del self.memo[key]
+
+    def stats(self):
+        """
+        Report cache usage statistics.
+
+        :return: Dictionary of hits, misses, and number of cached keys.
+        """
+        return dict(hits=self.hits, misses=self.misses,
+                    keys=sum(len(table) for table in self.tables.values()) + len(self.memo))
+
+    def close(self):
+        """
+        Stop invalidating cached lookups on flushes of the session.
+        """
+        if event.contains(self.session, 'after_flush', self._after_flush):
+            event.remove(self.session, 'after_flush', self._after_flush)
+
+    def _after_flush(self, session, flush_context):
+        models = set(type(obj) for obj in itertools.chain(session.new, session.dirty, session.deleted))
+        if models:
+            self.invalidate(*models)
+
+
+class MatchIndex(object):
+    """
+    In-memory index of match and lineup IDs for the dates covered by statistics records.
+
+    Matches are keyed by home team ID, away team ID, and match date, and lineups by match ID and player ID.
+    The index covers a date range that is extended as records with new dates arrive, and each update also
+    adds matches and lineups that have been loaded since the previous update.
+    """
+
+    def __init__(self, session, match_model=mc.ClubLeagueMatches, lineup_model=mc.ClubMatchLineups):
+        self.session = session
+        self.match_model = match_model
+        self.lineup_model = lineup_model
+        self.matches = {}
+        self.lineups = {}
+        self.start = None
+        self.end = None
+        self.last_match_id = 0
+        self.last_lineup_id = 0
+
+    def update(self, start, end):
+        """
+        Extend index to a date range, and add matches and lineups loaded since the last update.
+
+        :param start: First match date.
+        :param end: Last match date.
+        """
+        if self.start is None:
+            self.load(start, end)
+        else:
+            self.load(self.start, self.end, newer=True)
+            if start < self.start:
+                self.load(start, self.start, before=True)
+            if end > self.end:
+                self.load(self.end, end, after=True)
+        self.start = start if self.start is None else min(start, self.start)
+        self.end = end if self.end is None else max(end, self.end)
+
+    def load(self, start, end, newer=False, before=False, after=False):
+        """
+        Add matches and lineups within a date range to index.
+
+        :param start: First match date.
+        :param end: Last match date.
+        :param newer: Only add records with IDs greater than those already indexed.
+        :param before: Exclude the last match date.
+        :param after: Exclude the first match date.
+        """
+        match = self.match_model
+        lineup = self.lineup_model
+        dates = [match.date < end if before else match.date <= end,
+                 match.date > start if after else match.date >= start]
+        match_query = self.session.query(match.id, match.home_team_id, match.away_team_id, match.date).filter(*dates)
+        lineup_query = self.session.query(lineup.id, lineup.match_id, lineup.player_id).join(
+            match, lineup.match_id == match.id).filter(*dates)
+        if newer:
+            match_query = match_query.filter(match.id > self.last_match_id)
+            lineup_query = lineup_query.filter(lineup.id > self.last_lineup_id)
+        for row in match_query:
+            self.add(self.matches, row)
+            self.last_match_id = max(self.last_match_id, row[0])
+        for row in lineup_query:
+            self.add(self.lineups, row)
+            self.last_lineup_id = max(self.last_lineup_id, row[0])
+        logger.info("Indexed {} matches and {} lineups from {} to {}".format(
+            len(self.matches), len(self.lineups), start, end))
+
+    @staticmethod
+    def add(index, row):
+        key = tuple(LookupCache.normalize(value) for value in row[1:])
+        index[key] = MULTIPLE_FOUND if index.get(key, row[0]) != row[0] else row[0]
+
+    @staticmethod
+    def get(index, values):
+        return {value: index.get(tuple(LookupCache.normalize(item) for item in value), NOT_FOUND)
+                for value in set(values)}
+
+    def match_ids(self, values):
+        """
+        Retrieve match IDs for (home team ID, away team ID, match date) values.
+
+        :param values: Iterable of tuples of lookup values.
+        :return: Dictionary of match ID, or NOT_FOUND or MULTIPLE_FOUND sentinels, keyed by lookup values.
+        """
+        return self.get(self.matches, values)
+
+    def lineup_ids(self, values):
+        """
+        Retrieve lineup IDs for (match ID, player ID) values.
+
+        :param values: Iterable of tuples of lookup values.
+        :return: Dictionary of lineup ID, or NOT_FOUND or MULTIPLE_FOUND sentinels, keyed by lookup values.
+        """
+        return self.get(self.lineups, values)
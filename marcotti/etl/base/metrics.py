@@ -0,0 +1,227 @@
+import os
+import csv
+import time
+import logging
+import weakref
+import threading
+from collections import OrderedDict, Counter, defaultdict
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatementCounter(object):
+    """
+    Count SQL statements executed on a database engine, separately for each thread.
+
+    Every cursor execution is one round trip to the database; an executemany round trip carries one
+    statement per parameter set.  Rows written by INSERT statements are counted as well.
+
+    Counters are kept for as long as their engines are in use.
+    """
+
+    counters = weakref.WeakKeyDictionary()
+    lock = threading.Lock()
+
+    def __init__(self, engine):
+        self.local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self.count)
+
+    @classmethod
+    def attach(cls, engine):
+        """
+        Retrieve statement counter of a database engine, creating it on first use.
+
+        :param engine: Engine or Connection object.
+        :return: :class:`StatementCounter` object.
+        """
+        engine = getattr(engine, 'engine', engine)
+        with cls.lock:
+            if engine not in cls.counters:
+                cls.counters[engine] = cls(engine)
+            return cls.counters[engine]
+
+    def count(self, conn, cursor, statement, parameters, context, executemany):
+        statements = len(parameters) if executemany else 1
+        round_trips, total, inserted = self.snapshot()
+        is_insert = statement.lstrip()[:6].upper() == 'INSERT'
+        self.local.counts = (round_trips + 1, total + statements, inserted + (statements if is_insert else 0))
+
+    def snapshot(self):
+        """
+        Report counts of the current thread.
+
+        :return: Tuple of round trips, statements, and inserted rows.
+        """
+        return getattr(self.local, 'counts', (0, 0, 0))
+
+
+class StageMetrics(object):
+    """
+    Measurements of one stage of the ETL workflow of a data entity, summed over its runs.
+    """
+
+    fields = ['entity', 'stage', 'runs', 'wall_time', 'cpu_time', 'rows_in', 'rows_out', 'statements',
+              'round_trips']
+
+    def __init__(self, entity, stage):
+        self.entity = entity
+        self.stage = stage
+        self.runs = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.statements = 0
+        self.round_trips = 0
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.fields}
+
+    def __str__(self):
+        return ("{0.entity}.{0.stage}: {0.wall_time:.3f}s wall, {0.cpu_time:.3f}s CPU, "
+                "{0.rows_in} -> {0.rows_out} rows, {0.statements} statements in {0.round_trips} round trips"
+                ).format(self)
+
+
+class ETLReport(object):
+    """
+    Instrumentation of ETL workflows: wall time, CPU time, row counts, and SQL statement counts of each
+    stage of each data entity.
+
+    CPU time is measured for the whole process.
+    """
+
+    def __init__(self, engine=None):
+        self.counter = StatementCounter.attach(engine) if engine is not None else None
+        self.stages = OrderedDict()
+
+    @contextmanager
+    def stage(self, entity, stage, rows_in):
+        """
+        Measure a stage of an ETL workflow.
+
+        The stage sets the number of output rows on the yielded metrics object.  Load stages that do not set
+        it report the number of rows inserted.
+
+        :param entity: Data entity name.
+        :param stage: Stage name.
+        :param rows_in: Number of input rows.
+        :return: :class:`StageMetrics` object of the stage.
+        """
+        metrics = self.stages.setdefault((entity, stage), StageMetrics(entity, stage))
+        counts = self.counter.snapshot() if self.counter else (0, 0, 0)
+        wall, cpu = time.time(), sum(os.times()[:2])
+        rows_out = metrics.rows_out
+        metrics.rows_out = None
+        try:
+            yield metrics
+        finally:
+            round_trips, statements, inserted = [
+                end - start for start, end in zip(counts, self.counter.snapshot() if self.counter else (0, 0, 0))]
+            metrics.runs += 1
+            metrics.wall_time += time.time() - wall
+            metrics.cpu_time += sum(os.times()[:2]) - cpu
+            metrics.rows_in += rows_in
+            metrics.rows_out = rows_out + (inserted if metrics.rows_out is None else metrics.rows_out)
+            metrics.statements += statements
+            metrics.round_trips += round_trips
+
+    def entity(self, entity):
+        """
+        Retrieve metrics of the stages of a data entity.
+
+        :param entity: Data entity name.
+        :return: List of :class:`StageMetrics` objects.
+        """
+        return [metrics for (name, stage), metrics in self.stages.items() if name == entity]
+
+    def as_dicts(self):
+        return [metrics.as_dict() for metrics in self.stages.values()]
+
+    def log(self, entity=None, level=logging.INFO):
+        """
+        Write metrics of the stages of one or all data entities to the log.
+
+        :param entity: Data entity name, or None for all entities.
+        :param level: Logging level.
+        """
+        for metrics in (self.stages.values() if entity is None else self.entity(entity)):
+            logger.log(level, str(metrics))
+
+    def __str__(self):
+        return "\n".join(str(metrics) for metrics in self.stages.values())
+
+
+class UnresolvedKeys(object):
+    """
+    Lookup keys of ETL workflows that were not resolved to one record, counted per data model, lookup fields,
+    and reason.
+
+    Misses are counted as they occur and reported once per workflow, in the log and optionally in a report
+    file with one line per unresolved key.
+    """
+
+    NOT_FOUND = 'no'
+    MULTIPLE_FOUND = 'multiple'
+
+    samples = 3
+    report_fields = ['entity', 'model', 'reason', 'key', 'lookups']
+
+    def __init__(self):
+        self.counts = defaultdict(Counter)
+
+    def add(self, model, reason, fields, values, count=1):
+        """
+        Count lookups of a key that was not resolved.
+
+        :param model: Data model class.
+        :param reason: NOT_FOUND or MULTIPLE_FOUND.
+        :param fields: Tuple of lookup field names.
+        :param values: Tuple of lookup values, in the order of the fields.
+        :param count: Number of lookups.
+        """
+        self.counts[(model.__name__, reason, fields)][values] += count
+
+    def __len__(self):
+        return len(self.counts)
+
+    def log(self, entity, level=logging.WARNING):
+        """
+        Write one summary of unresolved keys per data model, lookup fields, and reason to the log.
+
+        :param entity: Data entity name.
+        :param level: Logging level.
+        """
+        for (model, reason, fields), keys in sorted(self.counts.items()):
+            logger.log(level, u"{}: {} has {} records in Marcotti database for {} keys of ({}) in {} lookups, "
+                              u"e.g. {}".format(entity, model, reason, len(keys), ", ".join(fields),
+                                               sum(keys.values()),
+                                               "; ".join(self.key(fields, values)
+                                                         for values, _ in keys.most_common(self.samples))))
+
+    def write(self, path, entity):
+        """
+        Append unresolved keys to a CSV report file, writing the header if the file is new.
+
+        :param path: Path of report file.
+        :param entity: Data entity name.
+        """
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'ab') as f:
+            writer = csv.writer(f)
+            if new:
+                writer.writerow(self.report_fields)
+            for (model, reason, fields), keys in sorted(self.counts.items()):
+                for values, count in keys.most_common():
+                    writer.writerow([entity, model, reason, self.key(fields, values).encode('utf-8'), count])
+
+    @staticmethod
+    def key(fields, values):
+        return u";".join(u"{}={}".format(field, value) for field, value in zip(fields, values))
+
+    def clear(self):
+        self.counts.clear()
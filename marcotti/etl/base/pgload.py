@@ -0,0 +1,120 @@
+import logging
+from cStringIO import StringIO
+
+from .load import MarcottiLoad, MarcottiStatLoad
+
+
+logger = logging.getLogger(__name__)
+
+
+class CopyLoadMixin(object):
+    """
+    Write new records with PostgreSQL COPY ... FROM STDIN statements in CSV format.
+
+    On database backends that do not support COPY, records are written by the loader's regular path.
+    """
+
+    copy_dialects = ('postgresql',)
+    copy_chunk_size = 50000
+
+    @property
+    def dialect(self):
+        return self.session.get_bind().dialect
+
+    @property
+    def can_copy(self):
+        return self.dialect.name in self.copy_dialects
+
+    @staticmethod
+    def copy_value(value):
+        """
+        Format a column value as a field of a COPY statement in CSV format.
+
+        NULL values are written as unquoted empty fields, and strings are always quoted so that empty strings are
+        not read as NULL.
+
+        :param value: Column value after bind processing.
+        :return: CSV field string.
+        """
+        if value is None:
+            return ''
+        if isinstance(value, unicode):
+            value = value.encode('utf-8')
+        if isinstance(value, str):
+            return '"{}"'.format(value.replace('"', '""'))
+        if isinstance(value, float):
+            return repr(value)
+        return str(value)
+
+    def copy_buffer(self, table, columns, rows):
+        """
+        Write rows of a table into a buffer of CSV lines for a COPY statement.
+
+        Values are converted with the bind processors of the table columns.
+
+        :param table: Table object.
+        :param columns: List of column names.
+        :param rows: List of tuples of column values.
+        :return: Buffer positioned at its start.
+        """
+        processors = [table.c[column].type.bind_processor(self.dialect) for column in columns]
+        buf = StringIO()
+        for row in rows:
+            buf.write(','.join(self.copy_value(processor(value) if processor else value)
+                               for processor, value in zip(processors, row)))
+            buf.write('\n')
+        buf.seek(0)
+        return buf
+
+    def copy_rows(self, table, columns, rows):
+        """
+        Stream rows into a table with a COPY statement.
+
+        :param table: Table object.
+        :param columns: List of column names.
+        :param rows: List of tuples of column values.
+        """
+        preparer = self.dialect.identifier_preparer
+        statement = "COPY {} ({}) FROM STDIN WITH CSV".format(
+            preparer.format_table(table), ', '.join(preparer.quote(column) for column in columns))
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(statement, self.copy_buffer(table, columns, rows))
+        finally:
+            cursor.close()
+
+    def copy_records(self, model, records):
+        """
+        Write records of a data model with COPY statements, one per mapped table of the model.
+
+        ID values are allocated in blocks from the sequences of the model's tables.  Missing fields are set to
+        the column defaults, and the polymorphic discriminator of the model is set where one is defined.
+
+        :param model: Data model class.
+        :param records: List of dictionaries of record fields.
+        """
+        for start in range(0, len(records), self.copy_chunk_size):
+            chunk = records[start:start + self.copy_chunk_size]
+            for table, columns, rows in self.table_rows(model, chunk, self.model_ids(model, len(chunk))):
+                self.copy_rows(table, columns, rows)
+        logger.info("Copied {} {} records".format(len(records), model.__name__))
+
+    def save_records(self, model, records):
+        if not self.can_copy or not records:
+            return super(CopyLoadMixin, self).save_records(model, records)
+        self.copy_records(model, records)
+        self.cache.invalidate(model)
+
+
+class MarcottiCopyLoad(CopyLoadMixin, MarcottiLoad):
+    """
+    Load transformed data into database, writing match lineups and events with COPY statements on PostgreSQL.
+    """
+    pass
+
+
+class MarcottiCopyStatLoad(CopyLoadMixin, MarcottiStatLoad):
+    """
+    Load transformed match statistics into database with COPY statements on PostgreSQL.
+    """
+    pass
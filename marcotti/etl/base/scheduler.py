@@ -0,0 +1,256 @@
+import time
+import logging
+import threading
+from Queue import Queue
+from functools import partial
+
+from .workflows import ETL
+from .transform import MarcottiTransform, MarcottiStatsTransform
+from .load import MarcottiLoad, MarcottiStatLoad
+
+
+logger = logging.getLogger(__name__)
+
+
+STAT_DEPENDENCIES = {category: ('match_lineups',) for category in MarcottiStatsTransform.categories + ['player_stats']}
+
+
+class ETLTask(object):
+    """
+    ETL workflow of a data entity, run by the scheduler.
+    """
+
+    def __init__(self, name, entity, payloads, transform, load, supplier, after, commit='entity'):
+        self.name = name
+        self.entity = entity
+        self.payloads = payloads
+        self.transform = transform
+        self.load = load
+        self.supplier = supplier
+        self.after = set(after)
+        self.commit = commit
+        self.start = None
+        self.finish = None
+        self.metrics = None
+
+    @property
+    def elapsed(self):
+        return self.finish - self.start
+
+    def run(self, session):
+        """
+        Extract payloads of the task and run the ETL workflow in a session, keeping the workflow metrics.
+
+        :param session: Transaction session object.
+        """
+        data = [payload() if callable(payload) else payload for payload in self.payloads]
+        etl = ETL(transform=self.transform, load=self.load, session=session, supplier=self.supplier,
+                  commit=self.commit)
+        self.metrics = etl.report
+        try:
+            etl.workflow(self.entity, *data)
+        finally:
+            etl.close()
+
+
+class ScheduleReport(object):
+    """
+    Timings of scheduled ETL tasks and the critical path through them.
+    """
+
+    def __init__(self, tasks, wall_time):
+        self.timings = {name: task.elapsed for name, task in tasks.items() if task.finish is not None}
+        self.wall_time = wall_time
+        self.total_time = sum(self.timings.values())
+        self.critical_path, self.critical_time = self.longest_chain(tasks)
+
+    def longest_chain(self, tasks):
+        """
+        Find the chain of dependent tasks with the longest total running time.
+
+        :param tasks: Dictionary of completed tasks keyed by name.
+        :return: Tuple of list of task names on the chain and its total running time.
+        """
+        chains = {}
+
+        def chain(name):
+            if name not in chains:
+                before = [chain(dep) for dep in tasks[name].after if dep in self.timings]
+                path, elapsed = max(before, key=lambda item: item[1]) if before else ([], 0.0)
+                chains[name] = (path + [name], elapsed + self.timings[name])
+            return chains[name]
+
+        return max([chain(name) for name in self.timings] or [([], 0.0)], key=lambda item: item[1])
+
+    def __str__(self):
+        return "Wall time {:.2f}s, task time {:.2f}s, critical path {:.2f}s: {}".format(
+            self.wall_time, self.total_time, self.critical_time, " -> ".join(self.critical_path))
+
+
+class ETLScheduler(object):
+    """
+    Run ETL workflows of data entities concurrently, in the order of the dependencies between them.
+
+    Each workflow runs in a worker thread with its own session, and starts once all of the workflows of
+    the entities that it depends on have finished.  Dependencies on entities that are not scheduled are
+    assumed to be loaded already.
+    """
+
+    DEPENDENCIES = dict({
+        'suppliers': (),
+        'years': (),
+        'seasons': ('years',),
+        'countries': (),
+        'timezones': (),
+        'surfaces': (),
+        'positions': (),
+        'competitions': ('countries',),
+        'clubs': ('countries',),
+        'venues': ('countries', 'timezones', 'surfaces'),
+        'players': ('countries', 'positions'),
+        'managers': ('countries',),
+        'referees': ('countries',),
+        'league_matches': ('competitions', 'seasons', 'venues', 'clubs', 'managers', 'referees'),
+        'group_matches': ('competitions', 'seasons', 'venues', 'clubs', 'managers', 'referees'),
+        'knockout_matches': ('competitions', 'seasons', 'venues', 'clubs', 'managers', 'referees'),
+        'match_lineups': ('league_matches', 'group_matches', 'knockout_matches', 'players'),
+        'goals': ('match_lineups',),
+        'penalties': ('match_lineups',),
+        'bookables': ('match_lineups',),
+        'substitutions': ('match_lineups',),
+        'penalty_shootouts': ('match_lineups',),
+    }, **STAT_DEPENDENCIES)
+
+    def __init__(self, marcotti, workers=4, supplier=None, transform=MarcottiTransform, load=MarcottiLoad,
+                 stat_transform=MarcottiStatsTransform, stat_load=MarcottiStatLoad, commit='entity'):
+        self.marcotti = marcotti
+        self.workers = workers
+        self.supplier = supplier
+        self.transform = transform
+        self.load = load
+        self.stat_transform = stat_transform
+        self.stat_load = stat_load
+        self.commit = commit
+        self.tasks = {}
+        self.order = []
+
+    def add(self, entity, *payloads, **kwargs):
+        """
+        Schedule ETL workflow of a data entity.
+
+        Payloads are lists of dictionaries or callables that extract them, which are called by the worker.
+        Statistics categories use the statistics transform and load classes of the scheduler by default.
+
+        :param entity: Data model name.
+        :param payloads: Data payloads or extraction callables.
+        :param kwargs: Optional task name, transform and load classes, supplier name, commit policy, and names
+                       of additional tasks to run before this one.
+        :return: Name of task.
+        """
+        name = kwargs.get('name', entity)
+        if name in self.tasks:
+            raise ValueError("Task {} is already scheduled".format(name))
+        supplier = kwargs.get('supplier', self.supplier if entity != 'suppliers' else None)
+        is_stat = entity in STAT_DEPENDENCIES
+        transform = kwargs.get('transform', self.stat_transform if is_stat else self.transform)
+        load = kwargs.get('load', self.stat_load if is_stat else self.load)
+        self.tasks[name] = ETLTask(name, entity, payloads, transform, load, supplier, kwargs.get('after', ()),
+                                   kwargs.get('commit', self.commit))
+        self.order.append(name)
+        return name
+
+    def add_stats(self, extractor, prefix, categories=None):
+        """
+        Schedule ETL workflows of match statistics categories, one task per category.
+
+        Each category is extracted by its worker, so that the categories are extracted, transformed,
+        and loaded concurrently.
+
+        :param extractor: Statistics extractor object.
+        :param prefix: File name prefix of the statistics data files.
+        :param categories: Names of statistics categories, or all categories if None.
+        :return: List of task names.
+        """
+        return [self.add(category, partial(getattr(extractor, category), prefix))
+                for category in (categories or MarcottiStatsTransform.categories)]
+
+    def resolve(self):
+        """
+        Determine the tasks that each task waits for, and check that the dependencies are acyclic.
+        """
+        by_entity = {}
+        for name in self.order:
+            by_entity.setdefault(self.tasks[name].entity, []).append(name)
+        for name in self.order:
+            task = self.tasks[name]
+            for entity in self.DEPENDENCIES.get(task.entity, ()):
+                task.after.update(by_entity.get(entity, []))
+            if task.supplier and task.entity != 'suppliers':
+                task.after.update(by_entity.get('suppliers', []))
+            unknown = task.after - set(self.tasks)
+            if unknown:
+                raise ValueError("Task {} waits for unscheduled tasks: {}".format(name, sorted(unknown)))
+        visited = {}
+
+        def visit(name):
+            if visited.get(name) is False:
+                raise ValueError("Dependency cycle through task {}".format(name))
+            if name not in visited:
+                visited[name] = False
+                for dep in self.tasks[name].after:
+                    visit(dep)
+                visited[name] = True
+
+        for name in self.order:
+            visit(name)
+
+    def worker(self, task, results):
+        try:
+            with self.marcotti.create_session() as session:
+                task.run(session)
+        except Exception as ex:
+            results.put((task.name, ex))
+        else:
+            results.put((task.name, None))
+
+    def run(self):
+        """
+        Run scheduled ETL workflows, with at most as many concurrent workflows as workers.
+
+        If a workflow fails, no further workflows are started and the error is raised once the running
+        workflows have finished.
+
+        :return: :class:`ScheduleReport` object.
+        """
+        self.resolve()
+        results = Queue()
+        pending = list(self.order)
+        running = set()
+        done = set()
+        error = None
+        start = time.time()
+        while pending or running:
+            ready = [name for name in pending if self.tasks[name].after <= done] if error is None else []
+            for name in ready[:max(self.workers - len(running), 0)]:
+                task = self.tasks[name]
+                pending.remove(name)
+                running.add(name)
+                task.start = time.time() - start
+                logger.info("Starting {} workflow".format(name))
+                threading.Thread(target=self.worker, args=(task, results), name=name).start()
+            if not running:
+                break
+            name, ex = results.get()
+            self.tasks[name].finish = time.time() - start
+            running.remove(name)
+            if ex is None:
+                done.add(name)
+                logger.info("Finished {} workflow in {:.2f}s".format(name, self.tasks[name].elapsed))
+            else:
+                logger.error("{} workflow failed: {}".format(name, ex))
+                error = error or ex
+        if error is not None:
+            raise error
+        report = ScheduleReport({name: self.tasks[name] for name in done}, time.time() - start)
+        logger.info(str(report))
+        return report
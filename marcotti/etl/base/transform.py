@@ -6,6 +6,7 @@ import marcotti.models.common.overview as mco
 import marcotti.models.common.personnel as mcp
 import marcotti.models.common.suppliers as mcs
 from .workflows import WorkflowBase
+from .lookup import LookupCache, MatchIndex, NOT_FOUND, MULTIPLE_FOUND
 
 
 class MarcottiTransform(WorkflowBase):
@@ -13,6 +14,9 @@ class MarcottiTransform(WorkflowBase):
     Transform and validate extracted data.
     """
 
+    lineup_fields = {'starter': 'is_starting', 'captain': 'is_captain'}
+    event_time_fields = {'match_time': 'time', 'stoppage_time': 'stoppage'}
+
     @staticmethod
     def suppliers(data_frame):
         return data_frame
@@ -25,265 +29,334 @@ class MarcottiTransform(WorkflowBase):
     def seasons(data_frame):
         return data_frame
 
+    @staticmethod
+    def convert(func, values):
+        """
+        Apply conversion function to every row of a column, calling it once per distinct value.
+
+        :param func: Conversion function of one argument.
+        :param values: Pandas Series of values to be converted.
+        :return: Series of converted values.
+        """
+        converted = {value: func(value) for value in values.astype(object).where(values.notnull(), None).unique()}
+        return pd.Series([converted[value] for value in values.astype(object).where(values.notnull(), None)],
+                         index=values.index, dtype=object)
+
+    @staticmethod
+    def weather(value):
+        return enums.WeatherConditionType.from_string(value) if value else None
+
+    @staticmethod
+    def name_order(value):
+        return enums.NameOrderType.from_string(value or 'Western')
+
     def competitions(self, data_frame):
         if 'country' in data_frame.columns:
             transformed_field = 'country'
-            lambdafunc = lambda x: pd.Series(self.get_id(mco.Countries, name=x[transformed_field]))
-            id_frame = data_frame.apply(lambdafunc, axis=1)
+            id_frame = pd.concat([self.get_ids(mco.Countries, name=data_frame[transformed_field])], axis=1)
             id_frame.columns = ['country_id']
         elif 'confed' in data_frame.columns:
             transformed_field = 'confed'
-            lambdafunc = lambda x: pd.Series(enums.ConfederationType.from_string(x[transformed_field]))
-            id_frame = data_frame.apply(lambdafunc, axis=1)
+            id_frame = pd.concat([self.convert(enums.ConfederationType.from_string, data_frame[transformed_field])],
+                                 axis=1)
             id_frame.columns = ['confederation']
         else:
             raise KeyError("Cannot insert Competition record: No Country or Confederation data present")
         return data_frame.join(id_frame).drop(transformed_field, axis=1)
 
     def countries(self, data_frame):
-        lambdafunc = lambda x: pd.Series(enums.ConfederationType.from_string(x['confed']))
-        id_frame = data_frame.apply(lambdafunc, axis=1)
+        id_frame = pd.concat([self.convert(enums.ConfederationType.from_string, data_frame['confed'])], axis=1)
         id_frame.columns = ['confederation']
         joined_frame = data_frame.join(id_frame).drop('confed', axis=1)
         return joined_frame
 
     def clubs(self, data_frame):
         if 'country' in data_frame.columns:
-            lambdafunc = lambda x: pd.Series(self.get_id(mco.Countries, name=x['country']))
-            id_frame = data_frame.apply(lambdafunc, axis=1)
+            id_frame = pd.concat([self.get_ids(mco.Countries, name=data_frame['country'])], axis=1)
             id_frame.columns = ['country_id']
         else:
             raise KeyError("Cannot insert Club record: No Country data present")
         return data_frame.join(id_frame)
 
     def venues(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mco.Countries, name=x['country']),
-            self.get_id(mco.Timezones, name=x['timezone']),
-            self.get_id(mco.Surfaces, description=x['surface']),
-            self.make_date_object(x['config_date'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
-        ids_frame.columns = ['country_id', 'timezone_id', 'surface_id', 'eff_date']
+        ids_frame = pd.concat([
+            self.get_ids(mco.Countries, name=data_frame['country']),
+            self.get_ids(mco.Timezones, name=data_frame['timezone']),
+            self.get_ids(mco.Surfaces, description=data_frame['surface']),
+            self.convert(self.make_date_object, data_frame['config_date'])
+        ], axis=1)
+        ids_frame.columns = ['country_id', 'timezone_id', 'surface_id', 'date']
         joined_frame = data_frame.join(ids_frame).drop(['country', 'timezone', 'surface', 'config_date'], axis=1)
         new_frame = joined_frame.where((pd.notnull(joined_frame)), None)
         return new_frame
 
     def timezones(self, data_frame):
-        lambdafunc = lambda x: pd.Series(enums.ConfederationType.from_string(x['confed']))
-        id_frame = data_frame.apply(lambdafunc, axis=1)
+        id_frame = pd.concat([self.convert(enums.ConfederationType.from_string, data_frame['confed'])], axis=1)
         id_frame.columns = ['confederation']
         joined_frame = data_frame.join(id_frame).drop('confed', axis=1)
         return joined_frame
 
     def positions(self, data_frame):
-        lambdafunc = lambda x: pd.Series(enums.PositionType.from_string(x['position_type']))
-        id_frame = data_frame.apply(lambdafunc, axis=1)
+        id_frame = pd.concat([self.convert(enums.PositionType.from_string, data_frame['position_type'])], axis=1)
         id_frame.columns = ['type']
         joined_frame = data_frame.join(id_frame).drop('position_type', axis=1)
         return joined_frame
 
     def surfaces(self, data_frame):
-        lambdafunc = lambda x: pd.Series(enums.SurfaceType.from_string(x['surface_type']))
-        id_frame = data_frame.apply(lambdafunc, axis=1)
+        id_frame = pd.concat([self.convert(enums.SurfaceType.from_string, data_frame['surface_type'])], axis=1)
         id_frame.columns = ['type']
         joined_frame = data_frame.join(id_frame).drop('surface_type', axis=1)
         return joined_frame
 
     def players(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.make_date_object(x['dob']),
-            enums.NameOrderType.from_string(x['name_order'] or 'Western'),
-            self.get_id(mco.Countries, name=x['country']),
-            self.get_id(mcs.PositionMap, remote_id=x['remote_position_id'], supplier_id=self.supplier_id)
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        if 'remote_position_id' in data_frame.columns:
+            position_field = 'remote_position_id'
+            position_ids = self.get_ids(mcs.PositionMap, remote_id=data_frame[position_field],
+                                        supplier_id=self.supplier_id)
+        else:
+            position_field = 'position_name'
+            position_ids = self.get_ids(mcp.Positions, name=data_frame[position_field])
+        ids_frame = pd.concat([
+            self.convert(self.make_date_object, data_frame['dob']),
+            self.convert(self.name_order, data_frame['name_order']),
+            self.get_ids(mco.Countries, name=data_frame['country']),
+            position_ids
+        ], axis=1)
         ids_frame.columns = ['birth_date', 'order', 'country_id', 'position_id']
         joined_frame = data_frame.join(ids_frame).drop(
-            ['dob', 'name_order', 'country', 'remote_position_id'], axis=1)
+            ['dob', 'name_order', 'country', position_field], axis=1)
         return joined_frame
 
     def managers(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.make_date_object(x['dob']),
-            enums.NameOrderType.from_string(x['name_order'] or 'Western'),
-            self.get_id(mco.Countries, name=x['country'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat([
+            self.convert(self.make_date_object, data_frame['dob']),
+            self.convert(self.name_order, data_frame['name_order']),
+            self.get_ids(mco.Countries, name=data_frame['country'])
+        ], axis=1)
         ids_frame.columns = ['birth_date', 'order', 'country_id']
         joined_frame = data_frame.join(ids_frame).drop(['dob', 'name_order', 'country'], axis=1)
         return joined_frame
 
     def referees(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.make_date_object(x['dob']),
-            enums.NameOrderType.from_string(x['name_order'] or 'Western'),
-            self.get_id(mco.Countries, name=x['country'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat([
+            self.convert(self.make_date_object, data_frame['dob']),
+            self.convert(self.name_order, data_frame['name_order']),
+            self.get_ids(mco.Countries, name=data_frame['country'])
+        ], axis=1)
         ids_frame.columns = ['birth_date', 'order', 'country_id']
         joined_frame = data_frame.join(ids_frame).drop(['dob', 'name_order', 'country'], axis=1)
         return joined_frame
 
+    def match_ids(self, data_frame):
+        """
+        Resolve IDs of competition, season, venue, teams, managers and referee, and convert date and weather
+        fields of match records.
+
+        :param data_frame: DataFrame of extracted match records.
+        :return: List of Series in order of competition, season, venue, home/away team, home/away manager,
+                 referee, date, and kickoff/halftime/fulltime weather.
+        """
+        return [
+            self.get_ids(mco.Competitions, name=data_frame['competition']),
+            self.get_ids(mco.Seasons, name=data_frame['season']),
+            self.get_ids(mco.Venues, name=data_frame['venue']),
+            self.get_ids(mc.Clubs, name=data_frame['home_team']),
+            self.get_ids(mc.Clubs, name=data_frame['away_team']),
+            self.get_ids(mcp.Managers, full_name=data_frame['home_manager']),
+            self.get_ids(mcp.Managers, full_name=data_frame['away_manager']),
+            self.get_ids(mcp.Referees, full_name=data_frame['referee']),
+            self.convert(self.make_date_object, data_frame['date']),
+            self.convert(self.weather, data_frame['kickoff_wx']),
+            self.convert(self.weather, data_frame['halftime_wx']),
+            self.convert(self.weather, data_frame['fulltime_wx'])
+        ]
+
     def league_matches(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mco.Competitions, name=x['competition']),
-            self.get_id(mco.Seasons, name=x['season']),
-            self.get_id(mco.Venues, name=x['venue']),
-            self.get_id(mc.Clubs, name=x['home_team']),
-            self.get_id(mc.Clubs, name=x['away_team']),
-            self.get_id(mcp.Managers, full_name=x['home_manager']),
-            self.get_id(mcp.Managers, full_name=x['away_manager']),
-            self.get_id(mcp.Referees, full_name=x['referee']),
-            self.make_date_object(x['date']),
-            enums.WeatherConditionType.from_string(x['kickoff_wx']) if x['kickoff_wx'] else None,
-            enums.WeatherConditionType.from_string(x['halftime_wx']) if x['halftime_wx'] else None,
-            enums.WeatherConditionType.from_string(x['fulltime_wx']) if x['fulltime_wx'] else None
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat(self.match_ids(data_frame), axis=1)
         ids_frame.columns = ['competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
-                             'home_manager_id', 'away_manager_id', 'referee_id', 'match_date',
+                             'home_manager_id', 'away_manager_id', 'referee_id', 'date',
                              'kickoff_weather', 'halftime_weather', 'fulltime_weather']
         columns_to_drop = ['competition', 'season', 'venue', 'home_team', 'away_team', 'home_manager',
                            'away_manager', 'referee', 'date', 'kickoff_wx', 'halftime_wx', 'fulltime_wx']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        return data_frame.drop(columns_to_drop, axis=1).join(ids_frame)
 
     def knockout_matches(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mco.Competitions, name=x['competition']),
-            self.get_id(mco.Seasons, name=x['season']),
-            self.get_id(mco.Venues, name=x['venue']),
-            self.get_id(mc.Clubs, name=x['home_team']),
-            self.get_id(mc.Clubs, name=x['away_team']),
-            self.get_id(mcp.Managers, full_name=x['home_manager']),
-            self.get_id(mcp.Managers, full_name=x['away_manager']),
-            self.get_id(mcp.Referees, full_name=x['referee']),
-            enums.KnockoutRoundType.from_string(x['round']),
-            self.make_date_object(x['date']),
-            enums.WeatherConditionType.from_string(x['kickoff_wx']) if x['kickoff_wx'] else None,
-            enums.WeatherConditionType.from_string(x['halftime_wx']) if x['halftime_wx'] else None,
-            enums.WeatherConditionType.from_string(x['fulltime_wx']) if x['fulltime_wx'] else None
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        match_ids = self.match_ids(data_frame)
+        ids_frame = pd.concat(match_ids[:8] + [self.convert(enums.KnockoutRoundType.from_string,
+                                                            data_frame['round'])] + match_ids[8:], axis=1)
         ids_frame.columns = ['competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
-                             'home_manager_id', 'away_manager_id', 'referee_id', 'ko_round', 'match_date',
+                             'home_manager_id', 'away_manager_id', 'referee_id', 'ko_round', 'date',
                              'kickoff_weather', 'halftime_weather', 'fulltime_weather']
         columns_to_drop = ['competition', 'season', 'venue', 'home_team', 'away_team', 'home_manager',
                            'away_manager', 'referee', 'date', 'round', 'kickoff_wx', 'halftime_wx', 'fulltime_wx']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        return data_frame.drop(columns_to_drop, axis=1).join(ids_frame)
 
     def group_matches(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mco.Competitions, name=x['competition']),
-            self.get_id(mco.Seasons, name=x['season']),
-            self.get_id(mco.Venues, name=x['venue']),
-            self.get_id(mc.Clubs, name=x['home_team']),
-            self.get_id(mc.Clubs, name=x['away_team']),
-            self.get_id(mcp.Managers, full_name=x['home_manager']),
-            self.get_id(mcp.Managers, full_name=x['away_manager']),
-            self.get_id(mcp.Referees, full_name=x['referee']),
-            enums.GroupRoundType.from_string(x['round']),
-            self.make_date_object(x['date']),
-            enums.WeatherConditionType.from_string(x['kickoff_wx']) if x['kickoff_wx'] else None,
-            enums.WeatherConditionType.from_string(x['halftime_wx']) if x['halftime_wx'] else None,
-            enums.WeatherConditionType.from_string(x['fulltime_wx']) if x['fulltime_wx'] else None
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        match_ids = self.match_ids(data_frame)
+        ids_frame = pd.concat(match_ids[:8] + [self.convert(enums.GroupRoundType.from_string,
+                                                            data_frame['round'])] + match_ids[8:], axis=1)
         ids_frame.columns = ['competition_id', 'season_id', 'venue_id', 'home_team_id', 'away_team_id',
-                             'home_manager_id', 'away_manager_id', 'referee_id', 'group_round', 'match_date',
+                             'home_manager_id', 'away_manager_id', 'referee_id', 'group_round', 'date',
                              'kickoff_weather', 'halftime_weather', 'fulltime_weather']
         columns_to_drop = ['competition', 'season', 'venue', 'home_team', 'away_team', 'home_manager',
                            'away_manager', 'referee', 'date', 'round', 'kickoff_wx', 'halftime_wx', 'fulltime_wx']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        return data_frame.drop(columns_to_drop, axis=1).join(ids_frame)
+
+    def lineup_match_ids(self, data_frame):
+        """
+        Resolve IDs of league matches of match lineup records, once per distinct match.
+
+        Records with supplier match IDs are resolved through the match map, otherwise through the competition,
+        season, matchday and teams of the match.
+
+        :param data_frame: DataFrame of extracted match lineup records.
+        :return: Series of match IDs.
+        """
+        if 'remote_match_id' in data_frame.columns:
+            return self.event_match_ids(data_frame)
+        match_fields = ['competition', 'season', 'matchday', 'home_team', 'away_team']
+        codes, keys = pd.factorize(pd.Series(self.lookup_values(*[data_frame[field] for field in match_fields])))
+        matches = pd.DataFrame(list(keys), columns=match_fields)
+        match_ids = self.get_ids(mc.ClubLeagueMatches,
+                                 competition_id=self.get_ids(mco.Competitions, name=matches['competition']),
+                                 season_id=self.get_ids(mco.Seasons, name=matches['season']),
+                                 matchday=matches['matchday'],
+                                 home_team_id=self.get_ids(mc.Clubs, name=matches['home_team']),
+                                 away_team_id=self.get_ids(mc.Clubs, name=matches['away_team']))
+        return pd.Series(match_ids.values.take(codes), index=data_frame.index, dtype=object)
 
     def match_lineups(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mc.ClubLeagueMatches,
-                        competition_id=self.get_id(mco.Competitions, name=x['competition']),
-                        season_id=self.get_id(mco.Seasons, name=x['season']),
-                        matchday=x['matchday'],
-                        home_team_id=self.get_id(mc.Clubs, name=x['home_team']),
-                        away_team_id=self.get_id(mc.Clubs, name=x['away_team'])),
-            self.get_id(mc.Clubs, name=x['player_team']),
-            self.get_id(mcp.Players, full_name=x['player_name'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat([
+            self.lineup_match_ids(data_frame),
+            self.get_ids(mc.Clubs, name=data_frame['player_team']),
+            self.get_ids(mcp.Players, full_name=data_frame['player_name'])
+        ], axis=1)
         ids_frame.columns = ['match_id', 'team_id', 'player_id']
-        columns_to_drop = ['competition', 'season', 'matchday', 'home_team', 'away_team']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        columns_to_drop = [field for field in ['remote_match_id', 'competition', 'season', 'matchday', 'home_team',
+                                               'away_team', 'player_team', 'player_name']
+                           if field in data_frame.columns]
+        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1).rename(columns=self.lineup_fields)
+
+    def event_match_ids(self, data_frame):
+        """
+        Resolve IDs of matches from supplier match IDs of match event records.
+
+        :param data_frame: DataFrame of extracted match event records.
+        :return: Series of match IDs.
+        """
+        return self.get_ids(mcs.MatchMap, remote_id=data_frame['remote_match_id'], supplier_id=self.supplier_id)
+
+    def lineup_ids(self, data_frame, player_field, match_ids=None):
+        """
+        Resolve IDs of match lineup records from supplier match IDs and player names.
+
+        :param data_frame: DataFrame of extracted match event records.
+        :param player_field: Name of column that contains player names.
+        :param match_ids: Series of match IDs of the records, if already resolved.
+        :return: Series of lineup IDs.
+        """
+        return self.get_ids(mc.ClubMatchLineups,
+                            match_id=self.event_match_ids(data_frame) if match_ids is None else match_ids,
+                            player_id=self.get_ids(mcp.Players, full_name=data_frame[player_field]))
 
     def goals(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mc.ClubMatchLineups,
-                        match_id=self.get_id(mcs.MatchMap, remote_id=x['remote_match_id'],
-                                             supplier_id=self.supplier_id),
-                        player_id=self.get_id(mcp.Players, full_name=x['scorer'])),
-            self.get_id(mc.Clubs, name=x['scoring_team']),
-            enums.ShotEventType.from_string(x['scoring_event']),
-            enums.BodypartType.from_string(x['bodypart_desc'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat([
+            self.lineup_ids(data_frame, 'scorer'),
+            self.get_ids(mc.Clubs, name=data_frame['scoring_team']),
+            self.convert(enums.ShotEventType.from_string, data_frame['scoring_event']),
+            self.convert(enums.BodypartType.from_string, data_frame['bodypart_desc'])
+        ], axis=1)
         ids_frame.columns = ['lineup_id', 'team_id', 'event', 'bodypart']
         columns_to_drop = ['remote_match_id', 'scorer', 'scoring_team', 'scoring_event', 'bodypart_desc']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1).rename(columns=self.event_time_fields)
 
     def penalties(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mc.ClubMatchLineups,
-                        match_id=self.get_id(mcs.MatchMap, remote_id=x['remote_match_id'],
-                                             supplier_id=self.supplier_id),
-                        player_id=self.get_id(mcp.Players, full_name=x['penalty_taker'])),
-            enums.FoulEventType.from_string(x['penalty_foul']),
-            enums.ShotOutcomeType.from_string(x['penalty_outcome'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat([
+            self.lineup_ids(data_frame, 'penalty_taker'),
+            self.convert(enums.FoulEventType.from_string, data_frame['penalty_foul']),
+            self.convert(enums.ShotOutcomeType.from_string, data_frame['penalty_outcome'])
+        ], axis=1)
         ids_frame.columns = ['lineup_id', 'foul', 'outcome']
         columns_to_drop = ['remote_match_id', 'penalty_taker', 'penalty_foul', 'penalty_outcome']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1).rename(columns=self.event_time_fields)
 
     def bookables(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mc.ClubMatchLineups,
-                        match_id=self.get_id(mcs.MatchMap, remote_id=x['remote_match_id'],
-                                             supplier_id=self.supplier_id),
-                        player_id=self.get_id(mcp.Players, full_name=x['player'])),
-            enums.FoulEventType.from_string(x['foul_desc']),
-            enums.CardType.from_string(x['card_type'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat([
+            self.lineup_ids(data_frame, 'player'),
+            self.convert(enums.FoulEventType.from_string, data_frame['foul_desc']),
+            self.convert(enums.CardType.from_string, data_frame['card_type'])
+        ], axis=1)
         ids_frame.columns = ['lineup_id', 'foul', 'card']
         columns_to_drop = ['remote_match_id', 'player', 'foul_desc', 'card_type']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1).rename(columns=self.event_time_fields)
 
     def substitutions(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mc.ClubMatchLineups,
-                        match_id=self.get_id(mcs.MatchMap, remote_id=x['remote_match_id'],
-                                             supplier_id=self.supplier_id),
-                        player_id=self.get_id(mcp.Players, full_name=x['in_player_name'])),
-            self.get_id(mc.ClubMatchLineups,
-                        match_id=self.get_id(mcs.MatchMap, remote_id=x['remote_match_id'],
-                                             supplier_id=self.supplier_id),
-                        player_id=self.get_id(mcp.Players, full_name=x['out_player_name']))
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        match_ids = self.event_match_ids(data_frame)
+        ids_frame = pd.concat([
+            self.lineup_ids(data_frame, 'in_player_name', match_ids),
+            self.lineup_ids(data_frame, 'out_player_name', match_ids)
+        ], axis=1)
         ids_frame.columns = ['lineup_in_id', 'lineup_out_id']
         columns_to_drop = ['remote_match_id', 'in_player_name', 'out_player_name']
-        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
+        return data_frame.join(ids_frame).drop(columns_to_drop, axis=1).rename(columns=self.event_time_fields)
 
     def penalty_shootouts(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mc.ClubMatchLineups,
-                        match_id=self.get_id(mcs.MatchMap, remote_id=x['remote_match_id'], supplier_id=self.supplier_id),
-                        player_id=self.get_id(mcp.Players, full_name=x['penalty_taker'])),
-            enums.ShotOutcomeType.from_string(x['penalty_outcome'])
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        ids_frame = pd.concat([
+            self.lineup_ids(data_frame, 'penalty_taker'),
+            self.convert(enums.ShotOutcomeType.from_string, data_frame['penalty_outcome'])
+        ], axis=1)
         ids_frame.columns = ['lineup_id', 'outcome']
         columns_to_drop = ['remote_match_id', 'penalty_taker', 'penalty_outcome']
         return data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
 
 
+class MarcottiEventTransform(MarcottiTransform):
+    """
+    Transform match event data, resolving lineup IDs from the lineup rosters of the matches of the events.
+
+    The roster of a match maps player names to lineup IDs, and is loaded once per transform object.
+    """
+
+    def __init__(self, session, supplier, cache=None):
+        super(MarcottiEventTransform, self).__init__(session, supplier, cache)
+        self.rosters = {}
+
+    def load_rosters(self, match_ids):
+        """
+        Load lineup rosters of matches that have not been loaded yet, with one query per chunk of matches.
+
+        :param match_ids: Iterable of match IDs.
+        """
+        new_ids = [match_id for match_id in set(match_ids) if match_id not in self.rosters]
+        for start in range(0, len(new_ids), LookupCache.IN_CHUNK):
+            chunk = new_ids[start:start + LookupCache.IN_CHUNK]
+            for match_id in chunk:
+                self.rosters[match_id] = {}
+            query = self.session.query(mc.ClubMatchLineups.match_id, mcp.Players.full_name, mc.ClubMatchLineups.id)\
+                .join(mcp.Players, mc.ClubMatchLineups.player_id == mcp.Players.id)\
+                .filter(mc.ClubMatchLineups.match_id.in_(chunk))
+            for match_id, name, lineup_id in query:
+                roster = self.rosters[match_id]
+                key = LookupCache.normalize(name)
+                roster[key] = MULTIPLE_FOUND if key in roster else lineup_id
+
+    def lineup_ids(self, data_frame, player_field, match_ids=None):
+        """
+        Resolve IDs of match lineup records from the rosters of the matches of match event records.
+
+        :param data_frame: DataFrame of extracted match event records.
+        :param player_field: Name of column that contains player names.
+        :param match_ids: Series of match IDs of the records, if already resolved.
+        :return: Series of lineup IDs.
+        """
+        match_ids = self.event_match_ids(data_frame) if match_ids is None else match_ids
+        self.load_rosters(match_ids.dropna().unique())
+        values = self.lookup_values(match_ids, data_frame[player_field])
+        resolved = {value: self.rosters.get(value[0], {}).get(LookupCache.normalize(value[1]), NOT_FOUND)
+                    for value in set(values)}
+        return self.id_series(mc.ClubMatchLineups, ('match_id', 'full_name'), values, resolved, data_frame.index)
+
+
 class MarcottiStatsTransform(MarcottiTransform):
 
     categories = ['assists', 'clearances', 'corner_crosses', 'corners', 'crosses', 'defensives',
@@ -294,38 +367,65 @@ class MarcottiStatsTransform(MarcottiTransform):
                   'shot_locations', 'shot_plays', 'shot_totals', 'tackles', 'throwins', 'touch_locations',
                   'touches']
 
-    def __init__(self, session, supplier):
-        super(MarcottiStatsTransform, self).__init__(session, supplier)
-        for category in MarcottiStatsTransform.categories:
-            add_stats_fn(category)
+    def __init__(self, session, supplier, cache=None):
+        super(MarcottiStatsTransform, self).__init__(session, supplier, cache)
+        self.index = MatchIndex(session)
 
+    def stat_ids(self, data_frame):
+        """
+        Replace player, team, and match date fields of statistics records with lineup IDs.
 
-def add_stats_fn(category):
-    def fn(self, data_frame):
-        lambdafunc = lambda x: pd.Series([
-            self.get_id(mcs.PlayerMap, remote_id=x['remote_player_id'], supplier_id=self.supplier_id),
-            self.get_id(mc.ClubMap, remote_id=x['remote_player_team_id'], supplier_id=self.supplier_id),
-            self.get_id(mc.ClubMap, remote_id=x['remote_opposing_team_id'], supplier_id=self.supplier_id)
-        ])
-        ids_frame = data_frame.apply(lambdafunc, axis=1)
+        Match and lineup IDs are retrieved from an index of the matches on the dates of the records.
+
+        :param data_frame: DataFrame of statistics records.
+        :return: DataFrame of statistics records with lineup IDs.
+        """
+        ids_frame = pd.concat([
+            self.get_ids(mcs.PlayerMap, remote_id=data_frame['remote_player_id'], supplier_id=self.supplier_id),
+            self.get_ids(mc.ClubMap, remote_id=data_frame['remote_player_team_id'], supplier_id=self.supplier_id),
+            self.get_ids(mc.ClubMap, remote_id=data_frame['remote_opposing_team_id'], supplier_id=self.supplier_id)
+        ], axis=1)
         ids_frame.columns = ['player_id', 'player_team_id', 'opposing_team_id']
         columns_to_drop = ['remote_player_id', 'remote_player_team_id', 'remote_opposing_team_id']
         inter_frame = data_frame.join(ids_frame).drop(columns_to_drop, axis=1)
-        outerlambdafunc = lambda x: pd.Series([
-            self.get_id(mc.ClubMatchLineups,
-                        match_id=self.get_id(
-                            mc.ClubLeagueMatches,
-                            home_team_id=x['player_team_id'] if x['locale'] == 'Home' else x['opposing_team_id'],
-                            away_team_id=x['opposing_team_id'] if x['locale'] == 'Away' else x['player_team_id'],
-                            date=x['match_date']),
-                        player_id=x['player_id'])
-        ])
-        outerids_frame = inter_frame.apply(outerlambdafunc, axis=1)
+        is_home = inter_frame['locale'] == 'Home'
+        home_ids = inter_frame['player_team_id'].where(is_home, inter_frame['opposing_team_id'])
+        away_ids = inter_frame['opposing_team_id'].where(is_home, inter_frame['player_team_id'])
+        dates = [self.make_date_object(value) for value in inter_frame['match_date'].dropna().unique()]
+        dates = [value for value in dates if value is not None]
+        if dates:
+            self.index.update(min(dates), max(dates))
+        match_fields = ('home_team_id', 'away_team_id', 'date')
+        match_values = self.lookup_values(home_ids, away_ids, inter_frame['match_date'])
+        match_ids = self.id_series(mc.ClubLeagueMatches, match_fields, match_values,
+                                   self.index.match_ids(match_values), inter_frame.index)
+        lineup_fields = ('match_id', 'player_id')
+        lineup_values = self.lookup_values(match_ids, inter_frame['player_id'])
+        outerids_frame = pd.concat([
+            self.id_series(mc.ClubMatchLineups, lineup_fields, lineup_values,
+                           self.index.lineup_ids(lineup_values), inter_frame.index)
+        ], axis=1)
         outerids_frame.columns = ['lineup_id']
         more_columns_to_drop = ['player_team_id', 'opposing_team_id', 'match_date', 'locale', 'player_id']
         return inter_frame.join(outerids_frame).drop(more_columns_to_drop, axis=1)
 
+    def player_stats(self, data_frame):
+        """
+        Data transformation for statistics records of all categories, resolving the lineup ID of each
+        record once.
+        """
+        return self.stat_ids(data_frame)
+
+
+def add_stats_fn(category):
+    def fn(self, data_frame):
+        return self.stat_ids(data_frame)
+
     setattr(MarcottiStatsTransform, category, fn)
 
     fn.__name__ = category
     fn.__doc__ = "Data transformation for {} method".format(category)
+
+
+for stat_category in MarcottiStatsTransform.categories:
+    add_stats_fn(stat_category)
@@ -1,9 +1,18 @@
+import logging
+import itertools
 from datetime import date
+from collections import Counter
+from types import GeneratorType
 
 import pandas as pd
-from sqlalchemy.orm.exc import NoResultFound, MultipleResultsFound
+from sqlalchemy import event
 
 from marcotti.models.common.suppliers import Suppliers
+from .lookup import LookupCache, NOT_FOUND, MULTIPLE_FOUND
+from .metrics import ETLReport, UnresolvedKeys
+
+
+logger = logging.getLogger(__name__)
 
 
 class ETL(object):
@@ -11,12 +20,45 @@ class ETL(object):
     Top-level ETL workflow.
 
     Receive extracted data from XML and/or CSV sources, transform/validate it, and load it to database.
+
+    Loaded data are committed according to the commit policy passed to the loader, once per data entity by
+    default.  If the workflow has a manifest of data files, the manifest is saved whenever the session commits.
+
+    Lookup keys that are not resolved to one record are reported once per data entity in the log, and appended
+    to the CSV report file passed as ``unresolved`` if there is one.
+
+    The workflow listens to events of the session until it is closed.
     """
 
     def __init__(self, **kwargs):
+        session = kwargs.get('session')
+        self.session = session
         self.supplier = kwargs.get('supplier')
-        self.transformer = kwargs.get('transform')(kwargs.get('session'), self.supplier)
-        self.loader = kwargs.get('load')(kwargs.get('session'), self.supplier)
+        self.cache = LookupCache(session)
+        self.transformer = kwargs.get('transform')(session, self.supplier, self.cache)
+        self.loader = kwargs.get('load')(session, self.supplier, self.cache, commit=kwargs.get('commit', 'entity'))
+        self.manifest = kwargs.get('manifest')
+        self.unresolved_path = kwargs.get('unresolved')
+        if self.manifest is not None:
+            event.listen(session, 'after_commit', self.save_manifest)
+        self.report = ETLReport(session.get_bind() if session is not None else None)
+
+    def close(self):
+        """
+        Stop listening to events of the session, for the lookup cache and the manifest.
+        """
+        self.cache.close()
+        if self.manifest is not None and event.contains(self.session, 'after_commit', self.save_manifest):
+            event.remove(self.session, 'after_commit', self.save_manifest)
+
+    def save_manifest(self, session):
+        """
+        Save manifest of data files after the session commits.  Releases of savepoints are ignored.
+
+        :param session: Transaction session object.
+        """
+        if not session.transaction.nested:
+            self.manifest.save()
 
     def workflow(self, entity, *data):
         """
@@ -26,10 +68,75 @@ class ETL(object):
         2. Transform and validate combined data into IDs and enums in the Marcotti database.
         3. Load transformed data into the database if it is not already there.
 
+        A single data source that is extracted in chunks is transformed and loaded one chunk at a time.
+        Chunked data from multiple sources is combined in full.
+
+        If the workflow has a manifest of data files, the files carried by the extracted batches are recorded in
+        it once the batch that holds their last records has been loaded, and saved when the load is committed.
+
+        :param entity: Data model name
+        :param data: Data payloads from XML and/or CSV sources, in lists of dictionaries or generators of lists
+        """
+        try:
+            if len(data) == 1 and isinstance(data[0], GeneratorType):
+                for chunk in data[0]:
+                    if chunk:
+                        self.process(entity, chunk)
+                    self.record_files(chunk)
+            else:
+                payloads = [list(payload) if isinstance(payload, GeneratorType) else [payload] for payload in data]
+                self.process(entity, *[list(itertools.chain.from_iterable(batches)) for batches in payloads])
+                for batch in itertools.chain.from_iterable(payloads):
+                    self.record_files(batch)
+            with self.report.stage(entity, 'commit', 0):
+                self.loader.finish()
+        except Exception:
+            if self.manifest is not None:
+                self.manifest.discard()
+            raise
+        logger.info("{0}: {hits} lookups from cache, {misses} from database, {keys} keys cached".format(
+            entity, **self.cache.stats()))
+        self.report_unresolved(entity)
+        self.report.log(entity)
+
+    def record_files(self, batch):
+        """
+        Record the data files carried by a loaded batch of extracted data in the manifest, if there is one.
+
+        :param batch: List of dictionaries, or :class:`Batch` of dictionaries.
+        """
+        if self.manifest is not None:
+            for name, fname, rows in getattr(batch, 'files', []):
+                self.manifest.record(name, fname, rows)
+
+    def report_unresolved(self, entity):
+        """
+        Report lookup keys of a data entity that were not resolved, and reset their counts.
+
+        :param entity: Data model name
+        """
+        unresolved = self.cache.unresolved
+        if unresolved:
+            unresolved.log(entity)
+            if self.unresolved_path:
+                unresolved.write(self.unresolved_path, entity)
+            unresolved.clear()
+
+    def process(self, entity, *data):
+        """
+        Combine, transform, and load one batch of data payloads, and measure each stage in the workflow report.
+
         :param entity: Data model name
         :param data: Data payloads from XML and/or CSV sources, in lists of dictionaries
         """
-        getattr(self.loader, entity)(getattr(self.transformer, entity)(self.combiner(*data)))
+        with self.report.stage(entity, 'combine', sum(len(payload) for payload in data)) as stage:
+            combined = self.combiner(*data)
+            stage.rows_out = len(combined)
+        with self.report.stage(entity, 'transform', len(combined)) as stage:
+            transformed = getattr(self.transformer, entity)(combined)
+            stage.rows_out = len(transformed)
+        with self.report.stage(entity, 'load', len(transformed)):
+            self.loader.load(entity, transformed)
 
     @staticmethod
     def combiner(*data_dicts):
@@ -50,21 +157,73 @@ class ETL(object):
 
 class WorkflowBase(object):
 
-    def __init__(self, session, supplier):
+    REASONS = {NOT_FOUND: UnresolvedKeys.NOT_FOUND, MULTIPLE_FOUND: UnresolvedKeys.MULTIPLE_FOUND}
+
+    def __init__(self, session, supplier, cache=None):
         self.session = session
+        self.cache = LookupCache(session) if cache is None else cache
         self.supplier_id = self.get_id(Suppliers, name=supplier) if supplier else None
 
     def get_id(self, model, **conditions):
-        try:
-            record_id = self.session.query(model).filter_by(**conditions).one().id
-        except NoResultFound as ex:
-            print "{} has no records in Marcotti database for: {}".format(model.__name__, conditions)
-            return None
-        except MultipleResultsFound as ex:
-            print "{} has multiple records in Marcotti database for: {}".format(model.__name__, conditions)
+        record_id = self.cache.get(model, **conditions)
+        if record_id is NOT_FOUND or record_id is MULTIPLE_FOUND:
+            fields = tuple(sorted(conditions))
+            self.cache.unresolved.add(model, self.REASONS[record_id], fields,
+                                      tuple(conditions[field] for field in fields))
             return None
         return record_id
 
+    def get_ids(self, model, **conditions):
+        """
+        Retrieve IDs of records for every row of one or more lookup columns.
+
+        Conditions given as Pandas Series are lookup columns, and all other conditions apply to every row.
+        Each distinct combination of lookup values is resolved once.
+
+        :param model: Data model class.
+        :param conditions: Lookup conditions as keyword arguments.
+        :return: Series of record IDs, with None for unresolved rows.
+        """
+        fields = tuple(field for field, value in conditions.items() if isinstance(value, pd.Series))
+        fixed = {field: value for field, value in conditions.items() if field not in fields}
+        values = self.lookup_values(*[conditions[field] for field in fields])
+        resolved = self.cache.get_many(model, fields, values, **fixed)
+        return self.id_series(model, fields, values, resolved, conditions[fields[0]].index, **fixed)
+
+    @staticmethod
+    def lookup_values(*columns):
+        """
+        Combine lookup columns into list of tuples of lookup values, with None for missing values.
+
+        :param columns: Pandas Series of lookup values.
+        :return: List of tuples.
+        """
+        return list(zip(*[column.astype(object).where(column.notnull(), None).tolist() for column in columns]))
+
+    def id_series(self, model, fields, values, resolved, index, **fixed):
+        """
+        Map lookup values to resolved record IDs, counting rows whose lookup values are not resolved to one record.
+
+        :param model: Data model class.
+        :param fields: Tuple of lookup field names.
+        :param values: List of tuples of lookup values.
+        :param resolved: Dictionary of ID of record, or NOT_FOUND or MULTIPLE_FOUND sentinels, keyed by lookup values.
+        :param index: Index of returned Series.
+        :param fixed: Lookup conditions shared by all values.
+        :return: Series of record IDs, with None for unresolved rows.
+        """
+        missed = {value: record_id for value, record_id in resolved.items()
+                  if record_id is NOT_FOUND or record_id is MULTIPLE_FOUND}
+        if missed:
+            rows = Counter(values)
+            fixed_fields = tuple(sorted(fixed))
+            fixed_values = tuple(fixed[field] for field in fixed_fields)
+            for value, record_id in missed.items():
+                self.cache.unresolved.add(model, self.REASONS[record_id], tuple(fields) + fixed_fields,
+                                          tuple(value) + fixed_values, rows[value])
+        ids = {value: (None if value in missed else record_id) for value, record_id in resolved.items()}
+        return pd.Series([ids[value] for value in values], index=index, dtype=object)
+
     @staticmethod
     def make_date_object(iso_date):
         """
@@ -2,6 +2,13 @@ import os
 import csv
 import glob
 import logging
+import itertools
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from marcotti.etl.manifest import Batch
 
 
 logger = logging.getLogger(__name__)
@@ -11,21 +18,160 @@ def extract(func):
     """
     Decorator function. Open and extract data from CSV files.  Return list of dictionaries.
 
+    If the instance defines a chunk size, return a generator of lists of dictionaries of that size instead.
+    If the instance defines a number of workers, extract files in parallel across a pool of processes.
+    If the instance defines a manifest, skip files that are recorded in it as unchanged.  The returned lists are
+    :class:`Batch` objects that carry the files whose last records they hold, for the manifest to record once
+    they have been loaded.
+
     :param func: Wrapped function with *args and **kwargs arguments.
     """
+    return _extractor(func, _read_rows)
+
+
+def extract_frame(func):
+    """
+    Decorator function. Open CSV files into DataFrames of strings and extract data from them.
+    Return list of dictionaries.
+
+    If the instance defines a chunk size, return a generator of lists of dictionaries of that size instead.
+    If the instance defines a number of workers, extract files in parallel across a pool of processes.
+    If the instance defines a manifest, skip files that are recorded in it as unchanged.  The returned lists are
+    :class:`Batch` objects that carry the files whose last records they hold, for the manifest to record once
+    they have been loaded.
+
+    :param func: Wrapped function with *args and **kwargs arguments.
+    """
+    return _extractor(func, _read_frames)
+
+
+def _extractor(func, reader):
     def _wrapper(*args):
-        out = []
         instance, prefix = args
-        for fname in glob.glob(os.path.join(getattr(instance, 'directory'), *prefix)):
-            with open(fname) as g:
-                out.extend(func(instance, data=csv.DictReader(g)))
+        fnames = glob.glob(os.path.join(getattr(instance, 'directory'), *prefix))
+        if getattr(instance, 'manifest', None) is not None:
+            fnames = instance.manifest.changed(func.__name__, fnames)
+        workers = getattr(instance, 'workers', None)
+        if workers and len(fnames) > 1:
+            batches = _parallel(instance, func.__name__, reader, fnames, workers)
+        else:
+            batches = _serial(func, instance, reader, fnames)
+        chunk_size = getattr(instance, 'chunk_size', None)
+        if chunk_size:
+            return _chunks(batches, chunk_size)
+        out = Batch()
+        for batch in batches:
+            out.extend(batch)
+            out.files.extend(batch.files)
         return out
+    _wrapper.func = func
     return _wrapper
 
 
+def _read_rows(handle, chunk_size=None):
+    """
+    Read CSV file into rows of dictionaries, in lists of rows if a chunk size is given.
+    """
+    reader = csv.DictReader(handle)
+    if not chunk_size:
+        return [reader]
+    return iter(lambda: list(itertools.islice(reader, chunk_size)), [])
+
+
+def _read_frames(handle, chunk_size=None):
+    """
+    Read CSV file into DataFrame of strings, in DataFrames of chunk size rows if a chunk size is given.
+    Empty fields are kept as empty strings.
+    """
+    frames = pd.read_csv(handle, dtype=str, keep_default_na=False, chunksize=chunk_size)
+    return frames if chunk_size else [frames]
+
+
+def _serial(func, instance, reader, fnames):
+    """
+    Extract data from CSV files one file at a time, reading files in chunks if the instance defines a chunk size.
+
+    The last batch of every file carries the file.
+
+    :return: Generator of batches of dictionaries.
+    """
+    chunk_size = getattr(instance, 'chunk_size', None)
+    for fname in fnames:
+        rows = 0
+        batch = Batch()
+        with open(fname) as g:
+            for index, data in enumerate(reader(g, chunk_size)):
+                if index:
+                    yield batch
+                batch = Batch(func(instance, data=data))
+                rows += len(batch)
+        batch.files.append((func.__name__, fname, rows))
+        yield batch
+
+
+def _extract_file(args):
+    instance, name, reader, fname = args
+    func = getattr(type(instance), name).__func__.func
+    out = []
+    with open(fname) as g:
+        for data in reader(g):
+            out.extend(func(instance, data=data))
+    return out
+
+
+def _parallel(instance, name, reader, fnames, workers):
+    """
+    Extract data from CSV files across a pool of worker processes, one file per task.
+
+    Results are returned in the order of the file names.
+
+    :param instance: Extractor instance.
+    :param name: Name of extraction method.
+    :param reader: Function that reads an open CSV file.
+    :param fnames: List of CSV file names.
+    :param workers: Number of worker processes.
+    :return: Generator of batches of dictionaries, one per file.
+    """
+    pool = multiprocessing.Pool(workers)
+    try:
+        tasks = [(instance, name, reader, fname) for fname in fnames]
+        batches = pool.imap(_extract_file, tasks, chunksize=max(1, len(tasks) // (4 * workers)))
+        for fname, batch in zip(fnames, batches):
+            yield Batch(batch, [(name, fname, len(batch))])
+    finally:
+        pool.terminate()
+
+
+def _chunks(batches, chunk_size):
+    """
+    Regroup extracted data into fixed-size chunks.
+
+    The files of the batches are carried by the chunks that hold their last records.  Files without records are
+    carried by the chunk that holds the records before them, or by an empty last chunk.
+
+    :param batches: Iterable of batches of dictionaries.
+    :param chunk_size: Number of records per chunk.
+    :return: Generator of batches of dictionaries.
+    """
+    out = []
+    files = []
+    for batch in batches:
+        out.extend(batch)
+        files.extend((len(out), entry) for entry in batch.files)
+        while len(out) >= chunk_size:
+            yield Batch(out[:chunk_size], [entry for end, entry in files if end <= chunk_size])
+            out = out[chunk_size:]
+            files = [(end - chunk_size, entry) for end, entry in files if end > chunk_size]
+    if out or files:
+        yield Batch(out, [entry for _, entry in files])
+
+
 class BaseCSV(object):
-    def __init__(self, directory):
+    def __init__(self, directory, chunk_size=None, workers=None, manifest=None):
         self.directory = directory
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.manifest = manifest
 
     @staticmethod
     def column(field, **kwargs):
@@ -59,3 +205,44 @@ class BaseCSV(object):
         except (KeyError, TypeError):
             return None
 
+    @staticmethod
+    def frame_column(frame, field):
+        """
+        Retrieve stripped string values of a DataFrame column, with None for empty or missing values.
+
+        :param frame: DataFrame of strings.
+        :param field: Column header.
+        :return: List of column values.
+        """
+        if field not in frame:
+            return [None] * len(frame)
+        values = frame[field].str.strip()
+        return values.where(values != "", None).tolist()
+
+    @staticmethod
+    def frame_numbers(frame, field, func):
+        if field not in frame:
+            return [None] * len(frame)
+        numbers = pd.to_numeric(frame[field].str.strip().replace("", np.nan))
+        return [func(number) if present else None
+                for number, present in zip(numbers.tolist(), numbers.notnull().tolist())]
+
+    def frame_int(self, frame, field):
+        return self.frame_numbers(frame, field, int)
+
+    def frame_bool(self, frame, field):
+        return [bool(value) for value in self.frame_int(frame, field)]
+
+    def frame_float(self, frame, field):
+        return self.frame_numbers(frame, field, float)
+
+    @staticmethod
+    def frame_records(**columns):
+        """
+        Assemble lists of column values into list of dictionaries keyed by column names.
+
+        :param columns: Lists of column values as keyword arguments.
+        :return: List of dictionaries.
+        """
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*[columns[key] for key in keys])]
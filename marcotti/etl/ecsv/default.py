@@ -1,4 +1,6 @@
-from .base import BaseCSV, extract
+from collections import OrderedDict
+
+from .base import BaseCSV, extract, extract_frame
 
 
 class CSVExtractor(BaseCSV):
@@ -263,353 +265,355 @@ class CSVExtractor(BaseCSV):
                 for keys in kwargs.get('data')]
 
 
-class CSVStatsExtractor(BaseCSV):
-
-    def player_data(self, data_row):
-        return dict(remote_player_id=self.column("Player ID", **data_row),
-                    remote_player_team_id=self.column("Team Id", **data_row),
-                    remote_opposing_team_id=self.column("Opposition Id", **data_row),
-                    match_date=self.column("Date", **data_row),
-                    locale=self.column("Venue", **data_row),
-                    )
+def stat_extractors(reader):
+    """
+    Class decorator. Add one extraction method per statistics category in the column spec of the class, wrapped
+    by an extraction decorator.
 
-    @extract
-    def assists(self, *args, **kwargs):
-        return [dict(totals=self.column_int("Assists", **keys),
-                     corners=self.column_int("Goal Assist Corner", **keys),
-                     freekicks=self.column_int("Goal Assist Free Kick", **keys),
-                     throwins=self.column_int("Goal Assist Throw In", **keys),
-                     goalkicks=self.column_int("Goal Assist Goal Kick", **keys),
-                     setpieces=self.column_int("Goal Assist Set Piece", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    :param reader: Extraction decorator, :func:`extract` or :func:`extract_frame`.
+    """
+    def method(category):
+        def extractor(self, *args, **kwargs):
+            return self.category_records(category, kwargs.get('data'))
+        extractor.__name__ = category
+        return reader(extractor)
 
-    @extract
-    def clearances(self, *args, **kwargs):
-        return [dict(total=self.column_int("Total Clearances", **keys),
-                     headed=self.column_int("Headed Clearances", **keys),
-                     other=self.column_int("Other Clearances", **keys),
-                     goalline=self.column_int("Clearances Off the Line", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    def decorate(cls):
+        for category in cls.categories:
+            setattr(cls, category, method(category))
+        return cls
+    return decorate
 
-    @extract
-    def corners(self, *args, **kwargs):
-        return [dict(totals=self.column_int("Corners Taken incl short corners", **keys),
-                     short=self.column_int("Short Corners", **keys),
-                     box_success=self.column_int("Successful Corners into Box", **keys),
-                     box_failure=self.column_int("Unsuccessful Corners into Box", **keys),
-                     left_success=self.column_int("Successful Corners Left", **keys),
-                     left_failure=self.column_int("Unsuccessful Corners Left", **keys),
-                     right_success=self.column_int("Successful Corners Right", **keys),
-                     right_failure=self.column_int("Unsuccessful Corners Right", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
 
-    @extract
-    def corner_crosses(self, *args, **kwargs):
-        return [dict(total_success=self.column_int("Successful Crosses Corners", **keys),
-                     total_failure=self.column_int("Unsuccessful Crosses Corners", **keys),
-                     air_success=self.column_int("Successful Crosses Corners in the air", **keys),
-                     air_failure=self.column_int("Unsuccessful Crosses Corners in the air", **keys),
-                     left_success=self.column_int("Successful Crosses Corners Left", **keys),
-                     left_failure=self.column_int("Unsuccessful Crosses Corners Left", **keys),
-                     right_success=self.column_int("Successful Crosses Corners Right", **keys),
-                     right_failure=self.column_int("Unsuccessful Crosses Corners Right", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def crosses(self, *args, **kwargs):
-        return [dict(air_success=self.column_int("Successful crosses in the air", **keys),
-                     air_failure=self.column_int("Unsuccessful crosses in the air", **keys),
-                     openplay_success=self.column_int("Successful open play crosses", **keys),
-                     openplay_failure=self.column_int("Unsuccessful open play crosses", **keys),
-                     left_success=self.column_int("Successful Crosses Left", **keys),
-                     left_failure=self.column_int("Unsuccessful Crosses Left", **keys),
-                     right_success=self.column_int("Successful Crosses Right", **keys),
-                     right_failure=self.column_int("Unsuccessful Crosses Right", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def defensives(self, *args, **kwargs):
-        return [dict(blocks=self.column_int("Blocks", **keys),
-                     intercepts=self.column_int("Interceptions", **keys),
-                     recovers=self.column_int("Recoveries", **keys),
-                     corners=self.column_int("Corners Conceded", **keys),
-                     fouls=self.column_int("Total Fouls Conceded", **keys),
-                     challenges_lost=self.column_int("Challenge Lost", **keys),
-                     handballs=self.column_int("Handballs Conceded", **keys),
-                     penalties=self.column_int("Penalties Conceded", **keys),
-                     errs_goals=self.column_int("Error leading to Goal", **keys),
-                     errs_shots=self.column_int("Error leading to Attempt", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def discipline(self, *args, **kwargs):
-        return [dict(yellows=self.column_int("Yellow Cards", **keys),
-                     reds=self.column_int("Red Cards", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def duels(self, *args, **kwargs):
-        return [dict(total_won=self.column_int("Duels won", **keys),
-                     total_lost=self.column_int("Duels lost", **keys),
-                     aerial_won=self.column_int("Aerial Duels won", **keys),
-                     aerial_lost=self.column_int("Aerial Duels lost", **keys),
-                     ground_won=self.column_int("Ground Duels won", **keys),
-                     ground_lost=self.column_int("Ground Duels lost", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def foul_wins(self, *args, **kwargs):
-        return [dict(total=self.column_int("Total Fouls Won", **keys),
-                     total_danger=self.column_int("Fouls Won in Danger Area inc pens", **keys),
-                     total_penalty=self.column_int("Foul Won Penalty", **keys),
-                     total_nodanger=self.column_int("Fouls Won not in danger area", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def freekicks(self, *args, **kwargs):
-        return [dict(ontarget=self.column_int("Direct Free-kick On Target", **keys),
-                     offtarget=self.column_int("Direct Free-kick Off Target", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def gk_actions(self, *args, **kwargs):
-        return [dict(catches=self.column_int("Catches", **keys),
-                     punches=self.column_int("Punches", **keys),
-                     drops=self.column_int("Drops", **keys),
-                     crosses_noclaim=self.column_int("Crosses not Claimed", **keys),
-                     distrib_success=self.column_int("GK Successful Distribution", **keys),
-                     distrib_failure=self.column_int("GK Unsuccessful Distribution", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def gk_allowed_goals(self, *args, **kwargs):
-        return [dict(insidebox=self.column_int("Goals Conceded Inside Box", **keys),
-                     outsidebox=self.column_int("Goals Conceded Outside Box", **keys),
-                     is_cleansheet=self.column_bool("Clean Sheets", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def gk_allowed_shots(self, *args, **kwargs):
-        return [dict(insidebox=self.column_int("Shots On Conceded Inside Box", **keys),
-                     outsidebox=self.column_int("Shots On Conceded Outside Box", **keys),
-                     bigchances=self.column_int("Big Chances Faced", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def gk_saves(self, *args, **kwargs):
-        return [dict(insidebox=self.column_int("Saves Made from Inside Box", **keys),
-                     outsidebox=self.column_int("Saves Made from Outside Box", **keys),
-                     penalty=self.column_int("Saves from Penalty", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def goal_bodyparts(self, *args, **kwargs):
-        return [dict(headed=self.column_int("Headed Goals", **keys),
-                     left_foot=self.column_int("Left Foot Goals", **keys),
-                     right_foot=self.column_int("Right Foot Goals", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def goal_locations(self, *args, **kwargs):
-        return [dict(insidebox=self.column_int("Goals from Inside Box", **keys),
-                     outsidebox=self.column_int("Goals from Outside Box", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def goal_totals(self, *args, **kwargs):
-        return [dict(is_firstgoal=self.column_bool("First Goal", **keys),
-                     is_winner=self.column_bool("Winning Goal", **keys),
-                     freekick=self.column_int("Goals from Direct Free Kick", **keys),
-                     openplay=self.column_int("Goals Open Play", **keys),
-                     corners=self.column_int("Goals from Corners", **keys),
-                     throwins=self.column_int("Goals from Throws", **keys),
-                     penalties=self.column_int("Goals from penalties", **keys),
-                     substitute=self.column_int("Goals as a substitute", **keys),
-                     other=self.column_int("Other Goals", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def goalline_clearances(self, *args, **kwargs):
-        return [dict(insidebox=self.column_int("Shots Cleared off Line Inside Area", **keys),
-                     outsidebox=self.column_int("Shots Cleared off Line Outside Area", **keys),
-                     totalshots=self.column_int("Shots Cleared off Line", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def important_plays(self, *args, **kwargs):
-        return [dict(corners=self.column_int("Key Corner", **keys),
-                     freekicks=self.column_int("Key Free Kick", **keys),
-                     throwins=self.column_int("Key Throw In", **keys),
-                     goalkicks=self.column_int("Key Goal Kick", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def pass_directions(self, *args, **kwargs):
-        return [dict(pass_forward=self.column_int("Pass Forward", **keys),
-                     pass_backward=self.column_int("Pass Backward", **keys),
-                     pass_left=self.column_int("Pass Left", **keys),
-                     pass_right=self.column_int("Pass Right", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
-
-    @extract
-    def pass_lengths(self, *args, **kwargs):
-        return [dict(short_success=self.column_int("Successful Short Passes", **keys),
-                     short_failure=self.column_int("Unsuccessful Short Passes", **keys),
-                     long_success=self.column_int("Successful Long Passes", **keys),
-                     long_failure=self.column_int("Unsuccessful Long Passes", **keys),
-                     flickon_success=self.column_int("Successful Flick-Ons", **keys),
-                     flickon_failure=self.column_int("Unsuccessful Flick-Ons", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+@stat_extractors(extract)
+class CSVStatsExtractor(BaseCSV):
+    """
+    Extract match statistics from CSV files one data row at a time.
+
+    Statistics categories are extracted according to :attr:`stat_columns`, which lists the record key, column
+    header and value type of every field of every category.
+    """
+
+    player_columns = [
+        ('remote_player_id', "Player ID", 'str'),
+        ('remote_player_team_id', "Team Id", 'str'),
+        ('remote_opposing_team_id', "Opposition Id", 'str'),
+        ('match_date', "Date", 'str'),
+        ('locale', "Venue", 'str')
+    ]
+
+    stat_columns = OrderedDict([
+        ('assists', [
+            ('total', "Assists", 'int'),
+            ('corners', "Goal Assist Corner", 'int'),
+            ('freekicks', "Goal Assist Free Kick", 'int'),
+            ('throwins', "Goal Assist Throw In", 'int'),
+            ('goalkicks', "Goal Assist Goal Kick", 'int'),
+            ('setpieces', "Goal Assist Set Piece", 'int')
+        ]),
+        ('clearances', [
+            ('total', "Total Clearances", 'int'),
+            ('headed', "Headed Clearances", 'int'),
+            ('other', "Other Clearances", 'int'),
+            ('goalline', "Clearances Off the Line", 'int')
+        ]),
+        ('corner_crosses', [
+            ('total_success', "Successful Crosses Corners", 'int'),
+            ('total_failure', "Unsuccessful Crosses Corners", 'int'),
+            ('air_success', "Successful Crosses Corners in the air", 'int'),
+            ('air_failure', "Unsuccessful Crosses Corners in the air", 'int'),
+            ('left_success', "Successful Crosses Corners Left", 'int'),
+            ('left_failure', "Unsuccessful Crosses Corners Left", 'int'),
+            ('right_success', "Successful Crosses Corners Right", 'int'),
+            ('right_failure', "Unsuccessful Crosses Corners Right", 'int')
+        ]),
+        ('corners', [
+            ('total', "Corners Taken incl short corners", 'int'),
+            ('short', "Short Corners", 'int'),
+            ('penbox_success', "Successful Corners into Box", 'int'),
+            ('penbox_failure', "Unsuccessful Corners into Box", 'int'),
+            ('left_success', "Successful Corners Left", 'int'),
+            ('left_failure', "Unsuccessful Corners Left", 'int'),
+            ('right_success', "Successful Corners Right", 'int'),
+            ('right_failure', "Unsuccessful Corners Right", 'int')
+        ]),
+        ('crosses', [
+            ('air_success', "Successful crosses in the air", 'int'),
+            ('air_failure', "Unsuccessful crosses in the air", 'int'),
+            ('openplay_success', "Successful open play crosses", 'int'),
+            ('openplay_failure', "Unsuccessful open play crosses", 'int'),
+            ('left_success', "Successful Crosses Left", 'int'),
+            ('left_failure', "Unsuccessful Crosses Left", 'int'),
+            ('right_success', "Successful Crosses Right", 'int'),
+            ('right_failure', "Unsuccessful Crosses Right", 'int')
+        ]),
+        ('defensives', [
+            ('blocks', "Blocks", 'int'),
+            ('interceptions', "Interceptions", 'int'),
+            ('recoveries', "Recoveries", 'int'),
+            ('corners_conceded', "Corners Conceded", 'int'),
+            ('fouls_conceded', "Total Fouls Conceded", 'int'),
+            ('challenges_lost', "Challenge Lost", 'int'),
+            ('handballs_conceded', "Handballs Conceded", 'int'),
+            ('penalties_conceded', "Penalties Conceded", 'int'),
+            ('error_goals', "Error leading to Goal", 'int'),
+            ('error_shots', "Error leading to Attempt", 'int')
+        ]),
+        ('discipline', [
+            ('yellows', "Yellow Cards", 'int'),
+            ('reds', "Red Cards", 'int')
+        ]),
+        ('duels', [
+            ('total_won', "Duels won", 'int'),
+            ('total_lost', "Duels lost", 'int'),
+            ('aerial_won', "Aerial Duels won", 'int'),
+            ('aerial_lost', "Aerial Duels lost", 'int'),
+            ('ground_won', "Ground Duels won", 'int'),
+            ('ground_lost', "Ground Duels lost", 'int')
+        ]),
+        ('foul_wins', [
+            ('total', "Total Fouls Won", 'int'),
+            ('total_danger', "Fouls Won in Danger Area inc pens", 'int'),
+            ('total_penalty', "Foul Won Penalty", 'int'),
+            ('total_nodanger', "Fouls Won not in danger area", 'int')
+        ]),
+        ('freekicks', [
+            ('ontarget', "Direct Free-kick On Target", 'int'),
+            ('offtarget', "Direct Free-kick Off Target", 'int')
+        ]),
+        ('gk_actions', [
+            ('catches', "Catches", 'int'),
+            ('punches', "Punches", 'int'),
+            ('drops', "Drops", 'int'),
+            ('crosses_unclaimed', "Crosses not Claimed", 'int'),
+            ('distribution_success', "GK Successful Distribution", 'int'),
+            ('distribution_failure', "GK Unsuccessful Distribution", 'int')
+        ]),
+        ('gk_allowed_goals', [
+            ('insidebox', "Goals Conceded Inside Box", 'int'),
+            ('outsidebox', "Goals Conceded Outside Box", 'int'),
+            ('is_cleansheet', "Clean Sheets", 'bool')
+        ]),
+        ('gk_allowed_shots', [
+            ('insidebox', "Shots On Conceded Inside Box", 'int'),
+            ('outsidebox', "Shots On Conceded Outside Box", 'int'),
+            ('dangerous', "Big Chances Faced", 'int')
+        ]),
+        ('gk_saves', [
+            ('insidebox', "Saves Made from Inside Box", 'int'),
+            ('outsidebox', "Saves Made from Outside Box", 'int'),
+            ('penalty', "Saves from Penalty", 'int')
+        ]),
+        ('goal_bodyparts', [
+            ('headed', "Headed Goals", 'int'),
+            ('leftfoot', "Left Foot Goals", 'int'),
+            ('rightfoot', "Right Foot Goals", 'int')
+        ]),
+        ('goal_locations', [
+            ('insidebox', "Goals from Inside Box", 'int'),
+            ('outsidebox', "Goals from Outside Box", 'int')
+        ]),
+        ('goal_totals', [
+            ('is_firstgoal', "First Goal", 'bool'),
+            ('is_winner', "Winning Goal", 'bool'),
+            ('freekick', "Goals from Direct Free Kick", 'int'),
+            ('openplay', "Goals Open Play", 'int'),
+            ('corners', "Goals from Corners", 'int'),
+            ('throwins', "Goals from Throws", 'int'),
+            ('penalties', "Goals from penalties", 'int'),
+            ('substitute', "Goals as a substitute", 'int'),
+            ('other', "Other Goals", 'int')
+        ]),
+        ('goalline_clearances', [
+            ('insidebox', "Shots Cleared off Line Inside Area", 'int'),
+            ('outsidebox', "Shots Cleared off Line Outside Area", 'int'),
+            ('totalshots', "Shots Cleared off Line", 'int')
+        ]),
+        ('important_plays', [
+            ('corners', "Key Corner", 'int'),
+            ('freekicks', "Key Free Kick", 'int'),
+            ('throwins', "Key Throw In", 'int'),
+            ('goalkicks', "Key Goal Kick", 'int')
+        ]),
+        ('pass_directions', [
+            ('forward', "Pass Forward", 'int'),
+            ('backward', "Pass Backward", 'int'),
+            ('left_side', "Pass Left", 'int'),
+            ('right_side', "Pass Right", 'int')
+        ]),
+        ('pass_lengths', [
+            ('short_success', "Successful Short Passes", 'int'),
+            ('short_failure', "Unsuccessful Short Passes", 'int'),
+            ('long_success', "Successful Long Passes", 'int'),
+            ('long_failure', "Unsuccessful Long Passes", 'int'),
+            ('flickon_success', "Successful Flick-Ons", 'int'),
+            ('flickon_failure', "Unsuccessful Flick-Ons", 'int')
+        ]),
+        ('pass_locations', [
+            ('ownhalf_success', "Successful Passes Own Half", 'int'),
+            ('ownhalf_failure', "Unsuccessful Passes Own Half", 'int'),
+            ('opphalf_success', "Successful Passes Opposition Half", 'int'),
+            ('opphalf_failure', "Unsuccessful Passes Opposition Half", 'int'),
+            ('defthird_success', "Successful Passes Defensive third", 'int'),
+            ('defthird_failure', "Unsuccessful Passes Defensive third", 'int'),
+            ('midthird_success', "Successful Passes Middle third", 'int'),
+            ('midthird_failure', "Unsuccessful Passes Middle third", 'int'),
+            ('finthird_success', "Successful Passes Final third", 'int'),
+            ('finthird_failure', "Unsuccessful Passes Final third", 'int')
+        ]),
+        ('pass_totals', [
+            ('total_success', "Total Successful Passes All", 'int'),
+            ('total_failure', "Total Unsuccessful Passes All", 'int'),
+            ('total_no_cc_success', "Total Successful Passes Excl Crosses Corners", 'int'),
+            ('total_no_cc_failure', "Total Unsuccessful Passes Excl Crosses Corners", 'int'),
+            ('longball_success', "Successful Long Balls", 'int'),
+            ('longball_failure', "Unsuccessful Long Balls", 'int'),
+            ('layoffs_success', "Successful Lay-Offs", 'int'),
+            ('layoffs_failure', "Unsuccessful Lay-Offs", 'int'),
+            ('throughballs', "Through Ball", 'int'),
+            ('important_passes', "Key Passes", 'int')
+        ]),
+        ('penalty_actions', [
+            ('taken', "Penalties Taken", 'int'),
+            ('saved', "Penalties Saved", 'int'),
+            ('offtarget', "Penalties Off Target", 'int'),
+            ('ontarget', "Attempts from Penalties on target", 'int')
+        ]),
+        ('shot_blocks', [
+            ('freekick', "Blocked Direct Free-kick", 'int'),
+            ('insidebox', "Blocked Shots from Inside Box", 'int'),
+            ('outsidebox', "Blocked Shots Outside Box", 'int'),
+            ('headed', "Headed Blocked Shots", 'int'),
+            ('leftfoot', "Left Foot Blocked Shots", 'int'),
+            ('rightfoot', "Right Foot Blocked Shots", 'int'),
+            ('other', "Other Blocked Shots", 'int'),
+            ('total', "Blocked Shots", 'int')
+        ]),
+        ('shot_bodyparts', [
+            ('head_ontarget', "Headed Shots On Target", 'int'),
+            ('head_offtarget', "Headed Shots Off Target", 'int'),
+            ('left_ontarget', "Left Foot Shots On Target", 'int'),
+            ('left_offtarget', "Left Foot Shots Off Target", 'int'),
+            ('right_ontarget', "Right Foot Shots On Target", 'int'),
+            ('right_offtarget', "Right Foot Shots Off Target", 'int')
+        ]),
+        ('shot_locations', [
+            ('insidebox_ontarget', "Shots On from Inside Box", 'int'),
+            ('insidebox_offtarget', "Shots Off from Inside Box", 'int'),
+            ('outsidebox_ontarget', "Shots On Target Outside Box", 'int'),
+            ('outsidebox_offtarget', "Shots Off Target Outside Box", 'int')
+        ]),
+        ('shot_plays', [
+            ('openplay_ontarget', "Attempts Open Play on target", 'int'),
+            ('openplay_offtarget', "Attempts Open Play off target", 'int'),
+            ('setplay_ontarget', "Attempts from Set Play on target", 'int'),
+            ('setplay_offtarget', "Attempts from Set Play off target", 'int'),
+            ('freekick_ontarget', "Attempts from Direct Free Kick on target", 'int'),
+            ('freekick_offtarget', "Attempts from Direct Free Kick off target", 'int'),
+            ('corners_ontarget', "Attempts from Corners on target", 'int'),
+            ('corners_offtarget', "Attempts from Corners off target", 'int'),
+            ('throwins_ontarget', "Attempts from Throws on target", 'int'),
+            ('throwins_offtarget', "Attempts from Throws off target", 'int'),
+            ('other_ontarget', "Other Shots On Target", 'int'),
+            ('other_offtarget', "Other Shots Off Target", 'int')
+        ]),
+        ('shot_totals', [
+            ('ontarget', "Shots On Target inc goals", 'int'),
+            ('offtarget', "Shots Off Target inc woodwork", 'int'),
+            ('dangerous', "Big Chances", 'int')
+        ]),
+        ('tackles', [
+            ('won', "Tackles Won", 'int'),
+            ('lost', "Tackles Lost", 'int'),
+            ('lastman', "Last Man Tackle", 'int')
+        ]),
+        ('throwins', [
+            ('to_teamplayer', "Throw Ins to Own Player", 'int'),
+            ('to_oppplayer', "Throw Ins to Opposition Player", 'int')
+        ]),
+        ('touch_locations', [
+            ('final_third', "Touches open play final third", 'int'),
+            ('oppbox', "Touches open play opp box", 'int'),
+            ('oppsix', "Touches open play opp six yards", 'int')
+        ]),
+        ('touches', [
+            ('dribble_overruns', "Take-Ons Overrun", 'int'),
+            ('dribble_success', "Successful Dribbles", 'int'),
+            ('dribble_failure', "Unsuccessful Dribbles", 'int'),
+            ('balltouch_success', "Successful Ball Touch", 'int'),
+            ('balltouch_failure', "Unsuccessful Ball Touch", 'int'),
+            ('possession_loss', "Dispossessed", 'int'),
+            ('total', "Touches", 'int')
+        ])
+    ])
+
+    categories = list(stat_columns)
+
+    player_fields = [key for key, header, kind in player_columns]
+
+    converters = {'str': 'column', 'int': 'column_int', 'bool': 'column_bool'}
+
+    def stat_records(self, player_records, data):
+        """
+        Add fields of every statistics category, extracted from the same data, to player records.
+
+        Category fields are keyed as ``<category>.<field>``.
+
+        :param player_records: List of dictionaries of player fields, one per data row.
+        :param data: Data rows of statistics file.
+        :return: List of dictionaries.
+        """
+        for category in self.categories:
+            for record, values in zip(player_records, getattr(type(self), category).func(self, data=data)):
+                record.update(("{}.{}".format(category, field), value)
+                              for field, value in values.items() if field not in self.player_fields)
+        return player_records
+
+    @extract
+    def player_stats(self, *args, **kwargs):
+        rows = list(kwargs.get('data'))
+        return self.stat_records([self.player_data(row) for row in rows], rows)
 
-    @extract
-    def pass_locations(self, *args, **kwargs):
-        return [dict(ownhalf_success=self.column_int("Successful Passes Own Half", **keys),
-                     ownhalf_failure=self.column_int("Unsuccessful Passes Own Half", **keys),
-                     opphalf_success=self.column_int("Successful Passes Opposition Half", **keys),
-                     opphalf_failure=self.column_int("Unsuccessful Passes Opposition Half", **keys),
-                     defthird_success=self.column_int("Successful Passes Defensive third", **keys),
-                     defthird_failure=self.column_int("Unsuccessful Passes Defensive third", **keys),
-                     midthird_success=self.column_int("Successful Passes Middle third", **keys),
-                     midthird_failure=self.column_int("Unsuccessful Passes Middle third", **keys),
-                     finthird_success=self.column_int("Successful Passes Final third", **keys),
-                     finthird_failure=self.column_int("Unsuccessful Passes Final third", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    def player_data(self, data_row):
+        return self.row_values(self.player_columns, data_row)
 
-    @extract
-    def pass_totals(self, *args, **kwargs):
-        return [dict(total_success=self.column_int("Total Successful Passes All", **keys),
-                     total_failure=self.column_int("Total Unsuccessful Passes All", **keys),
-                     total_no_cc_success=self.column_int("Total Successful Passes Excl Crosses Corners", **keys),
-                     total_no_cc_failure=self.column_int("Total Unsuccessful Passes Excl Crosses Corners", **keys),
-                     longball_success=self.column_int("Successful Long Balls", **keys),
-                     longball_failure=self.column_int("Unsuccessful Long Balls", **keys),
-                     layoffs_success=self.column_int("Successful Lay-Offs", **keys),
-                     layoffs_failure=self.column_int("Unsuccessful Lay-Offs", **keys),
-                     throughballs=self.column_int("Through Ball", **keys),
-                     keypasses=self.column_int("Key Passes", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    def row_values(self, columns, data_row):
+        return {key: getattr(self, self.converters[kind])(header, **data_row) for key, header, kind in columns}
 
-    @extract
-    def penalty_actions(self, *args, **kwargs):
-        return [dict(taken=self.column_int("Penalties Taken", **keys),
-                     saved=self.column_int("Penalties Saved", **keys),
-                     offtarget=self.column_int("Penalties Off Target", **keys),
-                     ontarget=self.column_int("Attempts from Penalties on target", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    def category_records(self, category, data):
+        """
+        Extract records of a statistics category, with the player fields of each record.
 
-    @extract
-    def shot_blocks(self, *args, **kwargs):
-        return [dict(freekick=self.column_int("Blocked Direct Free-kick", **keys),
-                     insidebox=self.column_int("Blocked Shots from Inside Box", **keys),
-                     outsidebox=self.column_int("Blocked Shots Outside Box", **keys),
-                     headed=self.column_int("Headed Blocked Shots", **keys),
-                     leftfoot=self.column_int("Left Foot Blocked Shots", **keys),
-                     rightfoot=self.column_int("Right Foot Blocked Shots", **keys),
-                     other=self.column_int("Other Blocked Shots", **keys),
-                     total=self.column_int("Blocked Shots", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+        :param category: Statistics category name.
+        :param data: Data rows of statistics file.
+        :return: List of dictionaries.
+        """
+        return [dict(self.row_values(self.stat_columns[category], keys), **self.player_data(keys))
+                for keys in data]
 
-    @extract
-    def shot_bodyparts(self, *args, **kwargs):
-        return [dict(head_ontarget=self.column_int("Headed Shots On Target", **keys),
-                     head_offtarget=self.column_int("Headed Shots Off Target", **keys),
-                     left_ontarget=self.column_int("Left Foot Shots On Target", **keys),
-                     left_offtarget=self.column_int("Left Foot Shots Off Target", **keys),
-                     right_ontarget=self.column_int("Right Foot Shots On Target", **keys),
-                     right_offtarget=self.column_int("Right Foot Shots Off Target", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
 
-    @extract
-    def shot_locations(self, *args, **kwargs):
-        return [dict(insidebox_ontarget=self.column_int("Shots On from Inside Box", **keys),
-                     insidebox_offtarget=self.column_int("Shots Off from Inside Box", **keys),
-                     outsidebox_ontarget=self.column_int("Shots On Target Outside Box", **keys),
-                     outsidebox_offtarget=self.column_int("Shots Off Target Outside Box", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+@stat_extractors(extract_frame)
+class CSVFrameStatsExtractor(CSVStatsExtractor):
+    """
+    Extract match statistics from CSV files, reading each file into a DataFrame and converting
+    its columns in one pass.
 
-    @extract
-    def shot_plays(self, *args, **kwargs):
-        return [dict(openplay_ontarget=self.column_int("Attempts Open Play on target", **keys),
-                     openplay_offtarget=self.column_int("Attempts Open Play off target", **keys),
-                     setplay_ontarget=self.column_int("Attempts from Set Play on target", **keys),
-                     setplay_offtarget=self.column_int("Attempts from Set Play off target", **keys),
-                     freekick_ontarget=self.column_int("Attempts from Direct Free Kick on target", **keys),
-                     freekick_offtarget=self.column_int("Attempts from Direct Free Kick off target", **keys),
-                     corners_ontarget=self.column_int("Attempts from Corners on target", **keys),
-                     corners_offtarget=self.column_int("Attempts from Corners off target", **keys),
-                     throwins_ontarget=self.column_int("Attempts from Throws on target", **keys),
-                     throwins_offtarget=self.column_int("Attempts from Throws off target", **keys),
-                     other_ontarget=self.column_int("Other Shots On Target", **keys),
-                     other_offtarget=self.column_int("Other Shots Off Target", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    Uses the same column spec as :class:`CSVStatsExtractor`, and therefore produces the same records.
+    """
 
-    @extract
-    def shot_totals(self, *args, **kwargs):
-        return [dict(ontarget=self.column_int("Shots On Target inc goals", **keys),
-                     offtarget=self.column_int("Shots Off Target inc woodwork", **keys),
-                     bigchances=self.column_int("Big Chances", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    converters = {'str': 'frame_column', 'int': 'frame_int', 'bool': 'frame_bool'}
 
-    @extract
-    def tackles(self, *args, **kwargs):
-        return [dict(won=self.column_int("Tackles Won", **keys),
-                     lost=self.column_int("Tackles Lost", **keys),
-                     lastman=self.column_int("Last Man Tackle", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    def player_data(self, frame):
+        return self.frame_values(self.player_columns, frame)
 
-    @extract
-    def throwins(self, *args, **kwargs):
-        return [dict(teamplayer=self.column_int("Throw Ins to Own Player", **keys),
-                     oppplayer=self.column_int("Throw Ins to Opposition Player", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    def frame_values(self, columns, frame):
+        return {key: getattr(self, self.converters[kind])(frame, header) for key, header, kind in columns}
 
-    @extract
-    def touches(self, *args, **kwargs):
-        return [dict(dribble_overruns=self.column_int("Take-Ons Overrun", **keys),
-                     dribble_success=self.column_int("Successful Dribbles", **keys),
-                     dribble_failure=self.column_int("Unsuccessful Dribbles", **keys),
-                     balltouch_success=self.column_int("Successful Ball Touch", **keys),
-                     balltouch_failure=self.column_int("Unsuccessful Ball Touch", **keys),
-                     possession_loss=self.column_int("Dispossessed", **keys),
-                     total=self.column_int("Touches", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    @extract_frame
+    def player_stats(self, *args, **kwargs):
+        frame = kwargs.get('data')
+        return self.stat_records(self.frame_records(**self.player_data(frame)), frame)
 
-    @extract
-    def touch_locations(self, *args, **kwargs):
-        return [dict(finalthird=self.column_int("Touches open play final third", **keys),
-                     oppbox=self.column_int("Touches open play opp box", **keys),
-                     oppsix=self.column_int("Touches open play opp six yards", **keys),
-                     **self.player_data(keys))
-                for keys in kwargs.get('data')]
+    def category_records(self, category, frame):
+        return self.frame_records(**dict(self.frame_values(self.stat_columns[category], frame),
+                                         **self.player_data(frame)))
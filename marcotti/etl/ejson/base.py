@@ -2,6 +2,9 @@ import os
 import glob
 import json
 import logging
+import multiprocessing
+
+from marcotti.etl.manifest import Batch
 
 
 logger = logging.getLogger(__name__)
@@ -11,18 +14,64 @@ def extract(func):
     """
     Decorator function. Open and extract data from JSON files.  Return list of dictionaries.
 
+    If the instance defines a number of workers, extract files in parallel across a pool of processes.
+    If the instance defines a manifest, skip files that are recorded in it as unchanged.  The returned list is a
+    :class:`Batch` object that carries the extracted files, for the manifest to record once they have been loaded.
+
     :param func: Wrapped function with *args and **kwargs arguments.
     """
     def _wrapper(*args):
-        out = []
+        out = Batch()
         instance, prefix = args
-        for fname in glob.glob(os.path.join(getattr(instance, 'directory'), *prefix)):
-            with open(fname) as g:
-                out.extend(func(instance, data=json.load(g)))
+        fnames = glob.glob(os.path.join(getattr(instance, 'directory'), *prefix))
+        manifest = getattr(instance, 'manifest', None)
+        if manifest is not None:
+            fnames = manifest.changed(func.__name__, fnames)
+        workers = getattr(instance, 'workers', None)
+        if workers and len(fnames) > 1:
+            batches = _parallel(instance, func.__name__, fnames, workers)
+        else:
+            batches = []
+            for fname in fnames:
+                with open(fname) as g:
+                    batches.append(func(instance, data=json.load(g)))
+        for fname, batch in zip(fnames, batches):
+            out.extend(batch)
+            out.files.append((func.__name__, fname, len(batch)))
         return out
+    _wrapper.func = func
     return _wrapper
 
 
+def _extract_file(args):
+    instance, name, fname = args
+    func = getattr(type(instance), name).__func__.func
+    with open(fname) as g:
+        return func(instance, data=json.load(g))
+
+
+def _parallel(instance, name, fnames, workers):
+    """
+    Extract data from JSON files across a pool of worker processes, one file per task.
+
+    Results are returned in the order of the file names.
+
+    :param instance: Extractor instance.
+    :param name: Name of extraction method.
+    :param fnames: List of JSON file names.
+    :param workers: Number of worker processes.
+    :return: List of lists of dictionaries, one per file.
+    """
+    pool = multiprocessing.Pool(workers)
+    try:
+        tasks = [(instance, name, fname) for fname in fnames]
+        return pool.map(_extract_file, tasks, chunksize=max(1, len(tasks) // (4 * workers)))
+    finally:
+        pool.terminate()
+
+
 class BaseJSON(object):
-    def __init__(self, directory):
+    def __init__(self, directory, workers=None, manifest=None):
         self.directory = directory
+        self.workers = workers
+        self.manifest = manifest
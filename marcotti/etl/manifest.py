@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class Batch(list):
+    """
+    List of extracted records, together with the data files whose last records are in the list.
+
+    Each file is a tuple of extraction method name, file name, and number of records extracted from the file.
+    """
+
+    def __init__(self, records=(), files=()):
+        super(Batch, self).__init__(records)
+        self.files = list(files)
+
+
+class Manifest(object):
+    """
+    Record of data files that have been extracted and loaded, kept in a JSON sidecar file.
+
+    Each file is recorded per data entity with its size, modification time, content hash, and number of
+    extracted records.  Files are recorded once the batch that holds their last records has been loaded, and the
+    records are written to the sidecar file when the loaded data are committed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.pending = []
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f).get('files', {})
+
+    @staticmethod
+    def digest(fname):
+        """
+        Calculate SHA-1 hash of file contents.
+
+        :param fname: File name.
+        :return: Hexadecimal digest string.
+        """
+        sha = hashlib.sha1()
+        with open(fname, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def unchanged(self, entity, fname):
+        """
+        Check whether a file has already been loaded for a data entity and not modified since.
+
+        File size and modification time are compared first; the content hash is calculated only if the
+        modification time differs.
+
+        :param entity: Data entity name.
+        :param fname: File name.
+        :return: True if the file is unchanged.
+        """
+        entry = self.entries.get(entity, {}).get(os.path.abspath(fname))
+        if entry is None:
+            return False
+        stat = os.stat(fname)
+        if stat.st_size != entry['size']:
+            return False
+        return stat.st_mtime == entry['mtime'] or self.digest(fname) == entry['sha1']
+
+    def changed(self, entity, fnames):
+        """
+        Filter list of file names to those that are new or modified for a data entity.
+
+        :param entity: Data entity name.
+        :param fnames: List of file names.
+        :return: List of file names.
+        """
+        out = [fname for fname in fnames if not self.unchanged(entity, fname)]
+        if len(out) < len(fnames):
+            logger.info("{}: skipped {} unchanged files".format(entity, len(fnames) - len(out)))
+        return out
+
+    def record(self, entity, fname, rows):
+        """
+        Record loaded file as pending until the manifest is saved.
+
+        :param entity: Data entity name.
+        :param fname: File name.
+        :param rows: Number of records extracted from file.
+        """
+        stat = os.stat(fname)
+        self.pending.append((entity, os.path.abspath(fname), dict(
+            size=stat.st_size, mtime=stat.st_mtime, sha1=self.digest(fname), rows=rows)))
+
+    def save(self):
+        """
+        Add pending file records to the manifest and write it to the sidecar file.
+        """
+        if not self.pending:
+            return
+        for entity, fname, entry in self.pending:
+            self.entries.setdefault(entity, {})[fname] = entry
+        self.pending = []
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(dict(files=self.entries), f, indent=2, sort_keys=True)
+        os.rename(temp_path, self.path)
+
+    def discard(self):
+        """
+        Drop pending file records, so that the files are extracted again.
+        """
+        self.pending = []
@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+
+from marcotti import Marcotti, MarcottiConfig
+from marcotti.models.club import ClubSchema
+from marcotti.etl import ETL, MarcottiTransform, MarcottiEventTransform, MarcottiLoad
+from marcotti.etl.base.transform import MarcottiStatsTransform
+from marcotti.etl.base.load import MarcottiStatLoad
+from marcotti.etl.ecsv.default import CSVExtractor, CSVFrameStatsExtractor
+from marcotti.tools.logsetup import setup_logging
+from marcotti.tools.seasongen import SeasonGenerator, FILES
+
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkConfig(MarcottiConfig):
+    """
+    Configuration of SQLite benchmark database.
+    """
+    DIALECT = 'sqlite'
+
+    def __init__(self, path):
+        self.DBNAME = '/' + os.path.abspath(path)
+
+
+class BenchmarkResult(object):
+    """
+    Stage metrics of the ETL workflows of a benchmark run, with throughput in rows per second.
+    """
+
+    def __init__(self, parameters):
+        self.parameters = parameters
+        self.stages = []
+        self.failures = {}
+
+    def add(self, name, report):
+        for metrics in report.stages.values():
+            record = dict(metrics.as_dict(), workflow=name)
+            rows = metrics.rows_out if metrics.stage == 'extract' else metrics.rows_in
+            record['rows_per_sec'] = rows / metrics.wall_time if metrics.wall_time else None
+            self.stages.append(record)
+
+    def as_dict(self):
+        return dict(parameters=self.parameters, stages=self.stages, failures=self.failures)
+
+    def __str__(self):
+        lines = ["{:<24}{:<10}{:>10}{:>10}{:>14}{:>12}".format(
+            "Workflow", "Stage", "Rows", "Seconds", "Rows/sec", "Statements")]
+        for record in self.stages:
+            rows = record['rows_out'] if record['stage'] == 'extract' else record['rows_in']
+            lines.append("{:<24}{:<10}{:>10}{:>10.3f}{:>14}{:>12}".format(
+                record['workflow'], record['stage'], rows, record['wall_time'],
+                "{:.0f}".format(record['rows_per_sec']) if record['rows_per_sec'] is not None else "-",
+                record['statements']))
+        for name, error in sorted(self.failures.items()):
+            lines.append("{:<24}FAILED: {}".format(name, error))
+        return "\n".join(lines)
+
+
+class ETLBenchmark(object):
+    """
+    Run the full CSV ingestion pipeline against a SQLite database and measure every stage of every data entity.
+
+    Each data entity is loaded in its own session by its own ETL workflow, and file extraction is measured as an
+    additional stage of the workflow.  A workflow that fails is recorded as a failure, and the remaining
+    workflows are run regardless.
+    """
+
+    def __init__(self, data_dir, db_path, supplier=u'Synthetic', start_year=2012, end_year=2013, commit='entity',
+                 unresolved=None):
+        self.data_dir = data_dir
+        self.commit = commit
+        self.unresolved = unresolved
+        self.marcotti = Marcotti(BenchmarkConfig(db_path))
+        self.supplier = supplier
+        self.start_year = start_year
+        self.end_year = end_year
+        self.csv = CSVExtractor(data_dir)
+        self.stats = CSVFrameStatsExtractor(data_dir)
+
+    def extractor(self, entity):
+        return lambda: getattr(self.csv, entity)(FILES[entity])
+
+    def steps(self):
+        """
+        Define ETL workflows of benchmark, in loading order.
+
+        :return: List of tuples of step name, data entity, extraction function, transform and load classes,
+                 and supplier name.
+        """
+        steps = [
+            ('suppliers', 'suppliers', self.extractor('suppliers'), MarcottiTransform, MarcottiLoad, None),
+            ('years', 'years', lambda: self.csv.years(self.start_year, self.end_year), MarcottiTransform,
+             MarcottiLoad, None),
+            ('seasons', 'seasons', lambda: self.csv.seasons(self.start_year, self.end_year), MarcottiTransform,
+             MarcottiLoad, None),
+            ('positions', 'positions', self.extractor('positions'), MarcottiTransform, MarcottiLoad, None),
+        ]
+        steps += [(entity, entity, self.extractor(entity), MarcottiTransform, MarcottiLoad, self.supplier)
+                  for entity in ['countries', 'timezones', 'surfaces']]
+        steps.append(('position_map', 'positions', self.extractor('positions'), MarcottiTransform, MarcottiLoad,
+                      self.supplier))
+        steps += [(entity, entity, self.extractor(entity), MarcottiTransform, MarcottiLoad, self.supplier)
+                  for entity in ['competitions', 'clubs', 'venues', 'players', 'managers', 'referees',
+                                 'league_matches', 'match_lineups']]
+        steps += [(entity, entity, self.extractor(entity), MarcottiEventTransform, MarcottiLoad, self.supplier)
+                  for entity in ['goals', 'penalties', 'bookables', 'substitutions']]
+        steps.append(('player_stats', 'player_stats', lambda: self.stats.player_stats(FILES['statistics']),
+                      MarcottiStatsTransform, MarcottiStatLoad, self.supplier))
+        return steps
+
+    def run(self, parameters=None):
+        """
+        Create database and run all ETL workflows of the benchmark.
+
+        :param parameters: Dictionary of parameters of benchmark run, recorded in the result.
+        :return: :class:`BenchmarkResult` object.
+        """
+        self.marcotti.create_db(ClubSchema)
+        result = BenchmarkResult(parameters or {})
+        for name, entity, extract, transform, load, supplier in self.steps():
+            try:
+                with self.marcotti.create_session() as session:
+                    etl = ETL(transform=transform, load=load, session=session, supplier=supplier,
+                              commit=self.commit, unresolved=self.unresolved)
+                    try:
+                        with etl.report.stage(entity, 'extract', 0) as stage:
+                            data = extract()
+                            stage.rows_out = len(data)
+                        etl.workflow(entity, data)
+                    finally:
+                        etl.close()
+                        result.add(name, etl.report)
+            except Exception as ex:
+                logger.error("{} workflow failed: {!r}".format(name, ex))
+                result.failures[name] = repr(ex)
+        return result
+
+
+def main():
+    """
+    Main benchmark function exposed as script command.
+
+    Exits with status 1 if any ETL workflow of the benchmark fails.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Marcotti ETL on synthetic season data")
+    parser.add_argument('--leagues', type=int, default=1, help="number of leagues")
+    parser.add_argument('--seasons', type=int, default=1, help="number of seasons per league")
+    parser.add_argument('--clubs', type=int, default=20, help="number of clubs per league")
+    parser.add_argument('--squad', type=int, default=25, help="number of players per club")
+    parser.add_argument('--start-year', type=int, default=2012, help="start year of first season")
+    parser.add_argument('--seed', type=int, default=0, help="random seed of data generator")
+    parser.add_argument('--data-dir', help="directory of generated data files, reused if it exists")
+    parser.add_argument('--database', help="path of SQLite database file, replaced if it exists")
+    parser.add_argument('--output', help="path of JSON file to write results to")
+    parser.add_argument('--commit', default='entity',
+                        help="commit policy of loaders: entity, workflow, or number of rows per commit")
+    parser.add_argument('--unresolved', help="path of CSV file to write unresolved lookup keys to")
+    args = parser.parse_args()
+
+    setup_logging()
+    work_dir = tempfile.mkdtemp(prefix='etlbench')
+    try:
+        data_dir = args.data_dir or os.path.join(work_dir, 'data')
+        if not os.path.isdir(data_dir):
+            SeasonGenerator(data_dir, leagues=args.leagues, seasons=args.seasons, clubs=args.clubs,
+                            squad=args.squad, start_year=args.start_year, seed=args.seed).generate()
+        db_path = args.database or os.path.join(work_dir, 'marcotti.db')
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        commit = int(args.commit) if args.commit.isdigit() else args.commit
+        parameters = dict(leagues=args.leagues, seasons=args.seasons, clubs=args.clubs, squad=args.squad,
+                          start_year=args.start_year, seed=args.seed, commit=commit)
+        benchmark = ETLBenchmark(data_dir, db_path, start_year=args.start_year,
+                                 end_year=args.start_year + args.seasons, commit=commit,
+                                 unresolved=args.unresolved)
+        result = benchmark.run(parameters)
+        print(str(result))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(result.as_dict(), f, indent=2, sort_keys=True)
+        if result.failures:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir)
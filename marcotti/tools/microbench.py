@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import date
+from collections import OrderedDict
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.personnel as mcp
+from marcotti.models.common import DeclEnumType
+from marcotti.models.club import ClubSchema
+from marcotti.etl.base.workflows import ETL, WorkflowBase
+from marcotti.etl.ecsv.base import BaseCSV
+from marcotti.tools.logsetup import setup_logging
+
+
+logger = logging.getLogger(__name__)
+
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(func):
+    """
+    Decorator function. Register microbenchmark under the name of the function.
+
+    The function sets up the benchmark and returns the callable that is timed.
+
+    :param func: Setup function without arguments.
+    """
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def time_per_call(stmt, repeat=5, min_time=0.2):
+    """
+    Measure time of a callable per call.
+
+    The number of calls per measurement is increased until a measurement takes at least the minimum time.
+    The best of the repeated measurements is reported.
+
+    :param stmt: Callable without arguments.
+    :param repeat: Number of measurements.
+    :param min_time: Minimum duration of a measurement in seconds.
+    :return: Time per call in seconds.
+    """
+    def measure(number):
+        start = time.time()
+        for _ in xrange(number):
+            stmt()
+        return time.time() - start
+
+    number = 1
+    while measure(number) < min_time:
+        number *= 10
+    return min(measure(number) for _ in range(repeat)) / number
+
+
+def session_with_data():
+    """
+    Create in-memory SQLite session with a season and a player.
+    """
+    session = Session(bind=create_engine('sqlite://'))
+    ClubSchema.metadata.create_all(session.get_bind())
+    country = mco.Countries(name=u"England", confederation=enums.ConfederationType.europe)
+    session.add(mco.Seasons(start_year=mco.Years(yr=2012), end_year=mco.Years(yr=2013)))
+    session.add(mcp.Players(first_name=u"Theo", last_name=u"Walcott", birth_date=date(1989, 3, 16),
+                            country=country, position=mcp.Positions(name=u"Forward",
+                                                                    type=enums.PositionType.forward)))
+    session.commit()
+    return session
+
+
+def person():
+    return mcp.Players(first_name=u"Cristiano", middle_name=u"Ronaldo", last_name=u"dos Santos",
+                       second_last_name=u"Aveiro", birth_date=date(1985, 2, 5), order=enums.NameOrderType.western)
+
+
+@benchmark
+def enum_from_string():
+    return lambda: enums.WeatherConditionType.from_string("Partly Cloudy")
+
+
+@benchmark
+def enum_bind_param():
+    enum_type = DeclEnumType(enums.WeatherConditionType)
+    return lambda: enum_type.process_bind_param(enums.WeatherConditionType.partly_cloudy, None)
+
+
+@benchmark
+def enum_result_value():
+    enum_type = DeclEnumType(enums.WeatherConditionType)
+    return lambda: enum_type.process_result_value("Partly Cloudy ", None)
+
+
+@benchmark
+def person_full_name():
+    record = person()
+    return lambda: record.full_name
+
+
+@benchmark
+def person_official_name():
+    record = person()
+    return lambda: record.official_name
+
+
+@benchmark
+def person_full_name_sql():
+    session = session_with_data()
+    return lambda: session.query(mcp.Players.id).filter(mcp.Players.full_name == u"Theo Walcott").all()
+
+
+@benchmark
+def season_name():
+    season = mco.Seasons(start_year=mco.Years(yr=2012), end_year=mco.Years(yr=2013))
+    return lambda: season.name
+
+
+@benchmark
+def season_name_sql():
+    session = session_with_data()
+    return lambda: session.query(mco.Seasons.id).filter(mco.Seasons.name == "2012-2013").all()
+
+
+@benchmark
+def make_date_object():
+    return lambda: WorkflowBase.make_date_object("2012-08-18")
+
+
+@benchmark
+def csv_columns():
+    extractor = BaseCSV(None)
+    row = {"Name": " Arsenal ", "Level": "1", "Starting": "0", "Latitude": "51.555", "Empty": ""}
+    return lambda: (extractor.column("Empty", **row), extractor.column_unicode("Name", **row),
+                    extractor.column_int("Level", **row), extractor.column_bool("Starting", **row),
+                    extractor.column_float("Latitude", **row))
+
+
+@benchmark
+def combiner_single():
+    data = [dict(remote_id=str(k), name=u"Player {}".format(k), country=u"England") for k in range(1000)]
+    return lambda: ETL.combiner(data)
+
+
+@benchmark
+def combiner_merge():
+    data = [dict(remote_id=str(k), name=u"Player {}".format(k), country=u"England") for k in range(1000)]
+    supplement = [dict(remote_id=str(k), height=1.8, weight=None) for k in range(1000)]
+    return lambda: ETL.combiner(data, supplement)
+
+
+def run(names=None, repeat=5):
+    """
+    Run microbenchmarks.
+
+    :param names: List of benchmark names, or None to run all benchmarks.
+    :param repeat: Number of measurements per benchmark.
+    :return: Ordered dictionary of time per call in seconds, keyed by benchmark name.
+    """
+    results = OrderedDict()
+    for name in names or BENCHMARKS:
+        results[name] = time_per_call(BENCHMARKS[name](), repeat=repeat)
+        logger.info("{}: {:.3g} us per call".format(name, results[name] * 1e6))
+    return results
+
+
+def compare(results, baselines, threshold=0.2):
+    """
+    Compare benchmark results with baselines.
+
+    :param results: Dictionary of time per call, keyed by benchmark name.
+    :param baselines: Dictionary of baseline time per call, keyed by benchmark name.
+    :param threshold: Relative slowdown above which a result is flagged as a regression.
+    :return: List of tuples of benchmark name, baseline, result, ratio to baseline, and regression flag.
+             Baseline and ratio are None for benchmarks without a baseline.
+    """
+    rows = []
+    for name, value in results.items():
+        baseline = baselines.get(name)
+        ratio = value / baseline if baseline else None
+        rows.append((name, baseline, value, ratio, ratio is not None and ratio > 1.0 + threshold))
+    return rows
+
+
+def main():
+    """
+    Main microbenchmark function exposed as script command.
+
+    Results are compared with the baselines in the baseline file, and the command exits with an error status if
+    any benchmark is slower than its baseline by more than the threshold.  Baselines are only meaningful on the
+    machine that recorded them, so no baseline file is distributed with the package.
+    """
+    parser = argparse.ArgumentParser(description="Run Marcotti microbenchmarks and compare them with baselines")
+    parser.add_argument('names', nargs='*', help="benchmarks to run, all if none given")
+    parser.add_argument('--baselines', default='microbench.json', help="path of JSON baseline file")
+    parser.add_argument('--save', action='store_true', help="store results as baselines")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown flagged as regression")
+    parser.add_argument('--repeat', type=int, default=5, help="number of measurements per benchmark")
+    args = parser.parse_args()
+
+    setup_logging()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmarks: {}".format(", ".join(unknown)))
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+    elif not args.save:
+        logger.warning("No baseline file {}: run with --save to record baselines on this machine".format(
+            args.baselines))
+    results = run(args.names, args.repeat)
+    rows = compare(results, baselines, args.threshold)
+    print("{:<24}{:>14}{:>14}{:>10}".format("Benchmark", "Baseline (us)", "Result (us)", "Ratio"))
+    for name, baseline, value, ratio, regression in rows:
+        print("{:<24}{:>14}{:>14.3f}{:>10}{}".format(
+            name, "{:.3f}".format(baseline * 1e6) if baseline else "-", value * 1e6,
+            "{:.2f}".format(ratio) if ratio is not None else "-", "  REGRESSION" if regression else ""))
+    if args.save:
+        baselines.update(results)
+        with open(args.baselines, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print("Saved baselines to {}".format(args.baselines))
+    elif any(regression for _, _, _, _, regression in rows):
+        sys.exit(1)
@@ -0,0 +1,313 @@
+import os
+import csv
+import random
+import logging
+from datetime import date, timedelta
+
+import pkg_resources
+
+from marcotti.models.common import enums
+from marcotti.etl.ecsv.default import CSVFrameStatsExtractor
+
+
+logger = logging.getLogger(__name__)
+
+
+FIRST_NAMES = ['Adam', 'Bruno', 'Carlos', 'David', 'Emil', 'Felipe', 'Gareth', 'Hugo', 'Ivan', 'Jonas',
+               'Karim', 'Luca', 'Marco', 'Nico', 'Oscar', 'Pablo', 'Quinn', 'Rafael', 'Sami', 'Tomas']
+
+SYLLABLES = ['ba', 'ko', 'ri', 'man', 'tel', 'son', 'vi', 'der', 'lo', 'ga', 'nes', 'ru', 'fen', 'do', 'mi', 'sta']
+
+POSITIONS = ['Goalkeeper'] * 3 + ['Defender'] * 8 + ['Midfielder'] * 8 + ['Striker'] * 6
+
+FILES = {
+    'suppliers': ('suppliers.csv',),
+    'countries': ('countries.csv',),
+    'timezones': ('timezones.csv',),
+    'surfaces': ('surfaces.csv',),
+    'positions': ('positions.csv',),
+    'competitions': ('competitions.csv',),
+    'clubs': ('clubs.csv',),
+    'venues': ('venues.csv',),
+    'players': ('players.csv',),
+    'managers': ('managers.csv',),
+    'referees': ('referees.csv',),
+    'league_matches': ('matches', '*.csv'),
+    'match_lineups': ('lineups', '*.csv'),
+    'goals': ('goals', '*.csv'),
+    'penalties': ('penalties', '*.csv'),
+    'bookables': ('bookables', '*.csv'),
+    'substitutions': ('substitutions', '*.csv'),
+    'statistics': ('statistics', '*.csv'),
+}
+
+
+def stat_headers():
+    """
+    Collect the column headers of match statistics files, as read by the statistics extractor.
+
+    :return: Tuple of list of player headers and list of statistics headers.
+    """
+    player_headers = [header for key, header, kind in CSVFrameStatsExtractor.player_columns]
+    stat_fields = []
+    for category in CSVFrameStatsExtractor.categories:
+        for key, header, kind in CSVFrameStatsExtractor.stat_columns[category]:
+            if header not in stat_fields:
+                stat_fields.append(header)
+    return player_headers, stat_fields
+
+
+class SeasonGenerator(object):
+    """
+    Generate synthetic club football data in the CSV formats of the CSV extractors.
+
+    Every league has its own clubs, squads, managers and referees, and plays a double round-robin in each
+    season.  Match data files are written per league and season.  Data are generated from a seeded random
+    number generator, so that the same parameters always produce the same files.
+    """
+
+    def __init__(self, directory, leagues=1, seasons=1, clubs=20, squad=25, start_year=2012, supplier=u'Synthetic',
+                 seed=0):
+        if clubs % 2:
+            raise ValueError("Number of clubs per league must be even")
+        if squad < 20:
+            raise ValueError("Squads must have at least 20 players")
+        self.directory = directory
+        self.leagues = leagues
+        self.seasons = seasons
+        self.clubs = clubs
+        self.squad = squad
+        self.start_year = start_year
+        self.supplier = supplier
+        self.rng = random.Random(seed)
+        self.counts = {}
+        self.remote_id = 0
+        self.person_index = 0
+
+    @property
+    def end_year(self):
+        return self.start_year + self.seasons
+
+    def next_id(self):
+        self.remote_id += 1
+        return str(self.remote_id)
+
+    def person(self, country):
+        """
+        Create a person with a unique full name.
+
+        :param country: Country name.
+        :return: Dictionary of person fields in CSV header format.
+        """
+        index, self.person_index = self.person_index, self.person_index + 1
+        first_name = FIRST_NAMES[index % len(FIRST_NAMES)]
+        index //= len(FIRST_NAMES)
+        syllables = []
+        while True:
+            syllables.append(SYLLABLES[index % len(SYLLABLES)])
+            index //= len(SYLLABLES)
+            if not index:
+                break
+        birth_date = date(1970, 1, 1) + timedelta(days=self.rng.randint(0, 9000))
+        return {"ID": self.next_id(), "First Name": first_name, "Last Name": "".join(syllables).capitalize(),
+                "Name Order": "Western", "Birthdate": birth_date.isoformat(), "Country": country}
+
+    @staticmethod
+    def full_name(person):
+        return "{} {}".format(person["First Name"], person["Last Name"])
+
+    def write(self, entity, headers, rows, *path):
+        """
+        Write rows to CSV data file.
+
+        :param entity: Data entity name.
+        :param headers: List of column headers.
+        :param rows: List of dictionaries keyed by column headers.
+        :param path: Path of data file relative to data directory.
+        """
+        fname = os.path.join(self.directory, *path)
+        if not os.path.isdir(os.path.dirname(fname)):
+            os.makedirs(os.path.dirname(fname))
+        with open(fname, 'wb') as f:
+            writer = csv.DictWriter(f, headers)
+            writer.writeheader()
+            writer.writerows(rows)
+        self.counts[entity] = self.counts.get(entity, 0) + len(rows)
+
+    @staticmethod
+    def reference_data(name):
+        with open(pkg_resources.resource_filename('marcotti', 'data/{}.csv'.format(name))) as f:
+            return list(csv.DictReader(f))
+
+    def generate(self):
+        """
+        Write all data files.
+
+        :return: Dictionary of numbers of rows generated per data entity.
+        """
+        countries = [row for row in self.reference_data('countries') if row['confederation'] == 'UEFA']
+        timezones = self.reference_data('timezones')
+        surfaces = self.reference_data('surfaces')
+        self.write('suppliers', ["Name"], [{"Name": self.supplier}], *FILES['suppliers'])
+        self.write('countries', ["ID", "Name", "Code", "Confederation"],
+                   [{"ID": self.next_id(), "Name": row['name'], "Code": row['code'],
+                     "Confederation": row['confederation']} for row in countries], *FILES['countries'])
+        self.write('timezones', ["Name", "Confederation", "Offset"],
+                   [{"Name": row['name'], "Confederation": row['confederation'], "Offset": row['offset']}
+                    for row in timezones], *FILES['timezones'])
+        self.write('surfaces', ["Description", "Type"],
+                   [{"Description": row['description'], "Type": row['type']} for row in surfaces], *FILES['surfaces'])
+        positions = [{"ID": self.next_id(), "Name": row['name'], "Type": row['type']}
+                     for row in self.reference_data('positions')]
+        self.write('positions', ["ID", "Name", "Type"], positions, *FILES['positions'])
+
+        leagues = [self.league(number, self.rng.choice(countries)['name'], timezones, surfaces)
+                   for number in range(1, self.leagues + 1)]
+        self.write('competitions', ["ID", "Name", "Level", "Country", "Confederation"],
+                   [league['competition'] for league in leagues], *FILES['competitions'])
+        self.write('clubs', ["ID", "Name", "Short Name", "Country"],
+                   [club for league in leagues for club in league['clubs']], *FILES['clubs'])
+        self.write('venues', ["ID", "Venue Name", "City", "Region", "Country", "Timezone", "Latitude", "Longitude",
+                              "Altitude", "Config Date", "Surface", "Length", "Width", "Capacity", "Seats"],
+                   [venue for league in leagues for venue in league['venues']], *FILES['venues'])
+        person_headers = ["ID", "First Name", "Known First Name", "Middle Name", "Last Name", "Second Last Name",
+                          "Nickname", "Name Order", "Birthdate", "Country"]
+        self.write('players', person_headers + ["Position", "Effective Date", "Height", "Weight"],
+                   [player for league in leagues for squad in league['squads'] for player in squad],
+                   *FILES['players'])
+        self.write('managers', person_headers, [manager for league in leagues for manager in league['managers']],
+                   *FILES['managers'])
+        self.write('referees', person_headers, [referee for league in leagues for referee in league['referees']],
+                   *FILES['referees'])
+
+        player_headers, stat_fields = stat_headers()
+        for league in leagues:
+            for yr in range(self.start_year, self.end_year):
+                self.season(league, yr, player_headers, stat_fields)
+        logger.info("Generated {}".format(", ".join(
+            "{} {}".format(rows, entity) for entity, rows in sorted(self.counts.items()))))
+        return self.counts
+
+    def league(self, number, country, timezones, surfaces):
+        """
+        Create competition, clubs, venues, squads, managers and referees of a league.
+        """
+        name = "League {:02d}".format(number)
+        clubs, venues, squads, managers = [], [], [], []
+        for index in range(1, self.clubs + 1):
+            club_name = "{} Club {:02d}".format(name, index)
+            clubs.append({"ID": self.next_id(), "Name": club_name, "Short Name": "L{:02d}C{:02d}".format(number, index),
+                          "Country": country})
+            capacity = self.rng.randint(10000, 80000)
+            venues.append({"ID": self.next_id(), "Venue Name": "{} Stadium".format(club_name),
+                           "City": "City {:02d}-{:02d}".format(number, index), "Region": "",
+                           "Country": country, "Timezone": self.rng.choice(timezones)['name'],
+                           "Latitude": round(self.rng.uniform(36.0, 60.0), 4),
+                           "Longitude": round(self.rng.uniform(-9.0, 30.0), 4), "Altitude": self.rng.randint(0, 800),
+                           "Config Date": "1990-07-01", "Surface": self.rng.choice(surfaces)['description'],
+                           "Length": 105, "Width": 68, "Capacity": capacity, "Seats": capacity})
+            squad = []
+            for position in (POSITIONS * (self.squad // len(POSITIONS) + 1))[:self.squad]:
+                player = self.person(country)
+                player.update({"Position": position, "Effective Date": "{}-07-01".format(self.start_year),
+                               "Height": round(self.rng.uniform(1.65, 1.98), 2), "Weight": self.rng.randint(60, 95)})
+                squad.append(player)
+            squads.append(squad)
+            managers.append(self.person(country))
+        referees = [self.person(country) for _ in range(self.clubs // 2 + 2)]
+        competition = {"ID": self.next_id(), "Name": name, "Level": 1, "Country": country, "Confederation": ""}
+        return dict(name=name, competition=competition, clubs=clubs, venues=venues, squads=squads,
+                    managers=managers, referees=referees)
+
+    def fixtures(self):
+        """
+        Schedule double round-robin of clubs by the circle method.
+
+        :return: List of matchdays, each a list of pairs of home and away club indexes.
+        """
+        order = list(range(self.clubs))
+        rounds = []
+        for _ in range(self.clubs - 1):
+            rounds.append([(order[k], order[-1 - k]) if len(rounds) % 2 else (order[-1 - k], order[k])
+                           for k in range(self.clubs // 2)])
+            order = [order[0]] + [order[-1]] + order[1:-1]
+        return rounds + [[(away, home) for home, away in matchday] for matchday in rounds]
+
+    def season(self, league, yr, player_headers, stat_fields):
+        """
+        Write matches, lineups, events and statistics of a league season.
+        """
+        season = "{}-{}".format(yr, yr + 1)
+        name = self.full_name
+        matches, lineups, goals, penalties, bookables, substitutions, stats = [], [], [], [], [], [], []
+        weather = [value for value in enums.WeatherConditionType.values()]
+        for matchday, pairs in enumerate(self.fixtures(), start=1):
+            match_date = date(yr, 8, 1) + timedelta(days=7 * (matchday - 1))
+            for home, away in pairs:
+                match_id = self.next_id()
+                matches.append({"ID": match_id, "Competition": league['name'], "Season": season,
+                                "Match Date": match_date.isoformat(), "KO Time": "15:00", "Matchday": matchday,
+                                "Venue": league['venues'][home]["Venue Name"],
+                                "Home Team": league['clubs'][home]["Name"],
+                                "Away Team": league['clubs'][away]["Name"],
+                                "Home Manager": name(league['managers'][home]),
+                                "Away Manager": name(league['managers'][away]),
+                                "Referee": name(self.rng.choice(league['referees'])),
+                                "Attendance": self.rng.randint(5000, league['venues'][home]["Capacity"]),
+                                "KO Temp": round(self.rng.uniform(-5.0, 30.0), 1),
+                                "KO Humidity": round(self.rng.uniform(20.0, 95.0), 1),
+                                "1st Half": self.rng.randint(0, 4), "2nd Half": self.rng.randint(0, 6),
+                                "KO Wx": self.rng.choice(weather), "HT Wx": self.rng.choice(weather),
+                                "FT Wx": self.rng.choice(weather)})
+                for team, opponent, locale in [(home, away, "Home"), (away, home, "Away")]:
+                    club = league['clubs'][team]["Name"]
+                    squad = league['squads'][team]
+                    players = [squad[0]] + self.rng.sample(squad[3:], 17)
+                    starters, bench = players[:11], players[11:]
+                    for index, player in enumerate(players):
+                        lineups.append({"Match ID": match_id, "Player's Team": club, "Player": name(player),
+                                        "Starting": int(index < 11), "Captain": int(index == 1)})
+                    subs = list(zip(self.rng.sample(starters[1:], 3), bench[:3]))
+                    for out_player, in_player in subs:
+                        substitutions.append({"Match ID": match_id, "Player In": name(in_player),
+                                              "Player Out": name(out_player), "Time": self.rng.randint(46, 89),
+                                              "Stoppage": 0})
+                    on_pitch = starters + [in_player for _, in_player in subs]
+                    for _ in range(self.rng.randint(0, 3)):
+                        goals.append({"Match ID": match_id, "Scoring Team": club,
+                                      "Player": name(self.rng.choice(on_pitch[1:])),
+                                      "Event": self.rng.choice(enums.ShotEventType.values()),
+                                      "Bodypart": self.rng.choice(["Left foot", "Right foot", "Head"]),
+                                      "Time": self.rng.randint(1, 90), "Stoppage": 0})
+                    if self.rng.random() < 0.1:
+                        penalties.append({"Match ID": match_id, "Player": name(self.rng.choice(on_pitch[1:])),
+                                          "Foul": self.rng.choice(enums.FoulEventType.values()),
+                                          "Outcome": self.rng.choice(["Goal", "Save", "Wide of post"]),
+                                          "Time": self.rng.randint(1, 90), "Stoppage": 0})
+                    for _ in range(self.rng.randint(0, 3)):
+                        bookables.append({"Match ID": match_id, "Player": name(self.rng.choice(on_pitch)),
+                                          "Foul": self.rng.choice(enums.FoulEventType.values()),
+                                          "Card": self.rng.choice(["Yellow", "Yellow", "Yellow", "Red"]),
+                                          "Time": self.rng.randint(1, 90), "Stoppage": 0})
+                    for player in on_pitch:
+                        row = {field: int(self.rng.random() * 4) for field in stat_fields}
+                        row.update(zip(player_headers, [player["ID"], league['clubs'][team]["ID"],
+                                                        league['clubs'][opponent]["ID"], match_date.isoformat(),
+                                                        locale]))
+                        stats.append(row)
+        fname = "{}-{}.csv".format(league['name'].lower().replace(" ", ""), yr)
+        self.write('league_matches', ["ID", "Competition", "Season", "Match Date", "KO Time", "Matchday", "Venue",
+                                      "Home Team", "Away Team", "Home Manager", "Away Manager", "Referee",
+                                      "Attendance", "KO Temp", "KO Humidity", "1st Half", "2nd Half",
+                                      "KO Wx", "HT Wx", "FT Wx"], matches, 'matches', fname)
+        self.write('match_lineups', ["Match ID", "Player's Team", "Player", "Starting", "Captain"], lineups,
+                   'lineups', fname)
+        self.write('goals', ["Match ID", "Scoring Team", "Player", "Event", "Bodypart", "Time", "Stoppage"], goals,
+                   'goals', fname)
+        self.write('penalties', ["Match ID", "Player", "Foul", "Outcome", "Time", "Stoppage"], penalties,
+                   'penalties', fname)
+        self.write('bookables', ["Match ID", "Player", "Foul", "Card", "Time", "Stoppage"], bookables,
+                   'bookables', fname)
+        self.write('substitutions', ["Match ID", "Player In", "Player Out", "Time", "Stoppage"], substitutions,
+                   'substitutions', fname)
+        self.write('statistics', player_headers + stat_fields, stats, 'statistics', fname)
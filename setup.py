@@ -20,6 +20,8 @@ setup(
         'console_scripts': [
             'dbsetup = marcotti.tools.dbsetup:main',
             'testsetup = marcotti.tools.testsetup:main',
+            'etlbench = marcotti.tools.etlbench:main',
+            'microbench = marcotti.tools.microbench:main',
         ]
     },
     url='https://github.com/soccermetrics/marcotti',
@@ -4,11 +4,36 @@
 from datetime import date, time
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 
 import marcotti.models.common.enums as enums
 import marcotti.models.common.overview as mco
 import marcotti.models.common.personnel as mcp
 import marcotti.models.club as mc
+import marcotti.models.common.suppliers as mcs
+from marcotti.models.club import ClubSchema
+from marcotti.etl.base.metrics import StatementCounter
+
+
+@pytest.fixture
+def etl_session():
+    """Session on an in-memory SQLite club database with one data supplier, for ETL tests."""
+    engine = create_engine('sqlite://')
+    ClubSchema.metadata.create_all(engine)
+    session = Session(bind=engine)
+    session.add(mcs.Suppliers(name=u"Supplier"))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def round_trips(etl_session):
+    """Function that returns the number of database round trips made in the ETL session so far."""
+    counter = StatementCounter.attach(etl_session.get_bind())
+    return lambda: counter.snapshot()[0]
 
 
 @pytest.fixture
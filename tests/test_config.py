@@ -0,0 +1,60 @@
+# coding=utf-8
+import pytest
+from sqlalchemy import create_engine
+
+from marcotti import Marcotti, MarcottiConfig
+
+
+class PooledConfig(MarcottiConfig):
+    POOL_SIZE = 10
+    MAX_OVERFLOW = 5
+    POOL_RECYCLE = 3600
+    POOL_PRE_PING = True
+
+
+class PostgresConfig(PooledConfig):
+    DIALECT = 'postgresql'
+    DBUSER = 'marcotti'
+    DBPASSWD = 'secret'
+    HOSTNAME = 'localhost'
+    PORT = 5432
+    DBNAME = 'marcotti'
+
+
+class SqliteConfig(PooledConfig):
+    DIALECT = 'sqlite'
+
+    def __init__(self, path):
+        self.DBNAME = '/' + path
+
+
+def test_config_postgresql_pool_options():
+    """Config 001: Pool size and overflow settings are passed to the engine of a PostgreSQL database."""
+    assert PostgresConfig().engine_options == dict(pool_size=10, max_overflow=5, pool_recycle=3600,
+                                                   pool_pre_ping=True)
+
+
+def test_config_postgresql_engine_pool():
+    """Config 002: The engine of a PostgreSQL database has a connection pool of the configured size."""
+    pytest.importorskip('psycopg2')
+    config = PostgresConfig()
+    engine = create_engine(config.database_uri, **config.engine_options)
+    assert engine.pool.size() == 10
+    assert engine.pool._max_overflow == 5
+
+
+def test_config_sqlite_pool_options(tmpdir):
+    """Config 003: Pool size and overflow settings are not passed to the engine of a SQLite database."""
+    config = SqliteConfig(str(tmpdir.join('marcotti.db')))
+    assert config.engine_options == dict(pool_recycle=3600, pool_pre_ping=True)
+    marcotti = Marcotti(config)
+    with marcotti.create_session() as session:
+        assert session.execute("SELECT 1").scalar() == 1
+
+
+def test_config_default_pool_options():
+    """Config 004: Unset pool settings leave the pool defaults of the database dialect."""
+    config = PostgresConfig()
+    config.POOL_SIZE = config.MAX_OVERFLOW = config.POOL_RECYCLE = None
+    config.POOL_PRE_PING = False
+    assert config.engine_options == {}
@@ -0,0 +1,78 @@
+# coding=utf-8
+from sqlalchemy import Boolean, func, select
+
+import marcotti.models.club as mc
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.personnel as mcp
+import marcotti.models.common.statistics as stats
+import marcotti.models.common.suppliers as mcs
+from marcotti.etl import ELT
+from marcotti.etl.base.load import MarcottiStatLoad
+
+
+def add_references(session):
+    country = mco.Countries(name=u"England", confederation=enums.ConfederationType.europe)
+    years = [mco.Years(yr=2012), mco.Years(yr=2013)]
+    session.add_all([country, mcp.Positions(name=u"Forward", type=enums.PositionType.forward)] + years)
+    session.flush()
+    session.add_all([mco.Seasons(start_year=years[0], end_year=years[1]),
+                     mco.DomesticCompetitions(name=u"League", level=1, country_id=country.id)])
+    session.commit()
+
+
+def player(n):
+    return dict(remote_id=str(n), first_name=u"First{}".format(n), last_name=u"Last", name_order="Western",
+                dob="1990-01-01", country=u"England", position_name=u"Forward")
+
+
+def stat(n, team, opponent, locale, **fields):
+    return dict(dict(remote_player_id=str(n), remote_player_team_id=team, remote_opposing_team_id=opponent,
+                     match_date="2012-08-01", locale=locale), **fields)
+
+
+def entity_data():
+    return [
+        ('clubs', [dict(remote_id="1", name=u"Club A", country=u"England"),
+                   dict(remote_id="2", name=u"Club B", country=u"England")]),
+        ('players', [player(n) for n in range(11, 15)]),
+        ('league_matches', [dict(remote_id="100", competition=u"League", season="2012-2013", date="2012-08-01",
+                                 matchday=1, home_team=u"Club A", away_team=u"Club B", attendance=1000)]),
+        ('match_lineups', [dict(remote_match_id="100", player_team=u"Club A" if n < 13 else u"Club B",
+                                player_name=u"First{} Last".format(n), starter=True, captain=n == 11)
+                           for n in range(11, 15)]),
+        ('player_stats', (batch for batch in [
+            [stat(11, "1", "2", "Home", **{'assists.total': 1}), stat(12, "1", "2", "Home")],
+            [stat(13, "2", "1", "Away", **{'assists.total': 2, 'discipline.yellows': 1}),
+             stat(14, "2", "1", "Away", **{'discipline.reds': 1, 'discipline.yellows': 0})]
+        ]))
+    ]
+
+
+def test_elt_staged_workflows(etl_session):
+    """ELT 001: Staged data entities are loaded once, however many times they are staged."""
+    add_references(etl_session)
+    models = [mc.Clubs, mc.ClubMap, mcp.Persons, mcp.Players, mcs.PlayerMap, mc.ClubLeagueMatches, mcs.MatchMap,
+              mc.ClubMatchLineups, stats.Assists, stats.Discipline]
+    expected = [2, 2, 4, 4, 4, 1, 1, 4, 2, 2]
+    for _ in range(2):
+        elt = ELT(etl_session, u"Supplier")
+        for entity, data in entity_data():
+            elt.workflow(entity, data)
+            table = elt.staging.table(entity, elt.staged_fields[entity], elt.resolved_columns[entity])
+            assert etl_session.execute(select([func.count()]).select_from(table)).scalar() == 0
+        assert [etl_session.query(model).count() for model in models] == expected
+    lineup_id = etl_session.query(mc.ClubMatchLineups.id).join(mcp.Players).filter(
+        mcp.Players.first_name == u"First13").scalar()
+    assert etl_session.query(stats.Assists.total).filter_by(lineup_id=lineup_id).scalar() == 2
+    assert etl_session.query(stats.Discipline.yellows).filter_by(lineup_id=lineup_id).scalar() == 1
+
+
+def test_elt_staging_schema(etl_session):
+    """ELT 002: Staging tables have the declared fields of a data entity, whatever fields the first batch has."""
+    elt = ELT(etl_session, u"Supplier")
+    table = elt.staging.load('player_stats', [stat(11, "1", "2", "Home")], elt.supplier_id,
+                             elt.staged_fields['player_stats'], elt.resolved_columns['player_stats'])
+    for category, (model, fields) in MarcottiStatLoad.stat_models.items():
+        assert all('{}.{}'.format(category, field) in table.c for field in fields)
+    assert isinstance(table.c['gk_allowed_goals.is_cleansheet'].type, Boolean)
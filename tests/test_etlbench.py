@@ -0,0 +1,24 @@
+# coding=utf-8
+import marcotti.models.club as mc
+import marcotti.models.common.events as mce
+import marcotti.models.common.personnel as mcp
+import marcotti.models.common.statistics as stats
+from marcotti.tools.etlbench import ETLBenchmark
+from marcotti.tools.seasongen import SeasonGenerator
+
+
+def test_etlbench_generated_season(tmpdir):
+    """Bench 001: Every data entity of a generated season loads without failure."""
+    data_dir = str(tmpdir.join('data'))
+    counts = SeasonGenerator(data_dir, clubs=4, squad=20).generate()
+    benchmark = ETLBenchmark(data_dir, str(tmpdir.join('marcotti.db')))
+    result = benchmark.run()
+    assert result.failures == {}
+    models = [('clubs', mc.Clubs), ('players', mcp.Players), ('league_matches', mc.ClubLeagueMatches),
+              ('match_lineups', mc.ClubMatchLineups), ('goals', mc.ClubGoals), ('penalties', mce.Penalties),
+              ('bookables', mce.Bookables), ('substitutions', mce.Substitutions)]
+    with benchmark.marcotti.create_session() as session:
+        assert [session.query(model).count() for _, model in models] == [counts[entity] for entity, _ in models]
+        assert session.query(mc.ClubGoals).filter(mc.ClubGoals.lineup_id.is_(None)).count() == 0
+        assert session.query(stats.Assists).count() > 0
+        assert session.query(stats.Assists).filter(stats.Assists.lineup_id.is_(None)).count() == 0
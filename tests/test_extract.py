@@ -0,0 +1,112 @@
+# coding=utf-8
+import csv
+import glob
+import json
+
+import pytest
+
+from marcotti.etl.ecsv import CSVExtractor, CSVStatsExtractor, CSVFrameStatsExtractor
+from marcotti.etl.ejson.default import JSONExtractor
+from marcotti.etl.ejson.base import extract
+
+
+class JSONCountryExtractor(JSONExtractor):
+
+    @extract
+    def countries(self, *args, **kwargs):
+        return [dict(remote_id=keys["ID"], name=keys["Name"]) for keys in kwargs.get('data')]
+
+
+def stat_headers():
+    columns = CSVStatsExtractor.player_columns + [column for columns in CSVStatsExtractor.stat_columns.values()
+                                                  for column in columns]
+    return [header for _, header, _ in columns], dict((header, kind) for _, header, kind in columns)
+
+
+def write_countries(tmpdir, name, ids):
+    tmpdir.join(name).write("ID,Name,Code,Confederation\n" +
+                            "".join("{0},Country {0},C{0},UEFA\n".format(k) for k in ids))
+
+
+def write_stats(tmpdir, name, rows):
+    """
+    Write statistics CSV file with every column header of the column spec, and one line per row number.
+
+    Cells are blank in a rotating pattern, so that every column has blank cells, and player fields are
+    padded with spaces.
+    """
+    headers, kinds = stat_headers()
+    with open(str(tmpdir.join(name)), 'wb') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for n in rows:
+            writer.writerow(["" if (n + k) % 4 == 0 else
+                             " {}-{} ".format(n, k) if kinds[header] == 'str' else
+                             str((n + k) % 2) if kinds[header] == 'bool' else str((n * k) % 7)
+                             for k, header in enumerate(headers)])
+    return headers
+
+
+def test_extract_stats_columnar_match_rows(tmpdir):
+    """Extract 001: Columnar and row-wise extraction of statistics produce the same records."""
+    headers = write_stats(tmpdir, 'stats.csv', range(1, 9))
+    row_wise, columnar = CSVStatsExtractor(str(tmpdir)), CSVFrameStatsExtractor(str(tmpdir))
+    records = row_wise.player_stats(('stats.csv',))
+    assert columnar.player_stats(('stats.csv',)) == records
+    for category in CSVStatsExtractor.categories:
+        assert getattr(columnar, category)(('stats.csv',)) == getattr(row_wise, category)(('stats.csv',))
+    assert len(records) == 8
+    assert all(len(record) == len(headers) for record in records)
+
+    def cell(n, header):
+        k = headers.index(header)
+        return None if (n + k) % 4 == 0 else (n * k) % 7
+
+    for n, record in enumerate(records, start=1):
+        assert record['pass_totals.important_passes'] == cell(n, "Key Passes")
+        assert record['pass_directions.left_side'] == cell(n, "Pass Left")
+        assert record['corners.total'] == cell(n, "Corners Taken incl short corners")
+        assert record['touch_locations.final_third'] == cell(n, "Touches open play final third")
+        k = headers.index("Team Id")
+        assert record['remote_player_team_id'] == (None if (n + k) % 4 == 0 else "{}-{}".format(n, k))
+    assert set(record['gk_allowed_goals.is_cleansheet'] for record in records) == {True, False}
+    assert any(record['corners.total'] is None for record in records)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 12])
+@pytest.mark.parametrize('extractor,method,prefix', [
+    (CSVExtractor, 'countries', 'countries_*.csv'),
+    (CSVStatsExtractor, 'player_stats', 'stats_*.csv'),
+    (CSVFrameStatsExtractor, 'player_stats', 'stats_*.csv')])
+def test_extract_chunks_match_files(tmpdir, extractor, method, prefix, chunk_size):
+    """Extract 002: Chunked extraction yields the records of unchunked extraction, in order, in full chunks."""
+    write_countries(tmpdir, 'countries_a.csv', range(1, 6))
+    write_countries(tmpdir, 'countries_b.csv', range(6, 9))
+    write_stats(tmpdir, 'stats_a.csv', range(1, 6))
+    write_stats(tmpdir, 'stats_b.csv', range(6, 9))
+    records = getattr(extractor(str(tmpdir)), method)((prefix,))
+    chunks = list(getattr(extractor(str(tmpdir), chunk_size=chunk_size), method)((prefix,)))
+    assert len(records) == 8
+    assert [record for chunk in chunks for record in chunk] == records
+    sizes = [chunk_size] * (8 // chunk_size) + ([8 % chunk_size] if 8 % chunk_size else [])
+    assert [len(chunk) for chunk in chunks] == sizes
+
+
+@pytest.mark.parametrize('extractor,method,prefix', [
+    (CSVExtractor, 'countries', 'countries_*.csv'),
+    (CSVFrameStatsExtractor, 'player_stats', 'stats_*.csv'),
+    (JSONCountryExtractor, 'countries', 'countries_*.json')])
+def test_extract_workers_match_serial(tmpdir, extractor, method, prefix):
+    """Extract 003: Parallel extraction yields the records of serial extraction, in the order of the files."""
+    for n in range(4):
+        ids = range(10 * n, 10 * n + n + 2)
+        write_countries(tmpdir, 'countries_{}.csv'.format(n), ids)
+        write_stats(tmpdir, 'stats_{}.csv'.format(n), ids)
+        tmpdir.join('countries_{}.json'.format(n)).write(json.dumps([dict(ID=str(k), Name="Country {}".format(k))
+                                                                   for k in ids]))
+    fnames = glob.glob(str(tmpdir.join(prefix)))
+    serial = getattr(extractor(str(tmpdir)), method)
+    records = serial((prefix,))
+    assert len(records) == 14
+    assert records == [record for fname in fnames for record in serial((fname,))]
+    assert getattr(extractor(str(tmpdir), workers=2), method)((prefix,)) == records
@@ -0,0 +1,228 @@
+# coding=utf-8
+import itertools
+import logging
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import event, select
+
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.personnel as mcp
+import marcotti.models.common.statistics as stats
+import marcotti.models.common.suppliers as mcs
+from marcotti.etl.base.load import MarcottiLoad, MarcottiStatLoad
+
+
+@pytest.mark.parametrize('commit', ['entity', 'workflow', 1, 500])
+def test_load_commit_policy(etl_session, commit):
+    """Load 001: Commit policies are an entity, a workflow, or a positive number of rows."""
+    assert MarcottiLoad(etl_session, u"Supplier", commit=commit).commit_policy == commit
+
+
+@pytest.mark.parametrize('commit', [True, False, 0, -10, 'batch', None])
+def test_load_invalid_commit_policy(etl_session, commit):
+    """Load 002: Booleans, non-positive row counts, and unknown policies are rejected."""
+    with pytest.raises(ValueError):
+        MarcottiLoad(etl_session, u"Supplier", commit=commit)
+
+
+def test_load_commit_row_count(etl_session):
+    """Load 011: Under a commit policy of N rows, batches larger than N rows are committed every N rows."""
+    commits = []
+
+    @event.listens_for(etl_session, 'before_commit')
+    def committed_rows(session):
+        if not session.transaction.nested:
+            commits.append(session.query(mco.Countries).count())
+
+    def countries(ids):
+        return pd.DataFrame([dict(remote_id=str(k), name=u"Country {}".format(k), code=u"C{}".format(k),
+                                  confederation=enums.ConfederationType.europe) for k in ids])
+
+    loader = MarcottiLoad(etl_session, u"Supplier", commit=2)
+    loader.load('countries', countries(range(5)))
+    assert commits == [2, 4]
+    loader.load('countries', countries(range(5, 8)))
+    assert commits == [2, 4, 6, 8]
+    loader.finish()
+    assert commits == [2, 4, 6, 8, 8]
+
+
+def person(n, **fields):
+    return dict(dict(first_name=u"First{}".format(n), last_name=u"Last{}".format(n), birth_date=date(1990, 1, 1)),
+                **fields)
+
+
+def add_players(session, *persons):
+    players = [mcp.Players(**person_dict) for person_dict in persons]
+    session.add_all(players)
+    session.commit()
+    return [player.id for player in players]
+
+
+def player_maps(session):
+    return sorted((rec.id, rec.remote_id) for rec in session.query(mcs.PlayerMap))
+
+
+def test_load_record_ids_lowest(etl_session):
+    """Load 003: Record IDs are the lowest IDs of the records that match the conditions, in condition order."""
+    first, second, other = add_players(etl_session, person(1), person(1), person(2))
+    loader = MarcottiLoad(etl_session, u"Supplier")
+    conditions = [dict(first_name=u"First2"), dict(first_name=u"First1", last_name=u"Last1"),
+                  dict(first_name=u"First3"), dict(first_name=u"First1")]
+    assert loader.record_ids(mcp.Players, conditions) == [other, first, None, first]
+
+
+def test_load_upsert_maps_duplicates(etl_session):
+    """Load 004: Supplier mapping records that are already in the mapping table are skipped."""
+    first, second = add_players(etl_session, person(1), person(2))
+    loader = MarcottiLoad(etl_session, u"Supplier")
+    loader.upsert_maps(mcs.PlayerMap, [(first, u"11"), (first, u"11"), (None, u"99"), (second, None)])
+    assert player_maps(etl_session) == [(first, 11)]
+    loader.upsert_maps(mcs.PlayerMap, [(first, u"11"), (second, u"12")])
+    assert player_maps(etl_session) == [(first, 11), (second, 12)]
+
+
+def test_load_persons_partitions(etl_session):
+    """Load 005: Persons are matched by supplier mapping, then by their fields, and otherwise inserted."""
+    mapped, existing = add_players(etl_session, person(1), person(2))
+    loader = MarcottiLoad(etl_session, u"Supplier")
+    loader.upsert_maps(mcs.PlayerMap, [(mapped, u"11")])
+    person_dicts = [person(3), person(1, last_name=u"Renamed"), person(2)]
+    ids = loader.load_persons(mcp.Players, mcs.PlayerMap, person_dicts, [u"13", u"11", u"12"])
+    etl_session.commit()
+    new = ids[0]
+    assert ids == [new, mapped, existing]
+    assert new not in (mapped, existing)
+    assert etl_session.query(mcp.Players).count() == 3
+    assert etl_session.query(mcp.Players.last_name).filter_by(id=mapped).scalar() == u"Renamed"
+    assert player_maps(etl_session) == sorted([(mapped, 11), (existing, 12), (new, 13)])
+    assert loader.load_persons(mcp.Players, mcs.PlayerMap, person_dicts, [u"13", u"11", u"12"]) == ids
+    assert etl_session.query(mcp.Players).count() == 3
+
+
+@pytest.fixture
+def updates(etl_session):
+    """List of tuples of UPDATE statement and parameter sets executed in the ETL session."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('UPDATE'):
+            executed.append((' '.join(statement.split()), sorted(parameters if executemany else [parameters])))
+
+    engine = etl_session.get_bind()
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_update_persons_unchanged(etl_session, updates):
+    """Load 006: Persons whose incoming fields equal the database records are not updated."""
+    ids = add_players(etl_session, person(1), person(2, country_id=None))
+    loader = MarcottiLoad(etl_session, u"Supplier")
+    unchanged = {ids[0]: person(1), ids[1]: dict(person(2), birth_date=u"1990-01-01", country_id=None)}
+    assert loader.update_persons(mcp.Players, unchanged) == 0
+    assert updates == []
+
+
+def test_update_persons_changed_fields(etl_session, updates):
+    """Load 007: Only the fields that differ are written, with one UPDATE per table and set of changed fields."""
+    position = mcp.Positions(name=u"Forward", type=enums.PositionType.forward)
+    etl_session.add(position)
+    ids = add_players(etl_session, person(1), person(2), person(3), person(4))
+    person_ids = dict(etl_session.query(mcp.Players.id, mcp.Players.person_id))
+    loader = MarcottiLoad(etl_session, u"Supplier")
+    changes = {
+        ids[0]: person(1, last_name=u"Renamed"),
+        ids[1]: person(2, last_name=u"Renamed", position_id=position.id),
+        ids[2]: person(3, position_id=None),
+        ids[3]: person(4, last_name=u"Renamed"),
+    }
+    assert loader.update_persons(mcp.Players, changes) == 3
+    assert sorted(updates) == [
+        ("UPDATE persons SET last_name=? WHERE persons.person_id = ?",
+         [(u"Renamed", person_ids[ids[0]]), (u"Renamed", person_ids[ids[1]]), (u"Renamed", person_ids[ids[3]])]),
+        ("UPDATE players SET position_id=? WHERE players.id = ?", [(position.id, ids[1])]),
+    ]
+    assert etl_session.query(mcp.Players).filter_by(last_name=u"Renamed", position_id=position.id).count() == 1
+
+
+class BlockLoad(MarcottiLoad):
+    """Loader that allocates blocks of IDs counted from the start values of the sequences, as PostgreSQL would."""
+
+    can_allocate_ids = True
+
+    def __init__(self, *args, **kwargs):
+        super(BlockLoad, self).__init__(*args, **kwargs)
+        self.sequences = {}
+
+    def allocate_ids(self, table, count):
+        sequence = list(table.primary_key)[0].default
+        values = self.sequences.setdefault(sequence.name, itertools.count(sequence.start))
+        return [next(values) for _ in range(count)]
+
+
+def test_load_model_ids(etl_session):
+    """Load 008: Sequence IDs are allocated per mapped table, and shared with the columns that refer to them."""
+    loader = BlockLoad(etl_session, u"Supplier")
+    persons, players = mcp.Persons.__table__, mcp.Players.__table__
+    assert loader.model_tables(mcp.Players) == [persons, players]
+    loader.allocate_ids(persons, 5)
+    ids = loader.model_ids(mcp.Players, 3)
+    assert ids == {persons.c.person_id: [100005, 100006, 100007], players.c.id: [100000, 100001, 100002],
+                   players.c.person_id: [100005, 100006, 100007]}
+
+
+def test_load_table_rows(etl_session):
+    """Load 009: Records are split into rows of each mapped table, with IDs, defaults and the discriminator."""
+    loader = BlockLoad(etl_session, u"Supplier")
+    persons, players = mcp.Persons.__table__, mcp.Players.__table__
+    ids = {persons.c.person_id: [7, 8], players.c.id: [3, 4], players.c.person_id: [7, 8]}
+    records = [person(1, order=enums.NameOrderType.eastern), person(2, position_id=10)]
+    (person_table, person_columns, person_rows), (player_table, player_columns, player_rows) = \
+        loader.table_rows(mcp.Players, records, ids)
+    assert (person_table, player_table) == (persons, players)
+    assert [dict(zip(person_columns, row)) for row in person_rows] == [
+        dict(person_id=7, type='players', order=enums.NameOrderType.eastern, **person(1)),
+        dict(person_id=8, type='players', order=enums.NameOrderType.western, **person(2))]
+    assert [dict(zip(player_columns, row)) for row in player_rows] == [
+        dict(id=3, person_id=7, position_id=None), dict(id=4, person_id=8, position_id=10)]
+
+
+@pytest.mark.parametrize('loader_class', [MarcottiLoad, BlockLoad])
+def test_load_insert_records(etl_session, loader_class):
+    """Load 010: Inserted records are linked across their mapped tables, and their IDs are in record order."""
+    add_players(etl_session, person(0))
+    loader = loader_class(etl_session, u"Supplier")
+    loader.insert_chunk_size = 2
+    records = [person(n, position_id=None) for n in [5, 3, 4, 1, 2]]
+    assert loader.can_allocate_ids == (loader_class is BlockLoad)
+    ids = loader.insert_records(mcp.Players, records)
+    etl_session.commit()
+    assert len(set(ids)) == 5
+    persons, players = mcp.Persons.__table__, mcp.Players.__table__
+    names = dict(etl_session.execute(select([players.c.id, persons.c.first_name]).where(
+        persons.c.person_id == players.c.person_id)).fetchall())
+    assert [names[player_id] for player_id in ids] == [record['first_name'] for record in records]
+    assert etl_session.query(mcp.Persons).filter_by(type='players').count() == 6
+    assert loader.insert_records(mcp.Players, []) == []
+
+
+@pytest.mark.parametrize('bulk_insert', [True, False])
+def test_load_stat_records_chunks(etl_session, round_trips, caplog, bulk_insert):
+    """Load 012: Statistics records are inserted in chunks, without the empty records, and counted in the log."""
+    loader = MarcottiStatLoad(etl_session, u"Supplier")
+    loader.bulk_insert = bulk_insert
+    loader.chunk_size = 3
+    frame = pd.DataFrame([dict(lineup_id=k, corners=k % 2, freekicks=0, throwins=None, goalkicks=0, setpieces=0,
+                               total=k % 2 * k) for k in range(1, 16)])
+    start = round_trips()
+    with caplog.at_level(logging.INFO):
+        loader.assists(frame)
+    if bulk_insert:
+        assert round_trips() - start == 3
+    assert sorted(etl_session.query(stats.Assists.lineup_id, stats.Assists.total)) == \
+        [(k, k) for k in range(1, 16, 2)]
+    assert [record.getMessage() for record in caplog.records] == ["8 Assists records from 15 lineup records"]
@@ -0,0 +1,179 @@
+# coding=utf-8
+from datetime import date
+
+from sqlalchemy import event
+
+import marcotti.models.club as mc
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.personnel as mcp
+from marcotti.etl import ETL, MarcottiLoad, MarcottiTransform
+from marcotti.etl.base.lookup import LookupCache, MatchIndex, NOT_FOUND, MULTIPLE_FOUND
+
+
+def add_countries(session, count):
+    session.add_all([mco.Countries(name=u"Country {:03d}".format(n), confederation=enums.ConfederationType.europe)
+                     for n in range(count)])
+    session.commit()
+
+
+def test_lookup_preload(etl_session, round_trips):
+    """Lookup 001: Preloaded lookups read all records of a model in one query."""
+    add_countries(etl_session, 20)
+    cache = LookupCache(etl_session)
+    start = round_trips()
+    ids = [cache.get(mco.Countries, name=u"Country {:03d}".format(n)) for n in range(20)]
+    assert round_trips() - start == 1
+    assert len(set(ids)) == 20
+    assert cache.get(mco.Countries, name=u"Nowhere") is NOT_FOUND
+    assert round_trips() - start == 1
+
+
+def test_lookup_memoization(etl_session, round_trips):
+    """Lookup 002: Lookups that are not preloaded are queried once and memoized, including misses."""
+    add_countries(etl_session, 3)
+    cache = LookupCache(etl_session, preload={})
+    start = round_trips()
+    first = cache.get(mco.Countries, name=u"Country 001")
+    assert cache.get(mco.Countries, name=u"Country 001") == first
+    assert cache.get(mco.Countries, name=u"Nowhere") is NOT_FOUND
+    assert cache.get(mco.Countries, name=u"Nowhere") is NOT_FOUND
+    assert round_trips() - start == 2
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 2
+
+
+def test_lookup_multiple_found(etl_session):
+    """Lookup 003: Lookups that match several records return the MULTIPLE_FOUND sentinel."""
+    etl_session.add_all([mco.Countries(name=u"Twin", confederation=enums.ConfederationType.europe),
+                         mco.Countries(name=u"Twin", confederation=enums.ConfederationType.africa)])
+    etl_session.commit()
+    assert LookupCache(etl_session).get(mco.Countries, name=u"Twin") is MULTIPLE_FOUND
+    assert LookupCache(etl_session, preload={}).get(mco.Countries, name=u"Twin") is MULTIPLE_FOUND
+
+
+def test_lookup_get_many_chunks(etl_session, round_trips):
+    """Lookup 004: Batch lookups issue one query per chunk of uncached values."""
+    add_countries(etl_session, 25)
+    cache = LookupCache(etl_session, preload={})
+    cache.IN_CHUNK = 10
+    values = [(u"Country {:03d}".format(n),) for n in range(25)] + [(u"Nowhere",)]
+    start = round_trips()
+    results = cache.get_many(mco.Countries, ('name',), values)
+    assert round_trips() - start == 3
+    assert len(set(results[value] for value in values[:25])) == 25
+    assert results[(u"Nowhere",)] is NOT_FOUND
+    assert cache.get_many(mco.Countries, ('name',), values) == results
+    assert cache.get(mco.Countries, name=u"Country 007") == results[(u"Country 007",)]
+    assert round_trips() - start == 3
+
+
+def test_lookup_invalidated_after_flush(etl_session):
+    """Lookup 005: Cached lookups of a model are refreshed after new records of the model are flushed."""
+    add_countries(etl_session, 2)
+    for n, cache in enumerate([LookupCache(etl_session), LookupCache(etl_session, preload={})]):
+        name = u"New Country {}".format(n)
+        assert cache.get(mco.Countries, name=name) is NOT_FOUND
+        country = mco.Countries(name=name, confederation=enums.ConfederationType.asia)
+        etl_session.add(country)
+        etl_session.flush()
+        assert cache.get(mco.Countries, name=name) == country.id
+
+
+def test_lookup_invalidate_subclasses(etl_session):
+    """Lookup 006: Invalidating a base model discards cached lookups of its subclasses."""
+    cache = LookupCache(etl_session)
+    conditions = dict(first_name=u"John", last_name=u"Doe")
+    assert cache.get(mcp.Players, **conditions) is NOT_FOUND
+    etl_session.execute(mcp.Persons.__table__.insert().values(
+        person_id=1, first_name=u"John", last_name=u"Doe", birth_date=date(1980, 1, 1), type='players'))
+    etl_session.execute(mcp.Players.__table__.insert().values(id=1, person_id=1))
+    assert cache.get(mcp.Players, **conditions) is NOT_FOUND
+    cache.invalidate(mcp.Persons)
+    assert cache.get(mcp.Players, **conditions) == 1
+
+
+def add_clubs_and_player(session):
+    clubs = [mc.Clubs(name=u"Home"), mc.Clubs(name=u"Away")]
+    player = mcp.Players(first_name=u"John", last_name=u"Doe", birth_date=date(1980, 1, 1))
+    session.add_all(clubs + [player])
+    session.flush()
+    return [club.id for club in clubs] + [player.id]
+
+
+def add_match(session, home_id, away_id, match_date, *player_ids):
+    match = mc.ClubLeagueMatches(home_team_id=home_id, away_team_id=away_id, date=match_date, matchday=1)
+    session.add(match)
+    session.flush()
+    lineups = [mc.ClubMatchLineups(match_id=match.id, player_id=player_id, team_id=home_id) for player_id in player_ids]
+    session.add_all(lineups)
+    session.commit()
+    return match.id, [lineup.id for lineup in lineups]
+
+
+def test_match_index_newer_records(etl_session):
+    """Lookup 007: Matches and lineups loaded after the index was first updated are found by later updates."""
+    home, away, player = add_clubs_and_player(etl_session)
+    day = date(2012, 8, 1)
+    index = MatchIndex(etl_session)
+    index.update(day, day)
+    assert index.match_ids([(home, away, day)]) == {(home, away, day): NOT_FOUND}
+    match_id, _ = add_match(etl_session, home, away, day)
+    index.update(day, day)
+    assert index.match_ids([(home, away, "2012-08-01")]) == {(home, away, "2012-08-01"): match_id}
+    assert index.lineup_ids([(match_id, player)]) == {(match_id, player): NOT_FOUND}
+    etl_session.add(mc.ClubMatchLineups(match_id=match_id, player_id=player, team_id=home))
+    etl_session.commit()
+    index.update(day, day)
+    lineup_id = etl_session.query(mc.ClubMatchLineups.id).filter_by(match_id=match_id, player_id=player).scalar()
+    assert index.lineup_ids([(match_id, player)]) == {(match_id, player): lineup_id}
+
+
+def test_match_index_date_scope(etl_session):
+    """Lookup 008: Matches of the same teams on dates outside the indexed range are not found."""
+    home, away, player = add_clubs_and_player(etl_session)
+    first, second = date(2012, 8, 1), date(2013, 4, 1)
+    first_id, (first_lineup,) = add_match(etl_session, home, away, first, player)
+    second_id, (second_lineup,) = add_match(etl_session, home, away, second, player)
+    index = MatchIndex(etl_session)
+    index.update(first, first)
+    assert index.match_ids([(home, away, first), (home, away, second)]) == {
+        (home, away, first): first_id, (home, away, second): NOT_FOUND}
+    assert index.lineup_ids([(first_id, player), (second_id, player)]) == {
+        (first_id, player): first_lineup, (second_id, player): NOT_FOUND}
+    index.update(second, second)
+    assert (index.start, index.end) == (first, second)
+    assert index.match_ids([(home, away, first), (home, away, second)]) == {
+        (home, away, first): first_id, (home, away, second): second_id}
+    assert index.lineup_ids([(second_id, player)]) == {(second_id, player): second_lineup}
+
+
+def test_lookup_invalidated_after_changes(etl_session):
+    """Lookup 009: Cached lookups of a model are refreshed after records of the model are modified or deleted."""
+    add_countries(etl_session, 2)
+    for cache in [LookupCache(etl_session), LookupCache(etl_session, preload={})]:
+        country = etl_session.query(mco.Countries).filter_by(name=u"Country 000").one()
+        assert cache.get(mco.Countries, name=u"Country 000") == country.id
+        country.name = u"Renamed"
+        etl_session.flush()
+        assert cache.get(mco.Countries, name=u"Country 000") is NOT_FOUND
+        assert cache.get(mco.Countries, name=u"Renamed") == country.id
+        etl_session.delete(country)
+        etl_session.flush()
+        assert cache.get(mco.Countries, name=u"Renamed") is NOT_FOUND
+        etl_session.rollback()
+
+
+def test_lookup_close(etl_session):
+    """Lookup 010: Closed caches and workflows stop listening to events of the session."""
+    cache = LookupCache(etl_session, preload={})
+    assert cache.get(mco.Countries, name=u"Late") is NOT_FOUND
+    cache.close()
+    cache.close()
+    etl_session.add(mco.Countries(name=u"Late", confederation=enums.ConfederationType.asia))
+    etl_session.flush()
+    assert cache.get(mco.Countries, name=u"Late") is NOT_FOUND
+    etl = ETL(transform=MarcottiTransform, load=MarcottiLoad, session=etl_session, supplier=u"Supplier")
+    assert event.contains(etl_session, 'after_flush', etl.cache._after_flush)
+    etl.close()
+    assert not event.contains(etl_session, 'after_flush', etl.cache._after_flush)
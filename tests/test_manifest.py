@@ -0,0 +1,132 @@
+# coding=utf-8
+import os
+
+import pytest
+
+import marcotti.models.common.overview as mco
+from marcotti.etl import ETL, Manifest, MarcottiTransform, MarcottiLoad
+from marcotti.etl.ecsv import CSVExtractor
+
+
+def write_file(tmpdir, name, content):
+    data_file = tmpdir.join(name)
+    data_file.write(content)
+    return str(data_file)
+
+
+def country_rows(ids, confed="UEFA"):
+    return "ID,Name,Code,Confederation\n" + "".join(
+        "{0},Country {0},C{0},{1}\n".format(k, confed if k == ids[-1] else "UEFA") for k in ids)
+
+
+def loaded_manifest(path, entity, fname, rows=1):
+    manifest = Manifest(path)
+    manifest.record(entity, fname, rows)
+    manifest.save()
+    return Manifest(path)
+
+
+def test_manifest_skips_loaded_file(tmpdir):
+    """Manifest 001: Files are skipped once their records are saved, and only for their data entity."""
+    path = str(tmpdir.join('manifest.json'))
+    fname = write_file(tmpdir, 'clubs.csv', "ID,Name\n1,Club\n")
+    manifest = Manifest(path)
+    assert manifest.changed('clubs', [fname]) == [fname]
+    manifest.record('clubs', fname, 1)
+    assert Manifest(path).changed('clubs', [fname]) == [fname]
+    manifest.save()
+    reloaded = Manifest(path)
+    assert reloaded.changed('clubs', [fname]) == []
+    assert reloaded.changed('venues', [fname]) == [fname]
+    assert reloaded.entries['clubs'][os.path.abspath(fname)]['rows'] == 1
+
+
+def test_manifest_rereads_modified_file(tmpdir):
+    """Manifest 002: Files are extracted again after their contents change, but not after they are only touched."""
+    path = str(tmpdir.join('manifest.json'))
+    fname = write_file(tmpdir, 'clubs.csv', "ID,Name\n1,Club\n")
+    stat = os.stat(fname)
+    manifest = loaded_manifest(path, 'clubs', fname)
+
+    os.utime(fname, (stat.st_atime, stat.st_mtime + 10))
+    assert manifest.changed('clubs', [fname]) == []
+
+    write_file(tmpdir, 'clubs.csv', "ID,Name\n2,Club\n")
+    os.utime(fname, (stat.st_atime, stat.st_mtime + 20))
+    assert manifest.changed('clubs', [fname]) == [fname]
+
+    write_file(tmpdir, 'clubs.csv', "ID,Name\n1,Club\n3,Other Club\n")
+    assert manifest.changed('clubs', [fname]) == [fname]
+
+
+def test_manifest_discard(tmpdir):
+    """Manifest 003: Discarded file records are not saved, so that the files are extracted again."""
+    path = str(tmpdir.join('manifest.json'))
+    fname = write_file(tmpdir, 'clubs.csv', "ID,Name\n1,Club\n")
+    manifest = Manifest(path)
+    manifest.record('clubs', fname, 1)
+    manifest.discard()
+    manifest.save()
+    assert not os.path.exists(path)
+    assert Manifest(path).changed('clubs', [fname]) == [fname]
+
+
+def test_manifest_saved_on_commit(etl_session, tmpdir):
+    """Manifest 004: Files extracted for an ETL workflow are recorded once the loaded data are committed."""
+    path = str(tmpdir.join('manifest.json'))
+    fname = write_file(tmpdir, 'countries.csv', "ID,Name,Code,Confederation\n1,Country,CTY,UEFA\n")
+    manifest = Manifest(path)
+    etl = ETL(transform=MarcottiTransform, load=MarcottiLoad, session=etl_session, supplier=u"Supplier",
+              manifest=manifest)
+    manifest.record('countries', fname, 1)
+    etl.workflow('countries', [dict(remote_id=u"1", name=u"Country", code=u"CTY", confed=u"UEFA")])
+    assert etl_session.query(mco.Countries).count() == 1
+    assert Manifest(path).changed('countries', [fname]) == []
+
+
+def test_manifest_discarded_on_failure(etl_session, tmpdir):
+    """Manifest 005: Files extracted for a failed ETL workflow are extracted again by the next workflow."""
+    path = str(tmpdir.join('manifest.json'))
+    fname = write_file(tmpdir, 'countries.csv', "ID,Name\n1,Country\n")
+    manifest = Manifest(path)
+    etl = ETL(transform=MarcottiTransform, load=MarcottiLoad, session=etl_session, supplier=u"Supplier",
+              manifest=manifest)
+    manifest.record('countries', fname, 1)
+    with pytest.raises(KeyError):
+        etl.workflow('countries', [dict(remote_id=u"1", name=u"Country")])
+    etl_session.rollback()
+    etl_session.commit()
+    assert manifest.pending == []
+    assert Manifest(path).changed('countries', [fname]) == [fname]
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_manifest_files_carried_by_last_chunk(tmpdir, workers):
+    """Manifest 006: Files of chunked extraction are carried by the chunk that holds their last record."""
+    files = {write_file(tmpdir, 'countries_a.csv', country_rows([1, 2, 3])): (u"3", 3),
+             write_file(tmpdir, 'countries_b.csv', country_rows([4, 5])): (u"5", 2),
+             write_file(tmpdir, 'countries_c.csv', country_rows([6])): (u"6", 1)}
+    extractor = CSVExtractor(str(tmpdir), chunk_size=2, workers=workers, manifest=Manifest(str(tmpdir.join('m'))))
+    chunks = list(extractor.countries(('countries_*.csv',)))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2]
+    for chunk in chunks:
+        ids = set(record['remote_id'] for record in chunk)
+        assert sorted(chunk.files) == sorted(('countries', fname, rows)
+                                             for fname, (last_id, rows) in files.items() if last_id in ids)
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_manifest_file_spanning_failed_chunk(etl_session, tmpdir, workers):
+    """Manifest 007: A file is not recorded when the chunk that holds its last record fails to load."""
+    path = str(tmpdir.join('manifest.json'))
+    spanning = write_file(tmpdir, 'countries_a.csv', country_rows([1, 2, 3], confed="XXX"))
+    write_file(tmpdir, 'countries_b.csv', country_rows([4]))
+    manifest = Manifest(path)
+    extractor = CSVExtractor(str(tmpdir), chunk_size=2, workers=workers, manifest=manifest)
+    etl = ETL(transform=MarcottiTransform, load=MarcottiLoad, session=etl_session, supplier=u"Supplier",
+              manifest=manifest, commit=2)
+    with pytest.raises(ValueError):
+        etl.workflow('countries', extractor.countries(('countries_*.csv',)))
+    etl_session.rollback()
+    assert etl_session.query(mco.Countries).count() == 2
+    assert Manifest(path).changed('countries', [spanning]) == [spanning]
@@ -0,0 +1,145 @@
+# coding=utf-8
+import csv
+import gc
+import logging
+import threading
+import weakref
+
+from sqlalchemy import create_engine
+
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.personnel as mcp
+from marcotti.etl import ETL, MarcottiLoad, MarcottiTransform
+from marcotti.etl.base.metrics import StatementCounter, StageMetrics, ETLReport, UnresolvedKeys
+
+
+def insert_countries(session, count):
+    session.connection().execute(mco.Countries.__table__.insert(), [
+        dict(name=u"Country {}".format(n), confederation=enums.ConfederationType.europe) for n in range(count)])
+
+
+def test_statement_counter_executemany(etl_session):
+    """Metrics 001: An executemany batch is one round trip with one statement and inserted row per parameter set."""
+    counter = StatementCounter.attach(etl_session.get_bind())
+    assert StatementCounter.attach(etl_session.connection()) is counter
+    start = counter.snapshot()
+    insert_countries(etl_session, 5)
+    etl_session.query(mco.Countries).count()
+    assert [end - begin for begin, end in zip(start, counter.snapshot())] == [2, 6, 5]
+    counts = []
+    thread = threading.Thread(target=lambda: counts.append(counter.snapshot()))
+    thread.start()
+    thread.join()
+    assert counts == [(0, 0, 0)]
+
+
+def test_statement_counter_released():
+    """Metrics 002: Statement counters do not keep their engines alive."""
+    engine = create_engine('sqlite://')
+    counter = StatementCounter.attach(engine)
+    engine.execute("SELECT 1")
+    assert counter.snapshot()[0] == 1
+    ref = weakref.ref(engine)
+    del engine
+    gc.collect()
+    assert ref() is None
+    assert counter not in StatementCounter.counters.values()
+
+
+def test_etl_report_stages(etl_session, caplog):
+    """Metrics 003: Stage metrics sum rows and statements over runs, and report inserted rows by default."""
+    report = ETLReport(etl_session.get_bind())
+    with report.stage('countries', 'load', 5) as metrics:
+        insert_countries(etl_session, 5)
+    assert (metrics.runs, metrics.rows_in, metrics.rows_out, metrics.statements, metrics.round_trips) == \
+        (1, 5, 5, 5, 1)
+    with report.stage('countries', 'load', 3) as metrics:
+        metrics.rows_out = 2
+        insert_countries(etl_session, 3)
+    with report.stage('countries', 'transform', 3):
+        pass
+    with report.stage('clubs', 'load', 0):
+        pass
+    assert (metrics.runs, metrics.rows_in, metrics.rows_out, metrics.statements, metrics.round_trips) == \
+        (2, 8, 7, 8, 2)
+    assert metrics.wall_time >= 0 and metrics.cpu_time >= 0
+    assert [(stage.entity, stage.stage) for stage in report.entity('countries')] == \
+        [('countries', 'load'), ('countries', 'transform')]
+    assert [row['rows_out'] for row in report.as_dicts()] == [7, 0, 0]
+    assert all(sorted(row) == sorted(StageMetrics.fields) for row in report.as_dicts())
+    assert str(report).splitlines()[0].startswith("countries.load: ")
+    assert "8 statements in 2 round trips" in str(metrics)
+    with caplog.at_level(logging.INFO):
+        report.log('clubs')
+    assert [record.getMessage().split(":")[0] for record in caplog.records] == ["clubs.load"]
+
+
+def test_etl_report_without_engine():
+    """Metrics 004: Reports without a database engine measure rows and times but no statements."""
+    report = ETLReport()
+    with report.stage('countries', 'extract', 0) as metrics:
+        metrics.rows_out = 4
+    assert (metrics.rows_out, metrics.statements, metrics.round_trips) == (4, 0, 0)
+
+
+def unresolved_keys():
+    keys = UnresolvedKeys()
+    keys.add(mco.Countries, UnresolvedKeys.NOT_FOUND, ('name',), (u"Nowhere",))
+    keys.add(mco.Countries, UnresolvedKeys.NOT_FOUND, ('name',), (u"Nowhere",), count=2)
+    keys.add(mco.Countries, UnresolvedKeys.NOT_FOUND, ('name',), (u"Atl\xe1ntida",))
+    keys.add(mcp.Positions, UnresolvedKeys.MULTIPLE_FOUND, ('name', 'type'), (u"Twin", u"Forward"))
+    return keys
+
+
+def read_report(path):
+    with open(path, 'rb') as f:
+        return list(csv.reader(f))
+
+
+def test_unresolved_keys_counts(caplog):
+    """Metrics 005: Unresolved keys are counted per model, reason, and fields, and summarized in the log."""
+    keys = unresolved_keys()
+    assert len(keys) == 2
+    assert keys.counts[('Countries', 'no', ('name',))] == {(u"Nowhere",): 3, (u"Atl\xe1ntida",): 1}
+    assert keys.counts[('Positions', 'multiple', ('name', 'type'))] == {(u"Twin", u"Forward"): 1}
+    with caplog.at_level(logging.WARNING):
+        keys.log('players')
+    assert [record.getMessage() for record in caplog.records] == [
+        u"players: Countries has no records in Marcotti database for 2 keys of (name) in 4 lookups, "
+        u"e.g. name=Nowhere; name=Atl\xe1ntida",
+        u"players: Positions has multiple records in Marcotti database for 1 keys of (name, type) in 1 lookups, "
+        u"e.g. name=Twin;type=Forward"]
+    keys.clear()
+    assert len(keys) == 0
+
+
+def test_unresolved_keys_report(tmpdir):
+    """Metrics 006: Unresolved keys are appended to the report file, with a header only in new or empty files."""
+    path = str(tmpdir.join('unresolved.csv'))
+    rows = [['players', 'Countries', 'no', 'name=Nowhere', '3'],
+            ['players', 'Countries', 'no', u"name=Atl\xe1ntida".encode('utf-8'), '1'],
+            ['players', 'Positions', 'multiple', 'name=Twin;type=Forward', '1']]
+    keys = unresolved_keys()
+    keys.write(path, 'players')
+    keys.write(path, 'players')
+    assert read_report(path) == [UnresolvedKeys.report_fields] + rows + rows
+    empty = tmpdir.join('empty.csv')
+    empty.write('')
+    keys.write(str(empty), 'players')
+    assert read_report(str(empty)) == [UnresolvedKeys.report_fields] + rows
+
+
+def test_unresolved_keys_workflow(etl_session, tmpdir):
+    """Metrics 007: Workflows report the unresolved keys of each data entity once, and then clear them."""
+    path = str(tmpdir.join('unresolved.csv'))
+    etl = ETL(transform=MarcottiTransform, load=MarcottiLoad, session=etl_session, supplier=u"Supplier",
+              unresolved=path)
+    clubs = [dict(remote_id=str(n), name=u"Club {}".format(n), country=u"Nowhere") for n in range(3)]
+    etl.workflow('clubs', clubs)
+    etl.workflow('clubs', clubs[:1])
+    etl.close()
+    assert len(etl.cache.unresolved) == 0
+    assert read_report(path) == [UnresolvedKeys.report_fields,
+                                 ['clubs', 'Countries', 'no', 'name=Nowhere', '3'],
+                                 ['clubs', 'Countries', 'no', 'name=Nowhere', '1']]
@@ -0,0 +1,19 @@
+# coding=utf-8
+from collections import OrderedDict
+
+from marcotti.tools.microbench import BENCHMARKS, compare, run
+
+
+def test_microbench_run():
+    """Microbench 001: Every registered microbenchmark runs and reports a positive time per call."""
+    results = run(repeat=1)
+    assert list(results) == list(BENCHMARKS)
+    assert all(value > 0 for value in results.values())
+
+
+def test_microbench_compare():
+    """Microbench 002: Results slower than their baselines by more than the threshold are regressions."""
+    rows = compare(OrderedDict([('fast', 1.0), ('slow', 2.0), ('new', 1.0)]), {'fast': 1.0, 'slow': 1.0}, threshold=0.2)
+    assert [(name, regression) for name, _, _, _, regression in rows] == \
+        [('fast', False), ('slow', True), ('new', False)]
+    assert rows[2][1] is None and rows[2][3] is None
@@ -0,0 +1,71 @@
+# coding=utf-8
+import csv
+from datetime import date
+
+import pytest
+from sqlalchemy import MetaData, Table, Column, Boolean, Date, Float, Integer, String, Unicode
+from sqlalchemy.dialects.postgresql import psycopg2
+
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.statistics as stats
+from marcotti.etl.base.pgload import MarcottiCopyLoad, MarcottiCopyStatLoad
+
+
+class PostgresCopyLoad(MarcottiCopyLoad):
+    dialect = psycopg2.dialect()
+
+
+def copy_table():
+    return Table('copy_values', MetaData(), Column('name', Unicode), Column('code', String), Column('day', Date),
+                 Column('flag', Boolean), Column('ratio', Float), Column('total', Integer),
+                 Column('name_order', enums.NameOrderType.db_type()))
+
+
+def test_copy_buffer_values(etl_session):
+    """Pgload 001: COPY rows quote strings, keep NULL values unquoted, and write values in PostgreSQL formats."""
+    loader = PostgresCopyLoad(etl_session, u"Supplier")
+    table = copy_table()
+    rows = [(u'Ren\xe9e "Ree", Jr.', 'line\nbreak', date(2012, 8, 1), True, 0.1, 7, enums.NameOrderType.eastern),
+            (u"", "", None, False, None, None, None),
+            (None, None, None, None, 1e-07, 0, enums.NameOrderType.western)]
+    buf = loader.copy_buffer(table, [column.name for column in table.c], rows)
+    assert buf.read() == ('"Ren\xc3\xa9e ""Ree"", Jr.","line\nbreak",2012-08-01,True,0.1,7,"Eastern"\n'
+                          '"","",,False,,,\n'
+                          ',,,,1e-07,0,"Western"\n')
+    buf.seek(0)
+    parsed = list(csv.reader(buf))
+    assert parsed[0][:2] == [u'Ren\xe9e "Ree", Jr.'.encode('utf-8'), 'line\nbreak']
+    assert [len(row) for row in parsed] == [7, 7, 7]
+
+
+def test_copy_load_fallback(etl_session, monkeypatch):
+    """Pgload 002: Loaders write records with their regular path on databases without COPY."""
+    def copy_records(self, model, records):
+        raise AssertionError("COPY on {}".format(self.dialect.name))
+
+    monkeypatch.setattr(MarcottiCopyLoad, 'copy_records', copy_records)
+    monkeypatch.setattr(MarcottiCopyStatLoad, 'copy_records', copy_records)
+    loader = MarcottiCopyLoad(etl_session, u"Supplier")
+    assert not loader.can_copy
+    loader.save_records(mco.Countries, [dict(name=u"Country {}".format(k), code=u"C{}".format(k),
+                                             confederation=enums.ConfederationType.europe) for k in range(3)])
+    loader.save_records(mco.Countries, [])
+    stat_loader = MarcottiCopyStatLoad(etl_session, u"Supplier")
+    stat_loader.save_records(stats.Assists, [dict(lineup_id=k, total=k) for k in range(1, 5)])
+    etl_session.commit()
+    assert etl_session.query(mco.Countries).count() == 3
+    assert sorted(etl_session.query(stats.Assists.lineup_id, stats.Assists.total)) == [(k, k) for k in range(1, 5)]
+
+
+@pytest.mark.parametrize('copy_dialects,copies', [(('postgresql',), False), (('postgresql', 'sqlite'), True)])
+def test_copy_load_dialects(etl_session, monkeypatch, copy_dialects, copies):
+    """Pgload 003: Records are copied only on the copy dialects, and empty record lists are never copied."""
+    copied = []
+    monkeypatch.setattr(MarcottiCopyLoad, 'copy_records', lambda self, model, records: copied.append(len(records)))
+    monkeypatch.setattr(MarcottiCopyLoad, 'insert_records', lambda self, model, records: None)
+    loader = MarcottiCopyLoad(etl_session, u"Supplier")
+    loader.copy_dialects = copy_dialects
+    loader.save_records(mco.Countries, [dict(name=u"Country")])
+    loader.save_records(mco.Countries, [])
+    assert copied == ([1] if copies else [])
@@ -0,0 +1,183 @@
+# coding=utf-8
+import time
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from marcotti.etl.base.load import MarcottiStatLoad
+from marcotti.etl.base.scheduler import ETLScheduler, ETLTask, ScheduleReport
+from marcotti.etl.ecsv.default import CSVFrameStatsExtractor
+from marcotti.tools.etlbench import ETLBenchmark
+from marcotti.tools.seasongen import SeasonGenerator, FILES
+
+
+class StubMarcotti(object):
+    @contextmanager
+    def create_session(self):
+        yield None
+
+
+class TaskLog(object):
+    """Record start and finish order of stub workflows."""
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def stub(self, scheduler, name, delay=0.0, error=None):
+        def run(session):
+            with self.lock:
+                self.events.append(('start', name))
+            time.sleep(delay)
+            with self.lock:
+                self.events.append(('finish', name))
+            if error is not None:
+                raise error
+        scheduler.tasks[name].run = run
+
+    def started(self):
+        return [name for event, name in self.events if event == 'start']
+
+    def index(self, event, name):
+        return self.events.index((event, name))
+
+
+def stub_scheduler(workers, *entities, **delays):
+    scheduler = ETLScheduler(StubMarcotti(), workers=workers)
+    log = TaskLog()
+    for entity in entities:
+        scheduler.add(entity, [])
+        log.stub(scheduler, entity, delays.get(entity, 0.0))
+    return scheduler, log
+
+
+def test_scheduler_resolve_dependencies():
+    """Scheduler 001: Tasks wait for scheduled tasks of the entities they depend on, and for suppliers."""
+    scheduler = ETLScheduler(StubMarcotti(), supplier=u"Supplier")
+    for entity in ['suppliers', 'countries', 'positions', 'players', 'clubs']:
+        scheduler.add(entity, [])
+    scheduler.add('countries', [], name='more_countries')
+    scheduler.resolve()
+    assert scheduler.tasks['suppliers'].after == set()
+    assert scheduler.tasks['countries'].after == {'suppliers'}
+    assert scheduler.tasks['players'].after == {'suppliers', 'countries', 'more_countries', 'positions'}
+    assert scheduler.tasks['clubs'].after == {'suppliers', 'countries', 'more_countries'}
+
+
+def test_scheduler_unscheduled_dependency():
+    """Scheduler 002: Explicit dependencies on tasks that are not scheduled are rejected."""
+    scheduler = ETLScheduler(StubMarcotti())
+    scheduler.add('clubs', [], after=['countries'])
+    with pytest.raises(ValueError) as excinfo:
+        scheduler.resolve()
+    assert "unscheduled tasks: ['countries']" in str(excinfo.value)
+
+
+def test_scheduler_dependency_cycle():
+    """Scheduler 003: Cycles of dependencies are rejected before any workflow runs."""
+    scheduler, log = stub_scheduler(2, 'countries')
+    scheduler.add('clubs', [])
+    log.stub(scheduler, 'clubs')
+    scheduler.tasks['countries'].after.add('clubs')
+    with pytest.raises(ValueError) as excinfo:
+        scheduler.run()
+    assert "Dependency cycle" in str(excinfo.value)
+    assert log.events == []
+
+
+def test_scheduler_duplicate_task():
+    """Scheduler 004: Task names are unique."""
+    scheduler = ETLScheduler(StubMarcotti())
+    scheduler.add('clubs', [])
+    with pytest.raises(ValueError):
+        scheduler.add('clubs', [])
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_scheduler_run_order(workers):
+    """Scheduler 005: Workflows start only after the workflows they depend on have finished."""
+    scheduler, log = stub_scheduler(workers, 'players', 'clubs', 'countries', 'positions', 'timezones',
+                                    countries=0.05)
+    report = scheduler.run()
+    assert sorted(log.started()) == ['clubs', 'countries', 'players', 'positions', 'timezones']
+    for name, task in scheduler.tasks.items():
+        for dep in task.after:
+            assert log.index('finish', dep) < log.index('start', name)
+    if workers == 1:
+        assert log.started() == ['countries', 'clubs', 'positions', 'players', 'timezones']
+    assert set(report.timings) == set(scheduler.tasks)
+
+
+def test_scheduler_fail_fast():
+    """Scheduler 006: After a workflow fails, running workflows finish, no others start, and the error is raised."""
+    scheduler, log = stub_scheduler(2, 'countries', 'timezones', 'surfaces', 'clubs', timezones=0.1)
+    log.stub(scheduler, 'countries', error=RuntimeError("load failed"))
+    with pytest.raises(RuntimeError) as excinfo:
+        scheduler.run()
+    assert str(excinfo.value) == "load failed"
+    assert sorted(log.started()) == ['countries', 'timezones']
+    assert ('finish', 'timezones') in log.events
+    assert scheduler.tasks['surfaces'].start is None
+    assert scheduler.tasks['clubs'].start is None
+
+
+def completed_task(name, start, finish, after=()):
+    task = ETLTask(name, name, [], None, None, None, after)
+    task.start, task.finish = start, finish
+    return task
+
+
+def test_schedule_report_longest_chain():
+    """Scheduler 007: The critical path is the chain of dependent tasks with the longest total running time."""
+    tasks = {
+        'countries': completed_task('countries', 0.0, 1.0),
+        'timezones': completed_task('timezones', 0.0, 0.5),
+        'clubs': completed_task('clubs', 1.0, 3.0, after=['countries']),
+        'venues': completed_task('venues', 1.0, 2.5, after=['countries', 'timezones']),
+        'players': completed_task('players', 0.0, 2.5, after=['positions']),
+    }
+    report = ScheduleReport(tasks, 3.5)
+    assert report.critical_path == ['countries', 'clubs']
+    assert report.critical_time == 3.0
+    assert report.total_time == 7.5
+    assert str(report).endswith("critical path 3.00s: countries -> clubs")
+
+
+def test_schedule_report_empty():
+    """Scheduler 008: A report of no completed tasks has an empty critical path."""
+    report = ScheduleReport({}, 0.0)
+    assert report.critical_path == []
+    assert report.critical_time == 0.0
+
+
+class ReferenceBenchmark(ETLBenchmark):
+    """Benchmark that loads every data entity except statistics."""
+
+    def steps(self):
+        return [step for step in super(ReferenceBenchmark, self).steps() if step[0] != 'player_stats']
+
+
+def stat_counts(marcotti):
+    """Numbers of records of each statistics category, in total and with lineups."""
+    with marcotti.create_session() as session:
+        return {category: (session.query(model).count(),
+                           session.query(model).filter(model.lineup_id.isnot(None)).count())
+                for category, (model, _) in MarcottiStatLoad.stat_models.items()}
+
+
+def test_scheduler_stats_match_single_pass(tmpdir):
+    """Scheduler 009: Concurrent statistics categories load the records of the single-pass statistics load."""
+    data_dir = str(tmpdir.join('data'))
+    SeasonGenerator(data_dir, clubs=4, squad=20).generate()
+    single = ETLBenchmark(data_dir, str(tmpdir.join('single.db')))
+    assert single.run().failures == {}
+    concurrent = ReferenceBenchmark(data_dir, str(tmpdir.join('concurrent.db')))
+    assert concurrent.run().failures == {}
+    scheduler = ETLScheduler(concurrent.marcotti, workers=4, supplier=u"Synthetic")
+    names = scheduler.add_stats(CSVFrameStatsExtractor(data_dir), FILES['statistics'])
+    report = scheduler.run()
+    assert sorted(report.timings) == sorted(names) == sorted(MarcottiStatLoad.stat_models)
+    expected = stat_counts(single.marcotti)
+    assert all(total == linked > 0 for total, linked in expected.values())
+    assert stat_counts(concurrent.marcotti) == expected
@@ -0,0 +1,195 @@
+# coding=utf-8
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import marcotti.models.club as mc
+import marcotti.models.common.enums as enums
+import marcotti.models.common.overview as mco
+import marcotti.models.common.personnel as mcp
+import marcotti.models.common.suppliers as mcs
+from marcotti.etl import MarcottiTransform, MarcottiEventTransform
+from marcotti.etl.base.lookup import LookupCache
+
+NAN = float('nan')
+
+
+class RowTransform(MarcottiTransform):
+    """Transform that resolves lookup columns one row at a time with get_id."""
+
+    def get_ids(self, model, **conditions):
+        fields = [field for field, value in conditions.items() if isinstance(value, pd.Series)]
+        rows = self.lookup_values(*[conditions[field] for field in fields])
+        return pd.Series([self.get_id(model, **dict(conditions, **dict(zip(fields, row)))) for row in rows],
+                         index=conditions[fields[0]].index, dtype=object)
+
+
+def add_references(session):
+    """
+    Add reference records with unique and duplicated lookup keys: the 'Twin' country and position, and the
+    'Twin Player' players of club A, are duplicated.
+    """
+    england, twin = mco.Countries(name=u"England", confederation=enums.ConfederationType.europe), \
+        mco.Countries(name=u"Twin", confederation=enums.ConfederationType.europe)
+    positions = [mcp.Positions(name=name, type=enums.PositionType.forward) for name in [u"Striker", u"Twin", u"Twin"]]
+    years = [mco.Years(yr=2012), mco.Years(yr=2013)]
+    session.add_all([england, twin, mco.Countries(name=u"Twin", confederation=enums.ConfederationType.europe)] +
+                    positions + years)
+    session.flush()
+    club_a, club_b = mc.Clubs(name=u"Club A", country_id=england.id), mc.Clubs(name=u"Club B", country_id=england.id)
+    season = mco.Seasons(start_year=years[0], end_year=years[1])
+    competition = mco.DomesticCompetitions(name=u"League", level=1, country_id=england.id)
+    players = [mcp.Players(first_name=first, last_name=last, birth_date=date(1990, 1, 1), country_id=england.id)
+               for first, last in [(u"Ann", u"Able"), (u"Bob", u"Baker"), (u"Twin", u"Player"), (u"Twin", u"Player")]]
+    session.add_all([club_a, club_b, season, competition] + players)
+    session.flush()
+    match = mc.ClubLeagueMatches(competition_id=competition.id, season_id=season.id, matchday=1, date=date(2012, 8, 1),
+                                 home_team_id=club_a.id, away_team_id=club_b.id)
+    session.add(match)
+    session.flush()
+    session.add_all([mc.ClubMatchLineups(match_id=match.id, player_id=player.id,
+                                         team_id=club_b.id if player is players[1] else club_a.id)
+                     for player in players])
+    session.add_all([mcs.MatchMap(id=match.id, remote_id=100, supplier_id=1),
+                     mcs.PositionMap(id=positions[0].id, remote_id=1, supplier_id=1),
+                     mcs.PositionMap(id=positions[1].id, remote_id=2, supplier_id=1),
+                     mcs.PositionMap(id=positions[2].id, remote_id=2, supplier_id=1)])
+    session.commit()
+
+
+def unresolved(transform):
+    """Unresolved lookups of a transform, keyed by model, reason, and the pairs of lookup fields and values."""
+    return {(model, reason, tuple(sorted(zip(fields, values)))): count
+            for (model, reason, fields), keys in transform.cache.unresolved.counts.items()
+            for values, count in keys.items()}
+
+
+def transforms(session, *classes):
+    return [cls(session, u"Supplier", LookupCache(session)) for cls in classes]
+
+
+def frames(records, columns):
+    """DataFrames of extracted records, in full and empty."""
+    return [pd.DataFrame(records, columns=columns), pd.DataFrame([], columns=columns)]
+
+
+PERSON = dict(dob="1990-01-01", name_order="Western", first_name=u"New", last_name=u"Player")
+
+ENTITIES = {
+    'clubs': frames([dict(remote_id="1", name=u"Club C", country=country)
+                     for country in [u"England", u"Nowhere", NAN, u"Twin", u"England"]],
+                    ['remote_id', 'name', 'country']),
+    'players': frames([dict(PERSON, remote_id=str(n), country=country, remote_position_id=position)
+                       for n, (country, position) in enumerate([(u"England", "1"), (u"Twin", "2"), (NAN, NAN),
+                                                                (u"Nowhere", "3"), (u"England", "1")])],
+                      sorted(PERSON) + ['remote_id', 'country', 'remote_position_id']),
+    'league_matches': frames([dict(remote_id=str(n), competition=competition, season=u"2012-2013", date="2012-08-01",
+                                   matchday=1, home_team=home, away_team=away)
+                              for n, (competition, home, away) in enumerate([
+                                  (u"League", u"Club A", u"Club B"), (u"Cup", u"Club A", u"Club B"),
+                                  (u"League", NAN, u"Club B"), (u"League", u"Club B", u"Club A")])],
+                             ['remote_id', 'competition', 'season', 'date', 'matchday', 'home_team', 'away_team',
+                              'venue', 'home_manager', 'away_manager', 'referee', 'kickoff_wx', 'halftime_wx',
+                              'fulltime_wx']),
+    'match_lineups': frames([dict(competition=u"League", season=u"2012-2013", matchday=matchday, home_team=u"Club A",
+                                  away_team=u"Club B", player_team=team, player_name=name, starter=True,
+                                  captain=False)
+                             for matchday, team, name in [(1, u"Club A", u"Ann Able"), (1, u"Club B", u"Bob Baker"),
+                                                          (1, u"Club A", u"Twin Player"), (2, u"Club A", u"Ann Able"),
+                                                          (1, NAN, NAN), (1, u"Club A", u"Nobody")]],
+                            ['competition', 'season', 'matchday', 'home_team', 'away_team', 'player_team',
+                             'player_name', 'starter', 'captain']),
+    'goals': frames([dict(remote_match_id=match, scorer=name, scoring_team=team, scoring_event="Unknown",
+                          bodypart_desc="Head", match_time=10, stoppage_time=0)
+                     for match, name, team in [("100", u"Ann Able", u"Club A"), ("100", u"Bob Baker", u"Club B"),
+                                               ("100", u"Twin Player", u"Club A"), ("200", u"Ann Able", u"Club A"),
+                                               (NAN, NAN, NAN), ("100", u"Nobody", u"Club A"),
+                                               ("100", u"Ann Able", u"Club A")]],
+                    ['remote_match_id', 'scorer', 'scoring_team', 'scoring_event', 'bodypart_desc', 'match_time',
+                     'stoppage_time'])
+}
+
+
+@pytest.mark.parametrize('entity', sorted(ENTITIES))
+def test_transform_columns_match_rows(etl_session, entity):
+    """Transform 001: Column-wise lookups resolve and count unresolved keys as row-by-row lookups do."""
+    add_references(etl_session)
+    for data_frame in ENTITIES[entity]:
+        column_wise, row_wise = transforms(etl_session, MarcottiTransform, RowTransform)
+        expected = getattr(row_wise, entity)(data_frame.copy())
+        pd.testing.assert_frame_equal(getattr(column_wise, entity)(data_frame.copy()), expected)
+        assert unresolved(column_wise) == unresolved(row_wise)
+        assert bool(unresolved(row_wise)) == (len(data_frame) > 0)
+
+
+def test_transform_resolved_ids(etl_session):
+    """Transform 002: Unique keys resolve to their records, and missing, duplicate, and NaN keys to None."""
+    add_references(etl_session)
+    transform, = transforms(etl_session, MarcottiTransform)
+    clubs = transform.clubs(ENTITIES['clubs'][0])
+    england = etl_session.query(mco.Countries.id).filter_by(name=u"England").scalar()
+    assert clubs['country_id'].tolist() == [england, None, None, None, england]
+    lineups = transform.match_lineups(ENTITIES['match_lineups'][0])
+    match_id = etl_session.query(mc.ClubLeagueMatches.id).scalar()
+    assert lineups['match_id'].tolist() == [match_id] * 3 + [None] + [match_id] * 2
+    assert lineups[['is_starting', 'is_captain']].values.tolist() == [[True, False]] * 6
+
+
+def test_transform_event_rosters_match_rows(etl_session):
+    """Transform 003: Event lineups resolved from match rosters are the lineups resolved row by row."""
+    add_references(etl_session)
+    for data_frame in ENTITIES['goals']:
+        roster, row_wise = transforms(etl_session, MarcottiEventTransform, RowTransform)
+        expected = row_wise.goals(data_frame.copy())
+        goals = roster.goals(data_frame.copy())
+        pd.testing.assert_frame_equal(goals, expected)
+        lineup_misses = {key: count for key, count in unresolved(roster).items() if key[0] == 'ClubMatchLineups'}
+        assert sum(lineup_misses.values()) == goals['lineup_id'].isnull().sum()
+
+
+def test_transform_event_roster_misses(etl_session):
+    """Transform 004: Players in both rosters of a match, or in neither, are counted as unresolved lineups."""
+    add_references(etl_session)
+    match_id = etl_session.query(mc.ClubLeagueMatches.id).scalar()
+    ann, bob = [etl_session.query(mcp.Players.id).filter_by(first_name=first).scalar() for first in [u"Ann", u"Bob"]]
+    club_b = etl_session.query(mc.Clubs.id).filter_by(name=u"Club B").scalar()
+    etl_session.add_all([mc.ClubMatchLineups(match_id=match_id, player_id=ann, team_id=club_b),
+                         mcp.Players(first_name=u"Cal", last_name=u"Carter", birth_date=date(1990, 1, 1))])
+    etl_session.commit()
+    bob_lineup = etl_session.query(mc.ClubMatchLineups.id).filter_by(player_id=bob).scalar()
+    data_frame = pd.DataFrame([dict(remote_match_id="100", scorer=name, scoring_team=team, scoring_event="Unknown",
+                                    bodypart_desc="Head", match_time=10, stoppage_time=0)
+                               for name, team in [(u"Ann Able", u"Club A"), (u"Bob Baker", u"Club B"),
+                                                  (u"Cal Carter", u"Club A"), (u"Ann Able", u"Club B")]])
+    roster, row_wise = transforms(etl_session, MarcottiEventTransform, RowTransform)
+    goals = roster.goals(data_frame.copy())
+    pd.testing.assert_frame_equal(goals, row_wise.goals(data_frame.copy()))
+    assert goals['lineup_id'].tolist() == [None, bob_lineup, None, None]
+    assert unresolved(roster) == {
+        ('ClubMatchLineups', 'multiple', (('full_name', u"Ann Able"), ('match_id', match_id))): 2,
+        ('ClubMatchLineups', 'no', (('full_name', u"Cal Carter"), ('match_id', match_id))): 1}
+
+
+def test_transform_lineup_players(etl_session):
+    """Transform 005: Lineups of one match keep every player row, and count players that are not found."""
+    add_references(etl_session)
+    match_id = etl_session.query(mc.ClubLeagueMatches.id).scalar()
+    ann, bob = [etl_session.query(mcp.Players.id).filter_by(first_name=first).scalar() for first in [u"Ann", u"Bob"]]
+    club_a, club_b = [etl_session.query(mc.Clubs.id).filter_by(name=name).scalar() for name in [u"Club A", u"Club B"]]
+    data_frame = pd.DataFrame([dict(competition=u"League", season=u"2012-2013", matchday=matchday, home_team=u"Club A",
+                                    away_team=u"Club B", player_team=team, player_name=name, starter=True,
+                                    captain=False)
+                               for matchday, team, name in [(1, u"Club A", u"Ann Able"), (1, u"Club B", u"Ann Able"),
+                                                            (1, u"Club A", u"Cal Carter"), (1, u"Club B", u"Bob Baker"),
+                                                            (3, u"Club B", u"Bob Baker")]])
+    column_wise, row_wise = transforms(etl_session, MarcottiTransform, RowTransform)
+    lineups = column_wise.match_lineups(data_frame.copy())
+    pd.testing.assert_frame_equal(lineups, row_wise.match_lineups(data_frame.copy()))
+    assert lineups[['match_id', 'team_id', 'player_id']].values.tolist() == [
+        [match_id, club_a, ann], [match_id, club_b, ann], [match_id, club_a, None], [match_id, club_b, bob],
+        [None, club_b, bob]]
+    misses = unresolved(column_wise)
+    assert misses.pop(('Players', 'no', (('full_name', u"Cal Carter"),))) == 1
+    assert [(model, reason, count) for (model, reason, _), count in misses.items()] == [
+        ('ClubLeagueMatches', 'no', 1)]